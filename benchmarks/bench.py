@@ -0,0 +1,379 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from core.simulation import SimulationEngine
+from utils.achievement_manager import AchievementManager
+from utils.catalog import catalog
+from utils.ledger import Ledger, ROW, EPOCH
+from utils.save_format import attach_ledger, load_ledger, load_save, write_save
+from utils.market_store import arrays_from_engine
+from utils.universe import universe
+
+HISTORY_FILE = os.path.join(BASE_DIR, "benchmarks", "history.json")
+SAVES_DIR = os.path.join(BASE_DIR, "saves")
+
+SYMBOLS = (100, 1000, 10000)
+YEARS = (1, 10, 50)
+LEDGER_SIZES = (1000, 10000, 100000, 1000000)
+BUTTONS = (("1h", 1), ("1d", 24), ("1w", 168), ("1m", 720))
+THRESHOLD = 0.2
+
+
+def synthetic_store(symbols, days=30, seed=0):
+    """Rynek `symbols` instrumentów (10% krypto) w postaci magazynu z utils.market_store."""
+    rng = np.random.default_rng(seed)
+    sectors = universe.sectors()
+    crypto = np.arange(symbols) % 10 == 9
+    today = datetime(2026, 1, 14).toordinal()
+    current = rng.uniform(10, 500, symbols)
+    walk = np.cumprod(1 + rng.normal(0, 0.02, (days, symbols)), axis=0)
+    return {
+        "symbols": np.array([f"S{i:05d}" for i in range(symbols)], dtype=str),
+        "markets": np.where(crypto, "crypto", "stocks").astype(str),
+        "names": np.array([f"Company {i}" for i in range(symbols)], dtype=str),
+        "sectors": np.array([sectors[i % len(sectors)] for i in range(symbols)], dtype=str),
+        "dividends": np.where(crypto, 0.0, 0.02),
+        "current": current,
+        "days": np.arange(today - days + 1, today + 1, dtype=np.int64),
+        "prices": walk / walk[-1] * current,
+    }
+
+
+def synthetic_ledger(rows, seed=0, income=True):
+    """Rejestr z `rows` transakcjami rozłożonymi na 50 lat gry (income=False - same wydatki)."""
+    rng = np.random.default_rng(seed)
+    categories = ["Praca", "Giełda", "Opłaty", "Bank", "Edukacja"]
+    descriptions = [f"Transakcja {i}" for i in range(100)]
+    chunk = np.empty(rows, dtype=ROW)
+    start = (datetime(2026, 1, 14) - EPOCH).total_seconds() // 60
+    chunk['minute'] = np.sort(start + rng.integers(0, 50 * 365 * 24 * 60, rows))
+    chunk['category'] = rng.integers(0, len(categories), rows)
+    chunk['description'] = rng.integers(0, len(descriptions), rows)
+    chunk['amount'] = np.round(rng.normal(0, 2000, rows), 2)
+    if not income:
+        chunk['amount'] = -np.abs(chunk['amount'])
+    return Ledger.from_chunks({"categories": categories, "descriptions": descriptions}, [chunk])
+
+
+def synthetic_engine(symbols, holdings=True, ledger=0):
+    """SimulationEngine nad syntetycznym rynkiem: praca, nieruchomości, pożyczki i (opcjonalnie) portfel wszystkich akcji."""
+    store = synthetic_store(symbols)
+    properties = [p['id'] for p in catalog.records("properties")[:3]]
+    save_data = {
+        "created": "2026-01-14 00:00",
+        "date_of_birth": "2001-01-01",
+        "balance": 1e12,
+        "current_job": catalog.records("jobs")[0]['id'],
+        "owned_properties": properties,
+        "primary_home": properties[0],
+        "active_loans": [{"type": "bench", "principal": 1000, "total_to_pay": 1e9, "monthly_rate": 100,
+                          "remaining_months": 10 ** 7, "paid_amount": 0} for _ in range(5)],
+        "portfolio": {"stocks": {}, "crypto": {}},
+        "rng": {"seed": 1234},
+    }
+    if holdings:
+        for symbol, market, name in zip(store['symbols'].tolist(), store['markets'].tolist(), store['names'].tolist()):
+            save_data['portfolio'][market][symbol] = {"amount": 10, "avg_price": 100.0, "name": name}
+    sim = SimulationEngine(save_data, store=store)
+    sim.valuation.rebuild()
+    if ledger:
+        sim.ledger = synthetic_ledger(ledger)
+    return sim
+
+
+class Host:
+    """Minimalny gospodarz dla AchievementManager (to, czego używa z GameView)."""
+
+    def __init__(self, sim):
+        self.save_data = sim.save_data
+        self.valuation = sim.valuation
+        self.ledger = sim.ledger
+
+
+def achievement_host(ledger):
+    """Host z metrykami poniżej wszystkich progów i rejestrem bez wpływów: pomiary niczego nie
+    odblokowują, więc każdy sprawdza pełny zestaw reguł (odblokowana reguła wypada z list na stałe)."""
+    sim = synthetic_engine(100, holdings=False)
+    sim.save_data.update(balance=0, owned_properties=sim.save_data['owned_properties'][:1])
+    sim.valuation.rebuild()
+    sim.ledger = synthetic_ledger(ledger, income=False)
+    return Host(sim)
+
+
+def case_market(symbols, years):
+    sim = synthetic_engine(symbols, holdings=False)
+
+    def run():
+        for _ in range(12 * years):
+            sim.simulate_market_movement(30)
+    return run
+
+
+def case_advance(symbols, hours):
+    sim = synthetic_engine(symbols)
+    return lambda: sim.advance_time(hours)
+
+
+def case_fast_forward(symbols, years):
+    sim = synthetic_engine(symbols, holdings=False)
+
+    def run():
+        left = 365 * years
+        while left > 0:
+            done, _, _ = sim.fast_forward(left)
+            left -= max(1, done)
+            sim.drain()
+    return run
+
+
+def case_finances(symbols):
+    sim = synthetic_engine(symbols)
+    sim.current_datetime = sim.current_datetime.replace(month=3)
+
+    def run():
+        sim.process_monthly_finances()
+        sim.drain()
+    return run
+
+
+def case_achievements_compile(rows):
+    host = achievement_host(rows)
+    return lambda: AchievementManager(host)
+
+
+def case_achievements_check(rows):
+    host = achievement_host(rows)
+    manager = AchievementManager(host)
+
+    def run():
+        # Zmiana salda wymusza ponowne sprawdzenie metryki net_worth (jak po każdym skoku czasu).
+        host.save_data['balance'] += 1
+        manager.check_all()
+    return run
+
+
+def case_save_write(path, tmp):
+    save_data = load_save(path)
+    sim = SimulationEngine(save_data)
+    market = arrays_from_engine(sim.market_engine, save_data['market_data'])
+    ledger = sim.ledger.freeze()
+    target = os.path.join(tmp, os.path.basename(path).rsplit(".", 1)[0] + ".save")
+    state = {**save_data, **sim.state()}
+    return lambda: write_save(target, state, market=market, ledger=ledger)
+
+
+def case_save_load(path):
+    def run():
+        save_data = load_save(path)
+        attach_ledger(save_data)
+        return save_data
+    return run
+
+
+def case_ledger_save(rows, tmp):
+    ledger = synthetic_ledger(rows)
+    path = os.path.join(tmp, f"ledger_{rows}.save")
+    save_data = {"player_surname": "bench", "balance": 0, "created": "2026-01-14 00:00"}
+    write = lambda: write_save(path, save_data, ledger=ledger.freeze())
+    write()
+    return write, lambda: load_ledger(path)
+
+
+def case_markets_view(symbols):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from ui.views.markets_view import MarketsView
+
+    app = QApplication.instance() or QApplication([])
+    sim = synthetic_engine(symbols, holdings=False)
+    host = QWidget()
+    host.market_engine = sim.market_engine
+    host.valuation = sim.valuation
+    host.save_data = sim.save_data
+    view = MarketsView(host)
+    view.refresh_view(sim.save_data)
+    app.processEvents()
+    # Przed każdym pomiarem jeden dzień rynku, żeby widok miał co odświeżać.
+    before = lambda: sim.simulate_market_movement(1)
+    run = lambda: (view.refresh_view(host.save_data), app.processEvents())
+    return run, before
+
+
+def cases(quick=False, tmp=None):
+    """Lista (nazwa, fabryka) - fabryka zwraca funkcję do pomiaru albo parę (funkcja, przygotowanie)."""
+    symbols = SYMBOLS[:2] if quick else SYMBOLS
+    years = YEARS[:2] if quick else YEARS
+    ledgers = LEDGER_SIZES[:3] if quick else LEDGER_SIZES
+    found = []
+    for n in symbols:
+        for y in years:
+            if n * y <= (10000 if quick else 500000):
+                found.append((f"simulate_market_movement[symbols={n},years={y}]", lambda n=n, y=y: case_market(n, y)))
+                found.append((f"fast_forward[symbols={n},years={y}]", lambda n=n, y=y: case_fast_forward(n, y)))
+        for label, hours in BUTTONS:
+            found.append((f"advance_time[{label},symbols={n}]", lambda n=n, h=hours: case_advance(n, h)))
+        found.append((f"process_monthly_finances[holdings={n}]", lambda n=n: case_finances(n)))
+        found.append((f"markets_view.refresh_view[symbols={n}]", lambda n=n: case_markets_view(n)))
+    for rows in ledgers:
+        found.append((f"achievements.compile[ledger={rows}]", lambda r=rows: case_achievements_compile(r)))
+        found.append((f"achievements.check_all[ledger={rows}]", lambda r=rows: case_achievements_check(r)))
+        found.append((f"save.write[ledger={rows}]", lambda r=rows: case_ledger_save(r, tmp)[0]))
+        found.append((f"save.load[ledger={rows}]", lambda r=rows: case_ledger_save(r, tmp)[1]))
+    for name in sorted(os.listdir(SAVES_DIR)) if os.path.isdir(SAVES_DIR) else []:
+        path = os.path.join(SAVES_DIR, name)
+        if name.endswith((".json", ".save")) and not name.startswith("."):
+            found.append((f"save.load[{name}]", lambda p=path: case_save_load(p)))
+            found.append((f"save.write[{name}]", lambda p=path: case_save_write(p, tmp)))
+    return found
+
+
+def measure(fn, before=None, min_time=0.5, max_runs=50):
+    """Czasy kolejnych wywołań `fn` (co najmniej jedno, dalej aż do min_time albo max_runs)."""
+    times = []
+    while not times or (sum(times) < min_time and len(times) < max_runs):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(quick=False, only=None, label=None, history_file=HISTORY_FILE):
+    """Uruchamia benchmarki i dopisuje wynik na koniec historii. Zwraca zapisany wpis.
+    Benchmarki, które rzuciły wyjątkiem, trafiają do wpisu jako "failed" {nazwa: błąd}."""
+    results = {}
+    failed = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in cases(quick, tmp):
+            if only and only not in name:
+                continue
+            try:
+                made = factory()
+                fn, before = made if isinstance(made, tuple) else (made, None)
+                times = measure(fn, before)
+            except Exception as e:
+                failed[name] = f"{type(e).__name__}: {e}"
+                print(f"{name:<55} {'FAILED':>10}     {failed[name]}")
+                continue
+            results[name] = {"median": float(np.median(times)), "min": float(np.min(times)), "runs": len(times)}
+            print(f"{name:<55} {results[name]['median'] * 1000:>10.3f} ms  (x{len(times)})")
+
+    entry = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "label": label,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "only": only,
+        "results": results,
+        "failed": failed,
+    }
+    history = load_history(history_file)
+    history.append(entry)
+    with open(history_file, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    return entry
+
+
+def load_history(history_file=HISTORY_FILE):
+    if not os.path.exists(history_file):
+        return []
+    with open(history_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_entry(history, ref):
+    """Wpis historii po etykiecie, commicie albo indeksie (np. -2)."""
+    for entry in reversed(history):
+        if ref in (entry.get('label'), entry.get('commit')):
+            return entry
+    return history[int(ref)]
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """Porównuje medianę każdego benchmarku. Zwraca listę (nazwa, przed, po, zmiana, status).
+
+    Status: None (w normie), "regression", "failed: <błąd>" albo "missing" (jest w wpisie bazowym,
+    a w bieżącym go nie ma) - trzy ostatnie liczą się jako regresje. Benchmarki spoza filtra --only
+    bieżącego przebiegu są pomijane; nowe (bez wpisu bazowego) mają status "new" i się nie liczą.
+    """
+    only = current.get('only')
+    failed = current.get('failed', {})
+    rows = []
+    for name, before in baseline['results'].items():
+        if only and only not in name:
+            continue
+        result = current['results'].get(name)
+        if result is None:
+            status = f"failed: {failed[name]}" if name in failed else "missing"
+            rows.append((name, before['median'], None, None, status))
+            continue
+        change = result['median'] / before['median'] - 1 if before['median'] else 0.0
+        rows.append((name, before['median'], result['median'], change, "regression" if change > threshold else None))
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            rows.append((name, None, result['median'], None, "new"))
+    for name, error in failed.items():
+        if name not in baseline['results']:
+            rows.append((name, None, None, None, f"failed: {error}"))
+    return rows
+
+
+def is_regression(status):
+    return status is not None and status != "new"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarki gorących ścieżek symulacji.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run", help="zmierz i dopisz wynik do historii")
+    run_cmd.add_argument("--quick", action="store_true", help="tylko mniejsze rozmiary danych")
+    run_cmd.add_argument("--only", help="tylko benchmarki, których nazwa zawiera ten tekst")
+    run_cmd.add_argument("--label", help="etykieta wpisu (np. baseline)")
+    cmp_cmd = sub.add_parser("compare", help="porównaj dwa wpisy historii")
+    cmp_cmd.add_argument("baseline", nargs="?", default="-2", help="etykieta, commit albo indeks (domyślnie przedostatni)")
+    cmp_cmd.add_argument("current", nargs="?", default="-1", help="etykieta, commit albo indeks (domyślnie ostatni)")
+    cmp_cmd.add_argument("--threshold", type=float, default=THRESHOLD, help="dopuszczalny wzrost mediany (0.2 = 20%%)")
+    for cmd in (run_cmd, cmp_cmd):
+        cmd.add_argument("--history", default=HISTORY_FILE)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        entry = run(args.quick, args.only, args.label, args.history)
+        sys.exit(1 if entry['failed'] else 0)
+
+    history = load_history(args.history)
+    if len(history) < 2 and args.baseline == "-2":
+        sys.exit("Za mało wpisów w historii do porównania.")
+    rows = compare(find_entry(history, args.baseline), find_entry(history, args.current), args.threshold)
+    ms = lambda seconds: f"{seconds * 1000:>10.3f}" if seconds is not None else f"{'-':>10}"
+    for name, before, after, change, status in rows:
+        delta = f"{change:+7.1%}" if change is not None else f"{'':>7}"
+        kind, _, error = (status or "").partition(": ")
+        print(f"{name:<55} {ms(before)} -> {ms(after)} ms  {delta}  {kind.upper()} {error}".rstrip())
+    regressions = sum(1 for row in rows if is_regression(row[4]))
+    print(f"{len(rows)} benchmarków, {regressions} regresji (powyżej {args.threshold:.0%}, nieudane albo brakujące)")
+    sys.exit(1 if regressions else 0)
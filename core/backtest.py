@@ -0,0 +1,235 @@
+import json
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.simulation import SimulationEngine
+from utils.event_manager import EventManager
+from utils.market_store import attach_market, arrays_from_market_data
+from utils.save_format import load_save
+
+
+class Strategy:
+    """Plan gracza dla backtestu - słownik z JSON-a:
+
+    {"target_age": 65, "rules": [
+        {"buy": "AAPL", "budget": 500, "every": 1},       kupno za kwotę (albo "amount" sztuk)
+        {"sell": "AAPL", "age": 60},                      sprzedaż (bez "amount" - całej pozycji)
+        {"loan": "medium", "amount": 100000, "months": 48, "interest": 0.2},
+        {"job": "job_05", "age": 30}                      zmiana pracy
+    ]}
+
+    Reguła odpala w miesiącu "month" (domyślnie 0 - na starcie) albo w pierwszym miesiącu, w którym
+    postać ma "age" lat; z "every" powtarza się co tyle miesięcy. Akcje działają jak w widokach gry
+    (saldo, portfel, wycena, rejestr transakcji) - zakup bez pokrycia jest pomijany.
+    """
+
+    TARGET_AGE = 65
+
+    def __init__(self, spec=None):
+        spec = spec or {}
+        self.target_age = spec.get('target_age', self.TARGET_AGE)
+        self.rules = spec.get('rules', [])
+
+    def apply(self, sim, month, age, starts):
+        """Wykonuje reguły przypadające na `month`. `starts` to stan przebiegu: {nr reguły: miesiąc startu}."""
+        for i, rule in enumerate(self.rules):
+            if i not in starts:
+                if 'age' in rule:
+                    if age < rule['age']:
+                        continue
+                    starts[i] = month
+                else:
+                    starts[i] = rule.get('month', 0)
+            elapsed = month - starts[i]
+            every = rule.get('every')
+            if elapsed == 0 or (every and elapsed > 0 and elapsed % every == 0):
+                self.execute(sim, rule)
+
+    def execute(self, sim, rule):
+        """Akcje idą przez te same metody SimulationEngine, z których korzystają widoki gry."""
+        if 'buy' in rule:
+            amount = rule.get('amount')
+            if amount is None:
+                _, asset = sim.find_asset(rule['buy'])
+                amount = rule.get('budget', 0) / asset['current_price'] if asset and asset['current_price'] else 0
+            sim.buy_asset(rule['buy'], amount)
+        elif 'sell' in rule:
+            sim.sell_asset(rule['sell'], rule.get('amount'))
+        elif 'loan' in rule:
+            sim.take_loan(rule['loan'], rule['amount'], rule['months'], rule.get('interest', 0))
+        elif 'job' in rule:
+            sim.change_job(rule['job'])
+
+
+def net_worth(sim):
+    """Majątek netto: gotówka + portfel + przedmioty minus niespłacona część pożyczek."""
+    debt = sum(l['total_to_pay'] - l['paid_amount'] for l in sim.save_data.get('active_loans', []))
+    return sim.valuation.snapshot()['net_worth'] - debt
+
+
+def share_arrays(arrays):
+    """Kopiuje tablice do bloków pamięci współdzielonej. Zwraca (bloki, opis do attach_arrays)."""
+    blocks, spec = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+def attach_arrays(spec):
+    """Widoki (tylko do odczytu) na tablice z share_arrays - bez kopiowania i bez pickla."""
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        try:
+            block = shared_memory.SharedMemory(name=block_name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[name] = array
+    return blocks, arrays
+
+
+class Backtester:
+    """Równoległy Monte Carlo: tysiące przyszłości jednego zapisu pod jedną strategią.
+
+    Każdy przebieg to SimulationEngine na kopii stanu z własnym ziarnem, przewijany miesiącami
+    (advance_time(720) - te same reguły rynku, eventów, finansów miesięcznych i śmiertelności co
+    w grze) aż do zgonu postaci albo MAX_AGE. Przebiegi liczone są w ProcessPoolExecutor; tablice
+    rynku trafiają do pamięci współdzielonej raz, a procesy dostają tylko ich nazwy - rynek nie jest
+    picklowany do żadnego zadania. Wynik zależy tylko od ziarna, nie od liczby procesów.
+    """
+
+    MAX_AGE = 120
+    PERCENTILES = (5, 25, 50, 75, 95)
+
+    def __init__(self, save_path, strategy=None):
+        save_data = load_save(save_path)
+        store = attach_market(save_data)
+        if store is None:
+            store = arrays_from_market_data(save_data.get('market_data', {}))
+        self.arrays = {name: np.asarray(array) for name, array in store.items()}
+        for key in ('market_data', 'market_ref', 'ledger_ref', 'rng'):
+            save_data.pop(key, None)
+        # Historia transakcji nie wpływa na przyszłość - przebiegi zaczynają z pustym rejestrem.
+        save_data['transaction_history'] = []
+        self.state = pickle.dumps(save_data, protocol=pickle.HIGHEST_PROTOCOL)
+        self.strategy = strategy if isinstance(strategy, Strategy) else Strategy(strategy)
+
+    def run(self, runs, seed=0, workers=None):
+        """Liczy `runs` przebiegów. Zwraca surowe wyniki (tablice po jednym polu na przebieg) i podsumowanie."""
+        seeds = np.random.SeedSequence(seed).generate_state(runs)
+        workers = workers or os.cpu_count() or 1
+        size = max(1, math.ceil(runs / (workers * 4)))
+        batches = [seeds[i:i + size] for i in range(0, runs, size)]
+
+        blocks, spec = share_arrays(self.arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(self.state, spec, self.strategy)) as pool:
+                parts = list(pool.map(run_batch, batches))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        results = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        return results, self.summary(results)
+
+    def summary(self, results):
+        """Przeżycie liczone tylko z wieku zgonu (bankructwo to osobny wskaźnik). Pasma majątku
+        obejmują przebiegi, które dożyły wieku docelowego, i bankructwa (majątek z chwili bankructwa)."""
+        dead = ~np.isnan(results['death_age'])
+        alive = ~(results['death_age'] < self.strategy.target_age)
+        measured = ~np.isnan(results['net_worth'])
+        percentiles = lambda values: {f"p{p}": float(v) for p, v in zip(self.PERCENTILES, np.percentile(values, self.PERCENTILES))} if len(values) else {}
+        return {
+            "runs": len(alive),
+            "target_age": self.strategy.target_age,
+            "survival": float(alive.mean()),
+            "net_worth": percentiles(results['net_worth'][measured]),
+            "bankruptcy": float(results['bankrupt'].mean()),
+            "death_age": percentiles(results['death_age'][dead]),
+        }
+
+
+_worker = {}
+
+
+def init_worker(state, spec, strategy):
+    """Inicjalizacja procesu puli: podpięcie tablic rynku i jeden wspólny katalog eventów."""
+    blocks, arrays = attach_arrays(spec)
+    _worker.update(state=state, blocks=blocks, store=arrays, strategy=strategy, events=EventManager())
+
+
+def run_batch(seeds):
+    results = {"net_worth": [], "bankrupt": [], "death_age": []}
+    for seed in seeds:
+        for name, value in zip(results, run_one(int(seed))):
+            results[name].append(value)
+    return {name: np.array(values, dtype=np.float64 if name != "bankrupt" else bool) for name, values in results.items()}
+
+
+def run_one(seed):
+    """Jeden przebieg do zgonu albo bankructwa. Zwraca (majątek netto w wieku docelowym - albo w chwili
+    bankructwa, jeśli przyszło wcześniej; czy było bankructwo; wiek zgonu)."""
+    save_data = pickle.loads(_worker['state'])
+    save_data['rng'] = {"seed": seed}
+    sim = SimulationEngine(save_data, store=_worker['store'], event_manager=_worker['events'])
+    strategy = _worker['strategy']
+
+    worth, bankrupt, death_age = math.nan, False, math.nan
+    starts = {}
+    month = 0
+    while True:
+        age = sim.calculate_age_at(sim.current_datetime)
+        if age >= strategy.target_age and math.isnan(worth):
+            worth = net_worth(sim)
+        if age >= Backtester.MAX_AGE:
+            break
+        strategy.apply(sim, month, age, starts)
+        if sim.is_insolvent():
+            # Jak w grze: przy ujemnym saldzie czas stoi - przebieg kończy się bankructwem.
+            bankrupt = True
+            if math.isnan(worth):
+                worth = net_worth(sim)
+            break
+        _, died = sim.advance_time(720)
+        sim.drain()
+        if died:
+            death_age = sim.calculate_age_at(sim.current_datetime)
+            break
+        month += 1
+    return worth, bankrupt, death_age
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest Monte Carlo strategii na zapisie gry.")
+    parser.add_argument("save", help="plik zapisu z katalogu saves/")
+    parser.add_argument("strategy", nargs="?", help="plik JSON ze strategią (domyślnie: nic nie rób)")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--target-age", type=int, default=None)
+    args = parser.parse_args()
+
+    spec = {}
+    if args.strategy:
+        with open(args.strategy, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    if args.target_age is not None:
+        spec['target_age'] = args.target_age
+
+    _, summary = Backtester(args.save, spec).run(args.runs, seed=args.seed, workers=args.workers)
+    print(json.dumps(summary, indent=2))
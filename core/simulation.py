@@ -0,0 +1,443 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.catalog import catalog
+from utils.event_manager import EventManager
+from utils.instruments import instruments
+from utils.market_engine import MarketEngine
+from utils.market_store import attach_market, market_data_from_store
+from utils.rng import RngStreams
+from utils.save_format import attach_ledger
+from utils.valuation import Valuation
+
+
+class SimulationEngine:
+    """Reguły upływu czasu gry bez Qt: rynek, eventy, finanse miesięczne, pożyczki, dywidendy, kursy i zgon.
+
+    Silnik trzyma stan (save_data, data gry, strumienie losowe, rynek, wycena, rejestr transakcji)
+    i nie pokazuje żadnych okien. Zdarzenia, które UI powinno pokazać albo obsłużyć, trafiają do
+    listy `notices` jako słowniki {"type": ...} (i do opcjonalnego `listener`):
+
+    transaction      {"category", "description", "amount"} - każdy wpis do rejestru,
+    loan_paid        {"loan"} - spłacona pożyczka,
+    course_finished  {"course"} - ukończony kurs,
+    event_started    {"event"} - wylosowany event miesięczny,
+    death            {"age"} - zgon postaci (symulacja zatrzymuje się na tym dniu).
+
+    GameView jest tylko adapterem: woła advance_time / fast_forward i po powrocie obsługuje
+    drain(). Ten sam silnik może działać w wątku roboczym, w puli procesów albo w benchmarku.
+    """
+
+    EVENT_CHANCE = 0.15
+    EVENT_COOLDOWN_DAYS = 365
+
+    def __init__(self, save_data, listener=None, store=None, event_manager=None):
+        """`store` - gotowy magazyn rynku zamiast wczytywania z `market_ref` (np. tablice w pamięci
+        współdzielonej backtestu), `event_manager` - wspólny katalog eventów dla wielu silników."""
+        self.save_data = save_data
+        self.listener = listener
+        self.notices = []
+        self.event_cooldown_days = self.save_data.get('event_cooldown_days', 0)
+        self._dob = (None, None)
+
+        date_str = self.save_data.get('created', '2026-01-14 00:00')
+        self.current_datetime = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+
+        self.event_manager = event_manager or EventManager()
+        self.event_manager.restore(self.save_data.get('active_events'))
+        self.rng = RngStreams.from_state(self.save_data.get('rng'))
+        history_days = self.save_data.get('history_days')
+        if store is None:
+            store = attach_market(self.save_data)
+        elif 'market_data' not in self.save_data:
+            self.save_data['market_data'] = market_data_from_store(store)
+        if store is not None:
+            self.market_engine = MarketEngine.from_store(store, rng=self.rng.market, history_days=history_days)
+        else:
+            self.market_engine = self.legacy_market_engine(history_days)
+        # Kalibracja modelu cen jest częścią stanu gry - liczona raz, potem czytana z zapisu.
+        self.market_engine.set_model(self.save_data.get('price_model', MarketEngine.MODEL),
+                                     self.save_data.get('model_params'))
+        self.save_data['model_params'] = self.market_engine.model_params
+        self.event_manager.bind_market(self.market_engine.symbols, self.market_engine.sector_index)
+        self.valuation = Valuation(self.save_data, self.market_engine)
+        self.ledger = attach_ledger(self.save_data)
+
+    def legacy_market_engine(self, history_days):
+        """Stare zapisy trzymają rynek (z historią) bezpośrednio w JSON-ie."""
+        market_data = self.save_data.setdefault('market_data', {})
+        for cat in ['stocks', 'crypto']:
+            items = market_data.get(cat, {})
+            for symbol, data in items.items():
+
+                if 'history' not in data or not data['history']:
+                    data['history'] = [{
+                        "date": self.current_datetime.strftime("%Y-%m-%d"),
+                        "price": data['current_price']
+                    }]
+
+        return MarketEngine(market_data, rng=self.rng.market, history_days=history_days)
+
+    def state(self):
+        """Stan symulacji spoza save_data, zapisywany razem z nim (freeze_state(save_data, **sim.state())):
+        strumienie losowe, aktywne eventy i przerwa między eventami. Bez niego wczytany zapis
+        rozjeżdża się z grą prowadzoną bez przerwy."""
+        return {"rng": self.rng.state(), "active_events": self.event_manager.state(),
+                "event_cooldown_days": self.event_cooldown_days}
+
+    def reseed(self, seed):
+        """Nowe strumienie losowe od podanego ziarna (powtarzalne przebiegi od bieżącego stanu gry)."""
+        self.rng = RngStreams(seed)
+        self.market_engine.rng = self.rng.market
+
+    def notify(self, kind, **payload):
+        notice = {"type": kind, **payload}
+        self.notices.append(notice)
+        if self.listener:
+            self.listener(notice)
+
+    def drain(self):
+        """Zwraca i czyści zebrane powiadomienia."""
+        notices, self.notices = self.notices, []
+        return notices
+
+    @instruments.timed("sim.advance_time")
+    def advance_time(self, hours, on_step=None):
+        """Przesuwa czas o `hours` godzin (pełne doby symulowane są wsadowo). Zwraca (settled, died).
+
+        `on_step(done)` działa jak w fast_forward - przerwany skok przesuwa kurs tylko o
+        przeliczone dni i nie rozlicza miesiąca.
+        """
+        self.tick_event_cooldown(hours / 24)
+
+        if hours >= 24:
+            simulated, died = self.simulate_days(hours // 24, on_step)
+            if died:
+                return False, True
+            if simulated < hours // 24:
+                self.progress_course(simulated * 24)
+                self.stamp_date()
+                return False, False
+        else:
+            self.current_datetime += timedelta(hours=hours)
+
+        self.progress_course(hours)
+
+        settled = hours >= 720
+        if settled:
+            self.run_monthly_cycle()
+        self.stamp_date()
+        return settled, False
+
+    @instruments.timed("sim.fast_forward")
+    def fast_forward(self, days, on_step=None):
+        """Przewija `days` dni wsadowo: rynek, wygasanie eventów i śmiertelność liczone są segmentami.
+
+        Co 30 dni rozlicza miesiąc (finanse + losowanie eventu). Zatrzymuje się na pierwszym dniu
+        ze zdarzeniem przerywającym: śmierć, start eventu, spłata pożyczki, koniec kursu lub debet.
+        `on_step(done)` wołane jest po każdym segmencie - zwrócone True przerywa przewijanie.
+        Zwraca (liczba_dni, settled, died).
+        """
+        done = 0
+        settled = False
+        interrupted = False
+        while done < days and not interrupted:
+            step = min(days - done, 30 - done % 30)
+            course = self.save_data.get('active_course')
+            if course:
+                step = min(step, max(1, math.ceil(course['remaining_hours'] / 24)))
+
+            simulated, died = self.simulate_days(step)
+            done += simulated
+            if died:
+                return done, settled, True
+
+            self.tick_event_cooldown(simulated)
+            interrupted = self.progress_course(simulated * 24)
+            if done % 30 == 0:
+                settled = True
+                interrupted = self.run_monthly_cycle() or interrupted
+            if on_step and on_step(done):
+                break
+
+        self.stamp_date()
+        return done, settled, False
+
+    def simulate_days(self, days, on_step=None):
+        """Symuluje `days` pełnych dni: eventy, rynek i śmiertelność.
+
+        Dni dzielone są na segmenty o stałym zestawie aktywnych eventów, a każdy segment rynku
+        liczony jest jednym wywołaniem silnika (po nim opcjonalne `on_step(done)`, True przerywa).
+        Zwraca (liczba_dni, czy_postać_zmarła).
+        """
+        done = 0
+        died = False
+        while done < days:
+            step = min(days - done, max(1, self.event_manager.days_until_change() - 1))
+            death_day = self.roll_death_day(step)
+            if death_day is not None:
+                step = death_day + 1
+                died = True
+
+            self.event_manager.process_days(step)
+            modifiers = self.event_manager.modifier_vector()
+            path = self.market_engine.simulate(modifiers, days=step)
+            self.current_datetime += timedelta(days=step)
+            self.market_engine.record(path, self.current_datetime)
+            done += step
+            if died or (on_step and done < days and on_step(done)):
+                break
+
+        instruments.count("sim.days", done)
+        if done:
+            self.market_engine.write_prices(self.save_data.get('market_data', {}))
+            self.valuation.on_prices()
+
+        if died:
+            self.stamp_date()
+            self.notify("death", age=self.calculate_age_at(self.current_datetime))
+        return done, died
+
+    def simulate_market_movement(self, days=1):
+        """Sam rynek: `days` dni cen przy bieżącym zestawie eventów (bez ich upływu i bez finansów).
+        Data gry przesuwa się jak w simulate_days, żeby historia cen miała rosnące, unikalne daty."""
+        modifiers = self.event_manager.modifier_vector()
+        path = self.market_engine.simulate(modifiers, days=days)
+        self.current_datetime += timedelta(days=days)
+        self.market_engine.record(path, self.current_datetime)
+        self.market_engine.write_prices(self.save_data.get('market_data', {}))
+        self.valuation.on_prices()
+
+    def stamp_date(self):
+        self.save_data['current_game_date'] = self.current_datetime.strftime("%Y-%m-%d")
+        self.save_data['created'] = self.current_datetime.strftime("%Y-%m-%d %H:%M")
+
+    def tick_event_cooldown(self, days):
+        if self.event_cooldown_days > 0:
+            self.event_cooldown_days = max(0, self.event_cooldown_days - days)
+
+    def progress_course(self, hours):
+        """Postęp aktywnego kursu. Zwraca True, jeśli kurs właśnie się zakończył."""
+        course = self.save_data.get('active_course')
+        if not course:
+            return False
+        course['remaining_hours'] -= hours
+        if course['remaining_hours'] > 0:
+            return False
+        if 'completed_courses' not in self.save_data: self.save_data['completed_courses'] = []
+        if course['id'] not in self.save_data['completed_courses']:
+            self.save_data['completed_courses'].append(course['id'])
+        self.save_data['active_course'] = None
+        self.notify("course_finished", course=course)
+        return True
+
+    def run_monthly_cycle(self):
+        """Rozliczenie miesiąca i losowanie eventu. Zwraca True, gdy wydarzyło się coś przerywającego skok."""
+        loans_paid = self.process_monthly_finances()
+        event_started = self.roll_monthly_event()
+        return loans_paid > 0 or event_started or self.is_insolvent()
+
+    def roll_monthly_event(self):
+        if self.event_manager.active_events or self.event_cooldown_days > 0:
+            return False
+        if self.rng.events.random() >= self.EVENT_CHANCE:
+            return False
+        events = self.event_manager.events_db
+        if not events:
+            return False
+
+        weights = np.array([e.get('weight', 1) for e in events], dtype=np.float64)
+        random_event = events[self.rng.events.choice(len(events), p=weights / weights.sum())]
+        self.event_manager.trigger_event_by_id(random_event['id'])
+        self.event_cooldown_days = self.EVENT_COOLDOWN_DAYS
+        instruments.count("events.started")
+        self.notify("event_started", event=random_event)
+        return True
+
+    @instruments.timed("finances.monthly")
+    def process_monthly_finances(self):
+        """Główna metoda rozliczająca miesiąc: pensje, dywidendy, koszty i POŻYCZKI.
+
+        Zwraca liczbę spłaconych w tym miesiącu pożyczek (każda zgłaszana jako loan_paid).
+        """
+        job_id = self.save_data.get('current_job')
+        salary = 0
+        if job_id:
+            self.save_data['job_months'] = self.save_data.get('job_months', 0) + 1
+            salary = self.calculate_salary_with_milestones(job_id, self.save_data['job_months'])
+
+        total_upkeep = self.calculate_total_property_upkeep()
+
+        total_loan_costs = 0
+        loans_paid = 0
+        loans = self.save_data.get('active_loans', [])
+
+        for loan in loans[:]:
+            if loan.get('is_new', False):
+                loan['is_new'] = False
+                continue
+
+            loan['remaining_months'] -= 1
+            loan['paid_amount'] += loan['monthly_rate']
+            total_loan_costs += loan['monthly_rate']
+
+            if loan['remaining_months'] <= 0:
+                loans.remove(loan)
+                loans_paid += 1
+                self.notify("loan_paid", loan=loan)
+
+        total_dividends = 0
+        current_month = self.current_datetime.month
+
+        if current_month in [3, 6, 9, 12]:
+            portfolio = self.save_data.get('portfolio', {})
+            market_data = self.save_data.get('market_data', {})
+            for symbol, p_data in portfolio.get('stocks', {}).items():
+                amount = p_data.get('amount', 0)
+                if amount > 0:
+                    m_info = market_data.get('stocks', {}).get(symbol, {})
+                    current_price = m_info.get('current_price', 0)
+                    div_rate = m_info.get('dividend_yield', 0)
+                    total_dividends += (amount * current_price * div_rate)
+
+        if salary > 0:
+            self.log_transaction("Praca", f"Pensja: {self.save_data.get('current_title', 'Pracownik')}", salary)
+
+        if total_dividends > 0:
+            self.log_transaction("Giełda", f"Dywidenda kwartalna ({current_month})", total_dividends)
+
+        if total_upkeep > 0:
+            self.log_transaction("Opłaty", "Utrzymanie nieruchomości", -total_upkeep)
+
+        if total_loan_costs > 0:
+            self.log_transaction("Bank", "Automatyczna rata pożyczki", -total_loan_costs)
+
+        self.save_data['balance'] += (salary + total_dividends - total_upkeep - total_loan_costs)
+        return loans_paid
+
+    def calculate_salary_with_milestones(self, job_id, months):
+        j = catalog.get("jobs", job_id)
+        if not j: return 0
+        total = j['base_salary']
+        for m in j.get('milestones', []):
+            if months >= m['months']: total += m['bonus']
+        return total
+
+    def calculate_total_property_upkeep(self):
+        owned_ids = self.save_data.get('owned_properties', [])
+        primary_id = self.save_data.get('primary_home', 'prop_00')
+        total = 0
+        for p in catalog.owned("properties", owned_ids):
+            total += p['upkeep'] if p['id'] == primary_id else int(p['upkeep'] * 0.5)
+        return total
+
+    def log_transaction(self, category, description, amount):
+        self.ledger.append(self.current_datetime, category, description, float(amount))
+        instruments.count("ledger.append")
+        self.notify("transaction", category=category, description=description, amount=float(amount))
+
+    def is_insolvent(self):
+        """Reguła gry: przy ujemnym saldzie czas stoi, dopóki gracz nie sprzeda aktywów albo nie weźmie pożyczki."""
+        return self.save_data.get('balance', 0) < 0
+
+    def find_asset(self, symbol):
+        """(rynek, dane symbolu z market_data) albo (None, None) dla symbolu spoza rynku."""
+        i = self.market_engine.index.get(symbol)
+        if i is None:
+            return None, None
+        category = self.market_engine.keys[i][0]
+        return category, self.save_data.get('market_data', {}).get(category, {}).get(symbol)
+
+    def buy_asset(self, symbol, amount):
+        """Kupno `amount` jednostek po bieżącej cenie; średnia cena pozycji ważona ilością.
+        Zwraca koszt albo None (nieznany symbol, zła ilość, brak środków)."""
+        category, asset = self.find_asset(symbol)
+        if not asset or amount <= 0:
+            return None
+        cost = amount * asset['current_price']
+        if self.save_data.get('balance', 0) < cost:
+            return None
+        self.save_data['balance'] -= cost
+        portfolio = self.save_data.setdefault('portfolio', {"stocks": {}, "crypto": {}}).setdefault(category, {})
+        position = portfolio.setdefault(symbol, {"amount": 0, "avg_price": 0, "name": asset['name']})
+        position['avg_price'] = (position['amount'] * position['avg_price'] + cost) / (position['amount'] + amount)
+        position['amount'] += amount
+        self.valuation.update_holding(symbol)
+        self.log_transaction("Giełda", f"Zakup {amount:g} {symbol}", -cost)
+        return cost
+
+    def sell_asset(self, symbol, amount=None):
+        """Sprzedaż `amount` jednostek (bez amount - całej pozycji) po bieżącej cenie.
+        Zwraca przychód albo None, gdy nie ma czego sprzedać."""
+        category, asset = self.find_asset(symbol)
+        position = self.save_data.get('portfolio', {}).get(category, {}).get(symbol) if asset else None
+        if not position or position.get('amount', 0) <= 0:
+            return None
+        amount = min(position['amount'], position['amount'] if amount is None else amount)
+        if amount <= 0:
+            return None
+        revenue = amount * asset['current_price']
+        self.save_data['balance'] += revenue
+        position['amount'] -= amount
+        if position['amount'] < 0.001:
+            position['amount'] = 0
+        self.valuation.update_holding(symbol)
+        self.log_transaction("Giełda", f"Sprzedaż {amount:g} {symbol}", revenue)
+        return revenue
+
+    def take_loan(self, loan_type, amount, months, interest):
+        """Pożyczka spłacana ratami w process_monthly_finances; kwota od razu trafia na konto."""
+        total_to_pay = amount * (1 + interest)
+        self.save_data.setdefault('active_loans', []).append({
+            "type": loan_type,
+            "principal": amount,
+            "total_to_pay": total_to_pay,
+            "monthly_rate": total_to_pay / months,
+            "remaining_months": months,
+            "paid_amount": 0,
+            "is_new": True
+        })
+        self.save_data['balance'] += amount
+        self.log_transaction("Bank", f"Loan Taken: ${amount:,} (Rate: {interest*100:.1f}%)", amount)
+
+    def change_job(self, job_id):
+        """Zatrudnienie w pracy z katalogu (staż liczony od zera). Zwraca opis pracy albo None."""
+        job = catalog.get("jobs", job_id)
+        if not job:
+            print(f"DEBUG: Nieznana praca {job_id}")
+            return None
+        self.save_data['current_job'] = job['id']
+        self.save_data['current_title'] = job['title']
+        self.save_data['job_months'] = 0
+        return job
+
+    def roll_death_day(self, days, start=None):
+        """Losuje zgon dla `days` kolejnych dni po `start` jednym wektorowym rzutem.
+
+        Zwraca indeks (od 0) pierwszego dnia, w którym postać umiera, albo None.
+        """
+        start = start or self.current_datetime
+        dob = self.birth_date()
+
+        day_dates = np.datetime64(start.date()) + np.arange(1, days + 1)
+        ages = day_dates.astype('datetime64[Y]').astype(int) + 1970 - dob.year
+
+        base = 1.12
+        annual_chance = (np.power(base, ages - 18) / pow(base, 100 - 18)) * 100
+        daily_chance = annual_chance / 365
+
+        deaths = self.rng.mortality.random(days) * 100 < daily_chance
+        return int(deaths.argmax()) if deaths.any() else None
+
+    def birth_date(self):
+        """Data urodzenia z zapisu (parsowana ponownie tylko po zmianie tekstu)."""
+        text = self.save_data.get('date_of_birth', '1990-01-01')
+        if self._dob[0] != text:
+            self._dob = (text, datetime.strptime(text, "%Y-%m-%d"))
+        return self._dob[1]
+
+    def calculate_age_at(self, when):
+        dob = self.birth_date()
+        return when.year - dob.year
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from utils.achievement_manager import AchievementManager
+
+
+class Ledger:
+    def any_amount(self, compare, value, categories=None):
+        return False
+
+
+def game_view(**save):
+    valuation = SimpleNamespace(snapshot=lambda: {"portfolio": 0})
+    return SimpleNamespace(save_data={"balance": 0, **save}, valuation=valuation, ledger=Ledger())
+
+
+def test_same_length_list_replacement_unlocks_contains():
+    gv = game_view(owned_vehicles=["veh_01"])
+    manager = AchievementManager(gv)
+    manager.check_all()
+    unlocked_before = list(gv.save_data["unlocked_achievements"])
+
+    gv.save_data["owned_vehicles"] = ["veh_30"]
+    manager.check_all()
+    new = set(gv.save_data["unlocked_achievements"]) - set(unlocked_before)
+    rules = {a["id"]: a.get("rule") for a in manager.achievements}
+    assert any(rules[i] == {"metric": "owned_vehicles", "op": "contains", "value": "veh_30"} for i in new)
@@ -0,0 +1,54 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from core.backtest import Backtester
+
+SAVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "save.json")
+STRATEGY = {"target_age": 40, "rules": [
+    {"buy": "AAPL", "budget": 200, "every": 1},
+    {"loan": "small", "amount": 5000, "months": 10, "interest": 0.1, "month": 2},
+]}
+
+
+@pytest.fixture(scope="module")
+def backtester():
+    return Backtester(SAVE, STRATEGY)
+
+
+def test_results_do_not_depend_on_worker_count(backtester):
+    one, summary_one = backtester.run(6, seed=5, workers=1)
+    three, summary_three = backtester.run(6, seed=5, workers=3)
+    for name in one:
+        np.testing.assert_array_equal(one[name], three[name])
+    assert summary_one == summary_three
+
+
+def test_insolvent_save_goes_bankrupt(tmp_path):
+    with open(SAVE, "r", encoding="utf-8") as f:
+        save_data = json.load(f)
+    save_data['balance'] = -1
+    path = tmp_path / "broke.json"
+    path.write_text(json.dumps(save_data))
+    results, summary = Backtester(str(path)).run(2, seed=1, workers=1)
+    assert results['bankrupt'].all()
+    assert np.isnan(results['death_age']).all()
+    assert (results['net_worth'] < 0).all()
+    assert summary['bankruptcy'] == 1.0
+    assert summary['survival'] == 1.0
+    assert summary['net_worth']['p50'] == float(np.median(results['net_worth']))
+
+
+def test_summary_separates_survival_from_bankruptcy(backtester):
+    results = {
+        "net_worth": np.array([100.0, -50.0, np.nan, 300.0]),
+        "bankrupt": np.array([False, True, False, False]),
+        "death_age": np.array([np.nan, np.nan, 30.0, 70.0]),
+    }
+    summary = backtester.summary(results)
+    assert summary['survival'] == 0.75
+    assert summary['bankruptcy'] == 0.25
+    assert summary['net_worth']['p50'] == 100.0
+    assert summary['death_age']['p50'] == 50.0
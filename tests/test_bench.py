@@ -0,0 +1,30 @@
+from benchmarks.bench import compare, is_regression
+
+
+def entry(results, failed=None, only=None):
+    return {"results": {name: {"median": m, "min": m, "runs": 1} for name, m in results.items()},
+            "failed": failed or {}, "only": only}
+
+
+def statuses(rows):
+    return {name: status for name, _, _, _, status in rows}
+
+
+def test_failed_and_missing_count_as_regressions():
+    baseline = entry({"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0})
+    current = entry({"a": 1.1, "b": 1.5, "e": 1.0}, failed={"c": "ValueError: x"})
+    result = statuses(compare(baseline, current, threshold=0.2))
+    assert result == {"a": None, "b": "regression", "c": "failed: ValueError: x", "d": "missing", "e": "new"}
+    assert [name for name, status in sorted(result.items()) if is_regression(status)] == ["b", "c", "d"]
+
+
+def test_only_filter_skips_unrequested_benchmarks():
+    baseline = entry({"market[1]": 1.0, "save[1]": 1.0})
+    current = entry({"market[1]": 1.0}, only="market")
+    assert statuses(compare(baseline, current)) == {"market[1]": None}
+
+
+def test_old_entries_without_failed_field():
+    baseline = {"results": {"a": {"median": 1.0}}}
+    current = {"results": {"a": {"median": 1.0}}}
+    assert statuses(compare(baseline, current)) == {"a": None}
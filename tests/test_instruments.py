@@ -0,0 +1,105 @@
+import os
+import pstats
+
+import numpy as np
+import pytest
+
+from utils.instruments import Instruments
+
+
+@pytest.fixture
+def inst():
+    instruments = Instruments()
+    instruments.enabled = True
+    return instruments
+
+
+def test_ring_buffer_wraps_around(inst):
+    total = inst.CAPACITY + 10
+    for i in range(total):
+        inst.record("step", float(i))
+    ring = inst.samples["step"]
+    assert inst.heads["step"] == total
+    # Najstarsze 10 pomiarów nadpisane przez najnowsze - w buforze zostaje ostatnie CAPACITY.
+    assert sorted(ring) == [float(i) for i in range(10, total)]
+    assert ring[:10].tolist() == [float(i) for i in range(inst.CAPACITY, total)]
+    assert inst.totals["step"] == [float(sum(range(total))), total]
+    assert inst.stats("step")["count"] == inst.CAPACITY
+
+
+def test_stats_histogram_bins(inst):
+    for seconds in [2e-6, 2e-6, 1e-3, 0.5]:
+        inst.record("step", seconds)
+    stats = inst.stats("step")
+    expected = np.histogram([2e-6, 2e-6, 1e-3, 0.5], bins=inst.BUCKETS)[0].tolist()
+    assert stats["histogram"] == expected
+    assert len(stats["histogram"]) == len(inst.BUCKETS) - 1
+    assert sum(stats["histogram"]) == 4
+    assert stats["histogram"][0] == 2
+    assert stats["max"] == 0.5
+
+
+def test_disabled_is_a_no_op():
+    inst = Instruments()
+    calls = []
+
+    @inst.timed("step")
+    def step(x):
+        calls.append(x)
+        return x * 2
+
+    assert step(3) == 6
+    inst.count("things", 5)
+    inst.begin_jump()
+    inst.end_jump()
+    assert calls == [3]
+    assert inst.samples == {} and inst.counters == {} and inst.last_jump == {}
+
+
+def test_breakdown_since_mark(inst):
+    timed = inst.timed("step")(lambda: None)
+    timed()
+    since = inst.mark()
+    timed()
+    inst.count("things", 3)
+    timers, counts = inst.breakdown(since)
+    assert timers["step"][1] == 1
+    assert counts == {"things": 3}
+
+
+def test_profiled_dumps_pstats_after_captured_jumps(tmp_path):
+    inst = Instruments()
+    path = str(tmp_path / "profiles" / "jumps.prof")
+
+    def jump():
+        return sum(range(1000))
+
+    assert inst.profiled(jump) is jump
+    inst.capture(2, path=path)
+    inst.profiled(jump)()
+    assert not os.path.exists(path) and inst.capture_left == 1
+    inst.profiled(jump)()
+    assert inst.last_capture == path and inst.capture_left == 0 and inst.profile is None
+    names = {func[2] for func in pstats.Stats(path).stats}
+    assert "jump" in names
+    assert inst.profiled(jump) is jump
+
+
+def test_dev_overlay_renders_stats(monkeypatch):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from ui.widgets import dev_overlay
+
+    app = QApplication.instance() or QApplication([])
+    inst = Instruments()
+    monkeypatch.setattr(dev_overlay, "instruments", inst)
+    host = QWidget()
+    overlay = dev_overlay.DevOverlay(host)
+    assert overlay.toggle() and inst.enabled
+    inst.record("market.simulate", 0.002)
+    inst.count("sim.days", 30)
+    overlay.update_stats()
+    text = overlay.label.text()
+    assert "market.simulate" in text and "sim.days" in text
+    assert not overlay.toggle() and not inst.enabled
+    app.processEvents()
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import numpy as np
+
+from utils.ledger import Ledger
+
+
+def test_unparseable_dates_keep_timestamps_sorted():
+    entries = [
+        {"date": "2026-03-01 10:00", "category": "Job", "description": "C", "amount": 3},
+        {"date": "bad", "category": "Job", "description": "B?", "amount": 2},
+        {"date": "2026-01-01 10:00", "category": "Job", "description": "A", "amount": 1},
+        {"category": "Bank", "description": "no date", "amount": -1},
+    ]
+    ledger = Ledger.from_entries(entries)
+    minutes = ledger.minutes[:ledger.size]
+    assert len(ledger) == 4
+    assert np.all(np.diff(minutes) >= 0)
+    february = ledger.select(since=datetime(2026, 2, 1), until=datetime(2026, 4, 1))
+    assert ledger.amounts[february].tolist() == [3]
+    assert sorted(ledger.amounts[ledger.select(since=datetime(2026, 1, 1))].tolist()) == [-1, 1, 2, 3]
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from utils.market_provider import LocalSnapshotSource, MarketProvider
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    history = [{"date": f"2024-01-0{d}", "price": 100.0 + d} for d in range(1, 6)]
+    data = {"stocks": {s: {"symbol": s, "name": f"{s} Inc.", "current_price": 105.0,
+                           "history": history, "dividend_yield": 0.005} for s in SYMBOLS},
+            "crypto": {}}
+    path = tmp_path / "snapshot.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+class FlakySource(LocalSnapshotSource):
+    """Snapshot offline z symbolami, które wiszą (`slow`) albo rzucają wyjątek (`failing`: ile razy)."""
+
+    def __init__(self, path, slow=(), failing=None, slow_history=False):
+        super().__init__(path)
+        self.slow = set(slow)
+        self.failing = dict(failing or {})
+        self.slow_history = slow_history
+        self.release = threading.Event()
+        self.calls = {}
+
+    def history(self, symbols, period="7d", start=None):
+        if self.slow_history:
+            self.release.wait(5)
+        return super().history(symbols, period, start)
+
+    def info(self, symbol):
+        self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        if symbol in self.slow:
+            self.release.wait(5)
+        if self.failing.get(symbol, 0) > 0:
+            self.failing[symbol] -= 1
+            raise ConnectionError(f"{symbol} niedostępny")
+        return super().info(symbol)
+
+
+def provider(source, **kwargs):
+    p = MarketProvider(source=source, **kwargs)
+    p.stocks, p.crypto, p.all_symbols = SYMBOLS, [], SYMBOLS
+    return p
+
+
+def test_failing_symbol_is_retried(snapshot):
+    source = FlakySource(snapshot, failing={"BBB": 2})
+    p = provider(source, retries=2)
+    results = p.fetch_metadata(SYMBOLS)
+    assert results["BBB"]["shortName"] == "BBB Inc."
+    assert source.calls["BBB"] == 3
+    assert p.errors == {}
+
+
+def test_symbol_failing_past_retries_is_reported(snapshot):
+    source = FlakySource(snapshot, failing={"BBB": 10})
+    p = provider(source, retries=1)
+    results = p.fetch_metadata(SYMBOLS)
+    assert results["BBB"] == {}
+    assert source.calls["BBB"] == 2
+    assert "niedostępny" in p.errors["BBB"]
+    assert results["AAA"]["shortName"] == "AAA Inc."
+
+
+def test_slow_symbol_times_out_without_resubmit(snapshot):
+    source = FlakySource(snapshot, slow={"CCC"})
+    p = provider(source, timeout=0.2, retries=2, workers=2)
+    try:
+        started = time.monotonic()
+        results = p.fetch_metadata(SYMBOLS)
+        assert time.monotonic() - started < 3
+    finally:
+        source.release.set()
+    assert results["CCC"] == {}
+    assert "timeout" in p.errors["CCC"]
+    assert source.calls["CCC"] == 1
+    assert all(results[s]["shortName"] == f"{s} Inc." for s in SYMBOLS if s != "CCC")
+
+
+def test_all_workers_stuck_fails_the_rest(snapshot):
+    source = FlakySource(snapshot, slow={"AAA", "BBB"})
+    p = provider(source, timeout=0.2, workers=2)
+    try:
+        started = time.monotonic()
+        results = p.fetch_metadata(SYMBOLS)
+        assert time.monotonic() - started < 3
+    finally:
+        source.release.set()
+    assert set(results) == set(SYMBOLS)
+    assert "zablokowane" in p.errors["CCC"] and "zablokowane" in p.errors["DDD"]
+
+
+def test_history_batch_timeout(snapshot):
+    source = FlakySource(snapshot, slow_history=True)
+    p = provider(source, timeout=0.2, batch_size=2, workers=1)
+    try:
+        started = time.monotonic()
+        histories = p.fetch_histories(SYMBOLS)
+        assert time.monotonic() - started < 3
+    finally:
+        source.release.set()
+    assert histories == {}
+    assert "timeout" in p.errors["AAA"] and "zablokowane" in p.errors["CCC"]
+
+
+def test_snapshot_from_local_source(snapshot):
+    p = provider(LocalSnapshotSource(snapshot))
+    data = p.fetch_market_snapshot(write=False)
+    assert set(data["stocks"]) == set(SYMBOLS)
+    assert data["stocks"]["AAA"]["current_price"] == 105.0
+    assert data["stocks"]["AAA"]["last_date"] == "2024-01-05"
+
+
+def test_refresh_falls_back_to_snapshot(snapshot, tmp_path):
+    source = FlakySource(snapshot)
+    source.history = lambda *args, **kwargs: (_ for _ in ()).throw(ConnectionError("offline"))
+    p = provider(source, retries=0)
+    p.cache_file, p.store_file = snapshot, str(tmp_path / "snapshot.npz")
+    p.write_snapshot = lambda market_data: (_ for _ in ()).throw(OSError("read-only"))
+    data = p.get_market_data(refresh=True)
+    assert set(data["stocks"]) == set(SYMBOLS)
+    assert "offline" in p.errors["AAA"]
+
+
+def test_background_refresh(snapshot, tmp_path):
+    source = FlakySource(snapshot, slow_history=True)
+    p = provider(source, timeout=5)
+    p.cache_file, p.store_file = snapshot, str(tmp_path / "snapshot.npz")
+    refreshed = []
+    thread = p.refresh_in_background(refreshed.append)
+    assert thread.is_alive()
+    source.release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert set(refreshed[0]["stocks"]) == set(SYMBOLS)
+    assert os.path.exists(p.store_file)
@@ -0,0 +1,53 @@
+from datetime import date
+
+import numpy as np
+
+from utils.market_engine import MarketEngine
+from utils.price_models import calibrate, calibrate_market
+
+DAYS_PER_YEAR = 365
+
+
+def trending_history(days, symbols, daily_drift, sigma, seed=0):
+    rng = np.random.default_rng(seed)
+    log_returns = daily_drift + sigma * rng.standard_normal((days - 1, symbols))
+    return 100.0 * np.exp(np.vstack([np.zeros(symbols), np.cumsum(log_returns, axis=0)]))
+
+
+def test_short_history_drift_is_small():
+    history = trending_history(7, 50, daily_drift=0.02, sigma=0.01)
+    drift, sigma = calibrate(history, np.full(50, 0.02))
+    annual = np.exp(np.abs(drift) * DAYS_PER_YEAR) - 1
+    assert annual.max() < 0.15
+    assert np.all((sigma >= 0.003) & (sigma <= 0.15))
+
+
+def test_long_history_drift_follows_data():
+    history = trending_history(2001, 20, daily_drift=0.0002, sigma=0.001)
+    drift, sigma = calibrate(history, np.full(20, 0.02))
+    shrunk = 0.0002 * 2000 / (2000 + 250)
+    assert np.all(np.abs(drift - shrunk) < 0.0001)
+    assert np.all(sigma == 0.003)
+
+
+def test_too_few_returns_use_defaults():
+    history = trending_history(3, 4, daily_drift=0.05, sigma=0.01)
+    drift, sigma = calibrate(history, np.full(4, 0.02))
+    assert np.all(drift == 0) and np.all(sigma == 0.02)
+
+
+def test_model_params_are_reused():
+    market = {"stocks": {s: {"current_price": 100.0, "category": "Tech",
+                             "history": [{"date": f"2026-01-{d:02d}", "price": 100.0 + d * (i + 1)}
+                                         for d in range(1, 20)]}
+                         for i, s in enumerate(["AAA", "BBB"])},
+              "crypto": {}}
+    engine = MarketEngine(market)
+    engine.set_model("realistic")
+    params = engine.model_params
+    assert params == calibrate_market(engine)
+
+    engine.record(engine.simulate(np.full(2, 1.5), days=10), date(2026, 1, 29))
+    engine.set_model("gbm")
+    assert engine.model_params is params
+    assert calibrate_market(engine) != params
@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+import utils.save_format as save_format
+from utils.save_format import load_ledger, load_save, migrate_save
+
+LEGACY = {
+    "player_name": "Jan", "player_surname": "Test", "balance": 1234.5,
+    "portfolio": {"stocks": {"AAA": {"amount": 2, "avg_price": 10.0, "name": "AAA"}}, "crypto": {}},
+    "transaction_history": [
+        {"date": "2026-02-01 10:00", "category": "Bank", "description": "B", "amount": -5},
+        {"date": "2026-01-01 10:00", "category": "Job", "description": "A", "amount": 100},
+    ],
+}
+
+
+@pytest.fixture
+def legacy_save(tmp_path):
+    path = tmp_path / "Test-20260101_000000.json"
+    path.write_text(json.dumps(LEGACY))
+    return str(path)
+
+
+def test_migration_keeps_original(legacy_save):
+    new_path = migrate_save(legacy_save)
+    data = load_save(new_path)
+    assert data["balance"] == LEGACY["balance"]
+    assert data["portfolio"] == LEGACY["portfolio"]
+    assert len(load_ledger(new_path)) == 2
+    with open(legacy_save + ".bak", "r", encoding="utf-8") as f:
+        assert json.load(f) == LEGACY
+
+
+def test_failed_verification_leaves_original(legacy_save, monkeypatch):
+    real_load = save_format.load_save
+    monkeypatch.setattr(save_format, "load_save", lambda path: {**real_load(path), "balance": 0})
+    with pytest.raises(ValueError, match="balance"):
+        migrate_save(legacy_save)
+    with open(legacy_save, "r", encoding="utf-8") as f:
+        assert json.load(f) == LEGACY
+    assert not os.path.exists(os.path.splitext(legacy_save)[0] + ".save")
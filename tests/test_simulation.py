@@ -0,0 +1,107 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from core.simulation import SimulationEngine
+from utils.market_store import arrays_from_engine, ref_for
+from utils.save_format import load_save, write_save
+
+SAVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "save.json")
+
+
+def new_save(seed, **extra):
+    save_data = load_save(SAVE)
+    save_data.update(rng={"seed": seed}, balance=1e6, **extra)
+    return json.loads(json.dumps(save_data))
+
+
+def play(sim, months):
+    for _ in range(months):
+        sim.advance_time(720)
+        sim.drain()
+
+
+def fingerprint(sim):
+    return (sim.current_datetime, sim.save_data['balance'], sim.market_engine.prices.tobytes(),
+            sim.event_manager.state(), sim.event_cooldown_days, len(sim.ledger))
+
+
+def reload(sim, path):
+    """Zapis i wczytanie tak jak w grze (GameView.submit_save + load_save)."""
+    ref = ref_for(path)
+    state = {**sim.save_data, "market_ref": ref, "ledger_ref": ref, **sim.state()}
+    write_save(path, state, arrays_from_engine(sim.market_engine, sim.save_data['market_data']), sim.ledger.freeze())
+    return SimulationEngine(load_save(path))
+
+
+@pytest.mark.parametrize("model", ["uniform", "realistic"])
+def test_same_seed_same_run(model):
+    a = SimulationEngine(new_save(7, price_model=model))
+    b = SimulationEngine(new_save(7, price_model=model))
+    play(a, 24)
+    play(b, 24)
+    assert fingerprint(a) == fingerprint(b)
+
+    c = SimulationEngine(new_save(8, price_model=model))
+    play(c, 24)
+    assert not np.array_equal(a.market_engine.prices, c.market_engine.prices)
+
+
+@pytest.mark.parametrize("model", ["uniform", "realistic"])
+def test_save_and_reload_matches_straight_run(model, tmp_path):
+    straight = SimulationEngine(new_save(11, price_model=model))
+    play(straight, 36)
+
+    resumed = SimulationEngine(new_save(11, price_model=model))
+    for part in range(3):
+        play(resumed, 12)
+        resumed = reload(resumed, str(tmp_path / f"part{part}.save"))
+    assert fingerprint(resumed) == fingerprint(straight)
+
+
+def test_event_state_survives_reload(tmp_path):
+    sim = SimulationEngine(new_save(3))
+    event_id = sim.event_manager.events_db[0]['id']
+    sim.event_manager.trigger_event_by_id(event_id)
+    sim.event_cooldown_days = 200
+    resumed = reload(sim, str(tmp_path / "events.save"))
+    assert resumed.event_manager.state() == [{"id": event_id, "remaining": sim.event_manager.active_events[0]['remaining']}]
+    assert resumed.event_cooldown_days == 200
+
+
+def test_trading_shared_with_views():
+    sim = SimulationEngine(new_save(5))
+    category, asset = sim.find_asset("AAPL")
+    price = asset['current_price']
+    balance = sim.save_data['balance']
+
+    assert sim.buy_asset("AAPL", 2) == pytest.approx(2 * price)
+    assert sim.buy_asset("AAPL", 1e12) is None
+    assert sim.buy_asset("NOPE", 1) is None
+    position = sim.save_data['portfolio'][category]["AAPL"]
+    assert position['amount'] == 2 and position['avg_price'] == pytest.approx(price)
+
+    assert sim.sell_asset("AAPL") == pytest.approx(2 * price)
+    assert position['amount'] == 0 and sim.sell_asset("AAPL") is None
+    assert sim.save_data['balance'] == pytest.approx(balance)
+    assert [n['category'] for n in sim.drain() if n['type'] == "transaction"] == ["Giełda", "Giełda"]
+
+    sim.save_data['balance'] = 0
+    sim.take_loan("small", 1000, 10, 0.1)
+    assert sim.save_data['active_loans'][-1]['monthly_rate'] == pytest.approx(110)
+    assert not sim.is_insolvent()
+    sim.save_data['balance'] = -0.01
+    assert sim.is_insolvent()
+
+
+def test_market_movement_advances_date():
+    sim = SimulationEngine(new_save(3))
+    start = sim.current_datetime
+    for _ in range(5):
+        sim.simulate_market_movement(30)
+    days, _ = sim.market_engine.history.tail()
+    assert (sim.current_datetime - start).days == 150
+    assert (np.diff(days) > 0).all()
+    assert days[-1] == sim.current_datetime.toordinal()
@@ -1,10 +1,8 @@
 import os
-import json
-import math
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
 from PyQt6.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout, 
-                             QFrame, QPushButton, QStackedWidget, QMessageBox, QLineEdit,)
+                             QFrame, QPushButton, QStackedWidget, QMessageBox, QLineEdit,
+                             QProgressDialog,)
 from PyQt6.QtGui import QFont, QColor, QPalette, QPixmap
 from PyQt6.QtCore import Qt, QTimer
 
@@ -18,13 +16,23 @@ from ui.views.portfolio_view import PortfolioView
 from ui.views.dashboard_view import DashboardView
 from ui.views.history_view import HistoryView
 from ui.views.bank_view import BankView
-from utils.event_manager import EventManager
+from utils.price_models import MODELS
+from utils.market_store import arrays_from_engine, ref_for
+from utils.save_format import SAVE_EXT
+from utils.autosave import AutoSaver, freeze_state
 from utils.achievement_manager import AchievementManager
+from utils.valuation import Valuation
+from utils.instruments import instruments
+from core.simulation import SimulationEngine
+from ui.simulation_worker import SimulationWorker
 from ui.views.achievements_view import AchievementsView
 from ui.widgets.toast import AchievementToast
+from ui.widgets.dev_overlay import DevOverlay
 
 
 class GameView(QWidget):
+    AUTOSAVE_DAYS = 7
+
     def __init__(self, parent=None, theme=None, save_data=None):
         super().__init__(parent)
         self.parent = parent
@@ -35,10 +43,8 @@ class GameView(QWidget):
         self.save_data = save_data or {}
         self.time_btns = [] 
         
-        self.event_manager = EventManager()
-        
-        date_str = self.save_data.get('created', '2026-01-14 00:00')
-        self.current_datetime = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
+        self.sim = SimulationEngine(self.save_data)
+        self.worker = None
 
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(15, 15, 15, 15)
@@ -53,7 +59,8 @@ class GameView(QWidget):
 
         self.workspace_stack = QStackedWidget()
 
-        self.event_cooldown_days = 0
+        self.autosaver = AutoSaver()
+        self.last_autosave = self.current_datetime
         
         self.view_home = HomeView(self, self.theme, self.save_data)
         self.view_markets = MarketsView(self)
@@ -93,21 +100,33 @@ class GameView(QWidget):
         self.apply_theme()
         self.save_data['max_prestige'] = self.calculate_total_game_prestige()
         self.achievement_manager = AchievementManager(self)
+        self.dev_overlay = DevOverlay(self)
+
+
+    # Stan symulacji należy do SimulationEngine - widoki czytają go przez te właściwości.
+    @property
+    def market_engine(self): return self.sim.market_engine
+
+    @property
+    def valuation(self): return self.sim.valuation
 
+    @property
+    def ledger(self): return self.sim.ledger
+
+    @property
+    def event_manager(self): return self.sim.event_manager
+
+    @property
+    def rng(self): return self.sim.rng
+
+    @property
+    def current_datetime(self): return self.sim.current_datetime
 
     def setup_initial_state(self, save_data):
-        """Inicjalizuje historię i odświeża widok giełdy."""
+        """Podpina zapis pod silnik symulacji i odświeża widok giełdy."""
         self.save_data = save_data
-        market_data = self.save_data.get('market_data', {})
-        for cat in ['stocks', 'crypto']:
-            items = market_data.get(cat, {})
-            for symbol, data in items.items():
-            
-                if 'history' not in data or not data['history']:
-                    data['history'] = [{
-                        "date": self.current_datetime.strftime("%Y-%m-%d"),
-                        "price": data['current_price']
-                    }]
+        if self.sim.save_data is not save_data:
+            self.sim = SimulationEngine(save_data)
         
         if hasattr(self, 'view_markets'):
             self.view_markets.refresh_view(self.save_data)
@@ -126,72 +145,137 @@ class GameView(QWidget):
     def open_valuables_manager(self): self.workspace_stack.setCurrentIndex(8)
 
     def advance_time(self, hours):
-        old_date = self.current_datetime
+        if self.is_simulating() or self.is_account_frozen():
+            return
 
-        if self.save_data.get('balance', 0) < 0:
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Financial Alert")
-            msg.setText("<b>YOUR ACCOUNT IS FROZEN!</b><br>You are in debt. Sell assets or take a loan to continue.")
-            msg.addButton("Go to Bank", QMessageBox.ButtonRole.AcceptRole).clicked.connect(lambda: self.switch_view(11))
-            msg.addButton("Sell Assets", QMessageBox.ButtonRole.AcceptRole).clicked.connect(lambda: self.switch_view(3))
-            msg.exec()
+        if hours < 24:
+            instruments.begin_jump()
+            settled, died = instruments.profiled(self.sim.advance_time)(hours)
+            self.after_simulation(settled, died)
+            instruments.end_jump()
             return
 
-        days_to_subtract = hours / 24
-        if not hasattr(self, 'event_cooldown_days'):
-            self.event_cooldown_days = 0
-            
-        if self.event_cooldown_days > 0:
-            self.event_cooldown_days -= days_to_subtract
-            if self.event_cooldown_days < 0: self.event_cooldown_days = 0
-
-        if hours >= 24:
-            days_to_jump = hours // 24
-            for _ in range(days_to_jump):
-                self.current_datetime += timedelta(days=1)
-                
-                self.event_manager.process_day()
-                self.simulate_market_movement()
-                self.check_death_chance()
-        else:
-            self.current_datetime += timedelta(hours=hours)
+        def job(on_step):
+            start = self.sim.current_datetime
+            settled, died = self.sim.advance_time(hours, on_step)
+            return (self.sim.current_datetime - start).days, settled, died
 
-        self.save_data['current_game_date'] = self.current_datetime.strftime("%Y-%m-%d")
-        self.save_data['created'] = self.current_datetime.strftime("%Y-%m-%d %H:%M")
+        self.start_jump(job, hours // 24)
+
+    def fast_forward(self, days, on_done=None):
+        """Przewija `days` dni w silniku symulacji na wątku roboczym (autozapis po każdym segmencie).
+
+        UI, osiągnięcia i newsy odświeżane są raz, na końcu; `on_done(dni)` dostaje liczbę
+        faktycznie przewiniętych dni. Zwraca False, jeśli skok nie wystartował.
+        """
+        if self.is_simulating() or self.is_account_frozen():
+            return False
+
+        self.start_jump(lambda on_step: self.sim.fast_forward(days, on_step), days, on_done)
+        return True
+
+    def is_simulating(self):
+        return self.worker is not None
+
+    def start_jump(self, job, total_days, on_done=None):
+        """Uruchamia skok czasu w SimulationWorker; na czas skoku blokuje interakcję ze stanem gry."""
+        for widget in (self.header, self.side_menu, self.workspace_stack):
+            widget.setEnabled(False)
+
+        self.progress_dialog = QProgressDialog(f"Simulating {total_days} days...", "Cancel", 0, total_days, self)
+        self.progress_dialog.setWindowTitle("Time Jump")
+        self.progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.progress_dialog.setMinimumDuration(400)
+        self.progress_dialog.setAutoReset(False)
+
+        instruments.begin_jump()
+        self.worker = SimulationWorker(instruments.profiled(job), total_days, on_step=lambda _: self.maybe_autosave(), parent=self)
+        self.worker.progress.connect(self.on_jump_progress)
+        self.worker.done.connect(lambda days, settled, died: self.finish_jump(days, settled, died, on_done))
+        self.progress_dialog.canceled.connect(self.worker.cancel)
+        self.worker.start()
+
+    def on_jump_progress(self, done, total):
+        if self.worker is not None and not self.worker.cancelled:
+            self.progress_dialog.setValue(min(done, total))
+
+    def finish_jump(self, days, settled, died, on_done=None):
+        """Wątek GUI: przejmuje stan po skoku (pełnym albo przerwanym) i odświeża UI.
+        Skok przerwany wyjątkiem kończy się ostrzeżeniem i bez autozapisu (stan mógł zostać w połowie segmentu)."""
+        self.worker.wait()
+        error = self.worker.error
+        self.worker.deleteLater()
+        self.worker = None
+        self.progress_dialog.canceled.disconnect()
+        self.progress_dialog.close()
+        self.progress_dialog.deleteLater()
+        for widget in (self.header, self.side_menu, self.workspace_stack):
+            widget.setEnabled(True)
+
+        if error is not None:
+            QMessageBox.warning(self, "System", f"Błąd symulacji: {error}")
+            self.handle_notices()
+            self.finish_time_jump(autosave=False)
+            instruments.end_jump()
+            return
+
+        self.after_simulation(settled, died)
+        instruments.end_jump()
+        if on_done:
+            on_done(days)
+
+    def after_simulation(self, settled, died):
+        self.handle_notices()
+        if not died:
+            self.finish_time_jump(settled)
+
+    def handle_notices(self):
+        """Pokazuje w UI powiadomienia zebrane przez silnik symulacji."""
+        for notice in self.sim.drain():
+            kind = notice['type']
+            if kind == "transaction":
+                if hasattr(self, 'achievement_manager'):
+                    self.achievement_manager.on_transaction(notice['category'], notice['amount'])
+            elif kind == "loan_paid":
+                QMessageBox.information(self, "Bank", f"Twoja pożyczka ({notice['loan']['type']}) została spłacona!")
+            elif kind == "course_finished":
+                QMessageBox.information(self, "Education", f"Course Finished: {notice['course']['name']}")
+            elif kind == "event_started":
+                event = notice['event']
+                print(f"DEBUG: Wylosowano event: {event['name']} (Waga: {event.get('weight', 1)})")
+            elif kind == "death":
+                self.trigger_end_game(notice['age'])
+
+    def is_account_frozen(self):
+        """Blokuje upływ czasu przy ujemnym saldzie i proponuje wyjście z długów."""
+        if not self.sim.is_insolvent():
+            return False
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Financial Alert")
+        msg.setText("<b>YOUR ACCOUNT IS FROZEN!</b><br>You are in debt. Sell assets or take a loan to continue.")
+        msg.addButton("Go to Bank", QMessageBox.ButtonRole.AcceptRole).clicked.connect(lambda: self.switch_view(11))
+        msg.addButton("Sell Assets", QMessageBox.ButtonRole.AcceptRole).clicked.connect(lambda: self.switch_view(3))
+        msg.exec()
+        return True
+
+    @instruments.timed("ui.finish_time_jump")
+    def finish_time_jump(self, settled=False, autosave=True):
+        """Jednorazowe odświeżenie daty, UI, osiągnięć i newsów po skoku czasu."""
         self.update_date_display()
 
-        if self.save_data.get('active_course'):
-            course = self.save_data['active_course']
-            course['remaining_hours'] -= hours
-            if course['remaining_hours'] <= 0:
-                if 'completed_courses' not in self.save_data: self.save_data['completed_courses'] = []
-                if course['id'] not in self.save_data['completed_courses']:
-                    self.save_data['completed_courses'].append(course['id'])
-                self.save_data['active_course'] = None
-                QMessageBox.information(self, "Education", f"Course Finished: {course['name']}")
-
-        if hours >= 720:
-            self.process_monthly_finances()
-            
-            if not self.event_manager.active_events and self.event_cooldown_days <= 0:
-                if random.random() < 0.15:
-                    events = self.event_manager.events_db
-                    
-                    if events:
-                        weights = [e.get('weight', 1) for e in events]
-                        
-                        random_event = random.choices(events, weights=weights, k=1)[0]
-                        
-                        self.event_manager.trigger_event_by_id(random_event['id'])
-                        
-                        self.event_cooldown_days = 365
-                        print(f"DEBUG: Wylosowano event: {random_event['name']} (Waga: {random_event.get('weight', 1)})")
+        if settled:
+            self.update_money_display()
+            self.view_home.refresh_view(self.save_data)
+            self.view_bank.refresh_view(self.save_data)
 
         self.achievement_manager.check_all()
 
         self.update_news_feed()
         self.refresh_active_view()
+        if autosave:
+            self.maybe_autosave()
 
+    @instruments.timed("ui.refresh_active_view")
     def refresh_active_view(self):
         """Pomocnicza metoda do odświeżania aktualnego okna."""
         current_idx = self.workspace_stack.currentIndex()
@@ -201,101 +285,6 @@ class GameView(QWidget):
             if current_idx == 9: views[current_idx].refresh_tabs()
             else: views[current_idx].refresh_view(self.save_data)
 
-    def process_monthly_finances(self):
-        """Główna metoda rozliczająca miesiąc: pensje, dywidendy, koszty i POŻYCZKI."""
-        job_id = self.save_data.get('current_job')
-        salary = 0
-        if job_id:
-            self.save_data['job_months'] = self.save_data.get('job_months', 0) + 1
-            salary = self.calculate_salary_with_milestones(job_id, self.save_data['job_months'])
-
-        total_upkeep = self.calculate_total_property_upkeep()
-
-        total_loan_costs = 0
-        loans = self.save_data.get('active_loans', [])
-        
-        total_loan_costs = 0
-        loans = self.save_data.get('active_loans', [])
-        
-        for loan in loans[:]:
-            if loan.get('is_new', False):
-                loan['is_new'] = False 
-                continue
-
-            loan['remaining_months'] -= 1
-            loan['paid_amount'] += loan['monthly_rate']
-            total_loan_costs += loan['monthly_rate']
-            
-            if loan['remaining_months'] <= 0:
-                loans.remove(loan)
-                QMessageBox.information(self, "Bank", f"Twoja pożyczka ({loan['type']}) została spłacona!")
-
-        total_dividends = 0
-        current_month = self.current_datetime.month
-        
-        if current_month in [3, 6, 9, 12]:
-            portfolio = self.save_data.get('portfolio', {})
-            market_data = self.save_data.get('market_data', {})
-            for symbol, p_data in portfolio.get('stocks', {}).items():
-                amount = p_data.get('amount', 0)
-                if amount > 0:
-                    m_info = market_data.get('stocks', {}).get(symbol, {})
-                    current_price = m_info.get('current_price', 0)
-                    div_rate = m_info.get('dividend_yield', 0) 
-                    total_dividends += (amount * current_price * div_rate)
-
-        if salary > 0:
-            self.log_transaction("Praca", f"Pensja: {self.save_data.get('current_title', 'Pracownik')}", salary)
-        
-        if total_dividends > 0:
-            self.log_transaction("Giełda", f"Dywidenda kwartalna ({current_month})", total_dividends)
-
-        if total_upkeep > 0:
-            self.log_transaction("Opłaty", "Utrzymanie nieruchomości", -total_upkeep)
-            
-        if total_loan_costs > 0:
-            self.log_transaction("Bank", "Automatyczna rata pożyczki", -total_loan_costs)
-
-        self.save_data['balance'] += (salary + total_dividends - total_upkeep - total_loan_costs)
-
-        self.update_money_display()
-        if hasattr(self, 'view_home'):
-            self.view_home.refresh_view(self.save_data)
-        
-        if self.workspace_stack.currentIndex() == 10:
-            self.view_history.refresh_view(self.save_data)
-            
-        if hasattr(self, 'view_bank'):
-            self.view_bank.refresh_view(self.save_data)
-
-    def calculate_salary_with_milestones(self, job_id, months):
-        path = os.path.join(os.path.dirname(__file__), "..", "data", "jobs.json")
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                jobs = json.load(f)
-                for j in jobs:
-                    if j['id'] == job_id:
-                        total = j['base_salary']
-                        for m in j.get('milestones', []):
-                            if months >= m['months']: total += m['bonus']
-                        return total
-        except: return 0
-        return 0
-
-    def calculate_total_property_upkeep(self):
-        owned_ids = self.save_data.get('owned_properties', [])
-        primary_id = self.save_data.get('primary_home', 'prop_00')
-        total = 0
-        path = os.path.join(os.path.dirname(__file__), "..", "data", "properties.json")
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                props = json.load(f)
-                for p in props:
-                    if p['id'] in owned_ids:
-                        total += p['upkeep'] if p['id'] == primary_id else int(p['upkeep'] * 0.5)
-        except: pass
-        return total
-
     def create_header(self):
         frame = QFrame()
         frame.setFixedHeight(100)
@@ -505,6 +494,55 @@ class GameView(QWidget):
             except Exception as e:
                 return f"Error triggering death: {str(e)}"
 
+        elif command == "ff" and len(args) > 0:
+            try:
+                days = int(args[0])
+            except ValueError: return "Error"
+            report = lambda done: self.console_input.setPlaceholderText(f"Result: Fast-forwarded {done} days")
+            if not self.fast_forward(days, on_done=report):
+                return "Busy"
+            return f"Fast-forwarding {days} days..."
+
+        elif command == "history" and len(args) > 0:
+            try:
+                days = max(1, int(args[0]))
+                self.save_data['history_days'] = days
+                self.market_engine.set_history_days(days)
+                return f"Price history window: {days} days"
+            except ValueError: return "Error"
+
+        elif command == "autosave" and len(args) > 0:
+            try:
+                days = max(0, int(args[0]))
+                self.save_data['autosave_days'] = days
+                return f"Autosave every {days} days" if days else "Autosave disabled"
+            except ValueError: return "Error"
+
+        elif command == "seed":
+            if args:
+                try:
+                    self.sim.reseed(int(args[0]))
+                except ValueError: return "Error"
+            return f"Seed: {self.rng.seed}"
+
+        elif command == "model" and len(args) > 0:
+            name = args[0].lower()
+            if name not in MODELS:
+                return f"Models: {', '.join(MODELS)}"
+            self.save_data['price_model'] = name
+            self.market_engine.set_model(name)
+            return f"Price model: {name}"
+
+        elif command == "perf":
+            return "Perf overlay on" if self.dev_overlay.toggle() else "Perf overlay off"
+
+        elif command == "profile":
+            try:
+                jumps = max(1, int(args[0])) if args else 1
+            except ValueError: return "Error"
+            instruments.capture(jumps)
+            return f"Profiling next {jumps} jump(s) -> {instruments.capture_path}"
+
         elif command == "test_luck":
             events = self.event_manager.events_db
             weights = [e.get('weight', 1) for e in events]
@@ -521,11 +559,36 @@ class GameView(QWidget):
 
     def save_game_logic(self):
         surname = self.save_data.get('player_surname', 'default')
-        path = os.path.join(os.path.dirname(__file__), "..", "saves", f"{surname}.json")
-        with open(path, 'w', encoding='utf-8') as f: json.dump(self.save_data, f, indent=4)
+        path = os.path.join(os.path.dirname(__file__), "..", "saves", f"{surname}{SAVE_EXT}")
+        self.save_data['market_ref'] = ref_for(path)
+        self.submit_save(path)
+        self.autosaver.flush()
+        if self.autosaver.last_error:
+            QMessageBox.warning(self, "System", f"Błąd zapisu: {self.autosaver.last_error}")
+            self.autosaver.last_error = None
+            return
         QMessageBox.information(self, "System", "Zapisano!")
 
+    @instruments.timed("save.freeze")
+    def submit_save(self, path):
+        """Zamraża stan gry i przekazuje zapis do wątku w tle."""
+        self.save_data['current_game_date'] = self.current_datetime.strftime("%Y-%m-%d")
+        market = arrays_from_engine(self.market_engine, self.save_data.get('market_data', {}))
+        ref = ref_for(path)
+        state = freeze_state(self.save_data, market_ref=ref, ledger_ref=ref, **self.sim.state())
+        self.autosaver.submit(path, state, market, self.ledger.freeze())
+
+    def maybe_autosave(self):
+        """Autozapis co `autosave_days` dni gry (0 wyłącza) do osobnego slotu `<nazwisko>-autosave`."""
+        interval = self.save_data.get('autosave_days', self.AUTOSAVE_DAYS)
+        if not interval or (self.current_datetime - self.last_autosave).days < interval:
+            return
+        self.last_autosave = self.current_datetime
+        surname = self.save_data.get('player_surname', 'default')
+        self.submit_save(os.path.join(os.path.dirname(__file__), "..", "saves", f"{surname}-autosave{SAVE_EXT}"))
+
     def return_to_menu(self):
+        self.autosaver.close()
         if self.parent: self.parent.show_main_menu()
 
     def create_side_menu(self):
@@ -620,60 +683,16 @@ class GameView(QWidget):
         """
         self.setStyleSheet(self.styleSheet() + msg_style)
 
-    def check_death_chance(self):
-        """Sprawdza szansę na zgon na podstawie aktualnego wieku."""
-        dob_str = self.save_data.get('date_of_birth', '1990-01-01')
-        dob = datetime.strptime(dob_str, "%Y-%m-%d")
-        
-        age = self.current_datetime.year - dob.year
-        
-        base = 1.12
-        annual_chance = (pow(base, age - 18) / pow(base, 100 - 18)) * 100
-        
-        import random
-        daily_chance = annual_chance / 365
-        if random.random() * 100 < daily_chance:
-            self.trigger_end_game(age)
-            return True
-        return False
-
     def trigger_end_game(self, age):
         """Summarizes estate using the exact logic from update_valuables_status."""
         try:
             cash = self.save_data.get('balance', 0)
             total_prestige = self.save_data.get('prestige', 0)
             
-            props_val = 0
-            owned_props = self.save_data.get('owned_properties', [])
-            import os, json
-            props_path = os.path.join(os.path.dirname(__file__), "..", "data", "properties.json")
-            if os.path.exists(props_path):
-                with open(props_path, 'r', encoding='utf-8') as f:
-                    props_data = json.load(f)
-                    for p in props_data:
-                        if p['id'] in owned_props: props_val += p.get('price', 0)
-
-
-            vehs_val = 0
-            owned_vehs = self.save_data.get('owned_vehicles', [])
-            vehs_path = os.path.join(os.path.dirname(__file__), "..", "data", "vehicles.json")
-            if os.path.exists(vehs_path):
-                with open(vehs_path, 'r', encoding='utf-8') as f:
-                    vehs_data = json.load(f)
-                    for v in vehs_data:
-                        if v['id'] in owned_vehs: vehs_val += v.get('price', 0)
-
-            items_val = 0
-            owned_ids = self.save_data.get('owned_valuables', [])
-            valuables_path = os.path.join(os.path.dirname(__file__), "..", "data", "valuables.json")
-            
-            if os.path.exists(valuables_path):
-                with open(valuables_path, 'r', encoding='utf-8') as f:
-                    items_db = json.load(f)
-                    for item in items_db:
-                        if item['id'] in owned_ids:
-                            # Twoja funkcja szuka pola 'price'
-                            items_val += item.get('price', 0)
+            estate = self.valuation.snapshot()
+            props_val = estate['properties']
+            vehs_val = estate['vehicles']
+            items_val = estate['valuables']
 
             total_net_worth = cash + props_val + vehs_val + items_val
 
@@ -700,6 +719,7 @@ class GameView(QWidget):
             msg.setText(report)
             msg.exec()
             
+            self.autosaver.close()
             if hasattr(self, 'parent') and self.parent:
                 self.parent.show_main_menu()
             else:
@@ -708,49 +728,27 @@ class GameView(QWidget):
         except Exception as e:
             print(f"DEBUG Error: {str(e)}")
     
-    def simulate_market_movement(self):
-        """Symuluje zmianę cen na giełdzie przy każdym skoku czasu z uwzględnieniem wydarzeń."""
-        market_data = self.save_data.get('market_data', {})
-        
-        for category in ['stocks', 'crypto']:
-            items = market_data.get(category, {})
-            for symbol, data in items.items():
-                sector = data.get('category', category).lower() 
-                event_modifier = self.event_manager.get_modifier_for_symbol(symbol, sector)
-
-                volatility = 0.02 if category == 'stocks' else 0.05
-                base_change = 1 + random.uniform(-volatility, volatility)
-                
-                total_change = base_change * event_modifier
-                
-                data['current_price'] = round(data['current_price'] * total_change, 2)
+    def log_transaction(self, category, description, amount):
+        self.sim.log_transaction(category, description, amount)
+        self.handle_notices()
 
-                if 'history' not in data or not isinstance(data['history'], list):
-                    data['history'] = []
+    # Transakcje gracza - ta sama logika co w backteście (core.simulation), tu z obsługą powiadomień.
+    def buy_asset(self, symbol, amount):
+        cost = self.sim.buy_asset(symbol, amount)
+        self.handle_notices()
+        return cost
 
-                data['history'].append({
-                    "date": self.current_datetime.strftime("%Y-%m-%d"),
-                    "price": data['current_price']
-                })
+    def sell_asset(self, symbol, amount=None):
+        revenue = self.sim.sell_asset(symbol, amount)
+        self.handle_notices()
+        return revenue
 
-                if len(data['history']) > 30:
-                    data['history'].pop(0)
+    def take_loan(self, loan_type, amount, months, interest):
+        self.sim.take_loan(loan_type, amount, months, interest)
+        self.handle_notices()
 
-    def log_transaction(self, category, description, amount):
-        if 'transaction_history' not in self.save_data:
-            self.save_data['transaction_history'] = []
-            
-        new_entry = {
-            "date": self.current_datetime.strftime("%Y-%m-%d %H:%M"),
-            "category": category,
-            "description": description,
-            "amount": float(amount)
-        }
-        
-        self.save_data['transaction_history'].insert(0, new_entry)
-        
-        if hasattr(self, 'view_history'):
-            self.view_history.history_data = self.save_data['transaction_history']
+    def change_job(self, job_id):
+        return self.sim.change_job(job_id)
 
     def show_bankruptcy_dialog(self):
         msg = QMessageBox(self)
@@ -849,16 +847,7 @@ class GameView(QWidget):
         """)
 
     def calculate_total_game_prestige(self):
-        total = 0
-        data_dir = os.path.join(os.path.dirname(__file__), "data")
-        for file in ["properties.json", "vehicles.json", "valuables.json"]:
-            path = os.path.join(data_dir, file)
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    items = json.load(f)
-                    for item in items:
-                        total += item.get('prestige', 0)
-        return total
+        return Valuation.catalog_prestige()
     
     def show_achievement_toast(self, ach_id):
         self.toast_queue.append(ach_id)
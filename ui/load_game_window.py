@@ -1,5 +1,4 @@
 import os
-import json
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QPushButton, QMessageBox,
     QScrollArea, QWidget, QHBoxLayout, QFrame
@@ -7,6 +6,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont, QColor, QPalette
 from PyQt6.QtCore import Qt
 from core.theme_manager import ThemeManager
+from utils.save_format import list_saves, forget_save, load_save
 
 
 class LoadGameWindow(QDialog):
@@ -61,7 +61,8 @@ class LoadGameWindow(QDialog):
             if widget:
                 widget.setParent(None)
 
-        save_files = [f for f in os.listdir(self.saves_dir) if f.endswith(".json")]
+        saves = list_saves(self.saves_dir)
+        save_files = list(saves)
         if not save_files:
             no_save_label = QLabel("No saved games found.")
             no_save_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -70,12 +71,7 @@ class LoadGameWindow(QDialog):
             return
 
         for save_file in sorted(save_files, reverse=True):
-            file_path = os.path.join(self.saves_dir, save_file)
-            try:
-                with open(file_path, "r") as f:
-                    data = json.load(f)
-            except Exception:
-                continue
+            data = saves[save_file]
 
             frame = QFrame()
             frame.setFrameShape(QFrame.Shape.StyledPanel)
@@ -95,7 +91,7 @@ class LoadGameWindow(QDialog):
                 f"<b>{data['player_name']} {data['player_surname']}</b>  "
                 f"|  Mode: {data['mode']}<br>"
                 f"💰 Balance: ${data['balance']:,}  |  Age: {data['player_age']}<br>"
-                f"🕒 Last Played: {data['created']}"
+                f"🕒 Last Played: {data.get('last_played') or data['created']}  |  💾 {data['size'] / 1024:,.0f} KB"
             )
             info.setStyleSheet("font-size: 12px;")
             info.setWordWrap(True)
@@ -123,8 +119,7 @@ class LoadGameWindow(QDialog):
         """Load selected save file."""
         path = os.path.join(self.saves_dir, filename)
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
+            data = load_save(path)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to load save file:\n{e}")
             return
@@ -151,6 +146,7 @@ class LoadGameWindow(QDialog):
         if confirm == QMessageBox.StandardButton.Yes:
             try:
                 os.remove(os.path.join(self.saves_dir, filename))
+                forget_save(self.saves_dir, filename)
                 widget.setParent(None)
                 QMessageBox.information(self, "Deleted", f"Save '{filename}' has been deleted.")
             except Exception as e:
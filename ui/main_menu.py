@@ -1,5 +1,4 @@
 import os
-import json
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QSpacerItem,
@@ -11,6 +10,7 @@ from ui.settings_window import SettingsWindow
 from ui.new_game_window import NewGameWindow
 from ui.load_game_window import LoadGameWindow
 from core.theme_manager import ThemeManager
+from utils.save_format import list_saves, load_save
 
 
 class MainMenu(QWidget):
@@ -21,6 +21,7 @@ class MainMenu(QWidget):
         self.parent = parent
         self.theme = ThemeManager()
         self.last_save_data = None
+        self.last_save_path = None
         self.init_ui()
 
         self.apply_theme() #
@@ -170,13 +171,12 @@ class MainMenu(QWidget):
             self.btn_continue.setEnabled(False)
             return
 
-        try:
-            with open(save_path, "r") as f:
-                data = json.load(f)
-                self.last_save_data = data
-        except Exception:
+        data = list_saves(saves_dir, only=last_save).get(last_save)
+        if data is None:
             self.last_save_info.hide()
             return
+        self.last_save_data = data
+        self.last_save_path = save_path
 
         self.last_save_info.show()
         self.btn_continue.setEnabled(True)
@@ -186,7 +186,7 @@ class MainMenu(QWidget):
         balance = data.get('balance', 0)
         age = data.get('player_age', '??')
         mode = data.get('mode', 'Standard')
-        created = data.get('created', 'N/A')
+        created = data.get('last_played') or data.get('created', 'N/A')
 
         self.last_save_player.setText(f"👤 {name} {surname}")
         self.last_save_details.setText(f"💰 Balance: ${balance:,}  |  Age: {age}  |  Mode: {mode}")
@@ -198,6 +198,12 @@ class MainMenu(QWidget):
             QMessageBox.warning(self, "No Save", "No previous save found.")
             return
 
+        try:
+            self.last_save_data = load_save(self.last_save_path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load save file:\n{e}")
+            return
+
         if 'owned_properties' not in self.last_save_data:
             self.last_save_data['owned_properties'] = ["prop_00"]
             self.last_save_data['primary_home'] = "prop_00"
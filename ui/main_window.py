@@ -1,3 +1,4 @@
+import os
 import sys
 from PyQt6.QtWidgets import QApplication, QMainWindow
 from PyQt6.QtCore import Qt
@@ -5,6 +6,7 @@ from ui.main_menu import MainMenu
 from ui.game_view import GameView 
 from core.theme_manager import ThemeManager
 from utils.market_provider import MarketProvider
+from utils.save_format import migrate_saves
 
 class MainWindow(QMainWindow):
 
@@ -15,21 +17,35 @@ class MainWindow(QMainWindow):
         self.theme = ThemeManager()
 
         print("Inicjalizacja giełdy... Proszę czekać.")
-        self.market_provider = MarketProvider()
+        self.market_provider = MarketProvider(progress=self.report_market_progress)
         self.global_market_snapshot = self.market_provider.get_market_data()
+        if self.market_provider.is_stale():
+            self.market_provider.refresh_in_background(self.on_market_refreshed)
         print("Giełda gotowa.")
 
+        migrated = migrate_saves(os.path.join(os.path.dirname(__file__), "..", "saves"))
+        if self.theme.last_save in migrated:
+            self.theme.set_last_save(migrated[self.theme.last_save])
+
         self.menu = MainMenu(self)
         self.setCentralWidget(self.menu)
 
         self.showFullScreen()
 
+    def report_market_progress(self, stage, done, total):
+        print(f"Giełda [{stage}]: {done}/{total}")
+
+    def on_market_refreshed(self, market_data):
+        """Wątek aktualizacji: podmienia tylko referencję - nowe gry dostaną świeży snapshot."""
+        self.global_market_snapshot = market_data
+        print("Giełda zaktualizowana.")
+
     def start_game(self, save_data):
         if hasattr(self, 'menu') and self.menu:
             self.menu.deleteLater()
             self.menu = None
             
-        if 'market_data' not in save_data:
+        if 'market_data' not in save_data and 'market_ref' not in save_data:
             save_data['market_data'] = self.global_market_snapshot
             print("Dane rynkowe przekazane do nowego zapisu bez pobierania.")
             
@@ -1,5 +1,4 @@
 import os
-import json
 from datetime import datetime, date
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QMessageBox,
@@ -8,6 +7,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont, QColor, QPalette, QPixmap
 from PyQt6.QtCore import Qt, QDate
 from utils.market_provider import MarketProvider
+from utils.market_store import SNAPSHOT_STORE, arrays_from_market_data, load_store, ref_for, resolve
+from utils.save_format import SAVE_EXT, write_save
 
 
 class NewGameWindow(QDialog):
@@ -322,13 +323,19 @@ class NewGameWindow(QDialog):
             "created": datetime.now().strftime("%Y-%m-%d %H:%M"),
             "primary_home": "prop_00",          
             "owned_properties": ["prop_00"],
-            "market_data": market_snapshot,
             "portfolio": { "stocks": {}, "crypto": {}}
         }
+        # Zapis dostaje własną kopię tablic rynku - globalny snapshot jest nadpisywany przy odświeżaniu.
+        store_path = resolve(SNAPSHOT_STORE)
+        if os.path.exists(store_path):
+            market = load_store(store_path, mmap=False)
+        else:
+            market = arrays_from_market_data(market_snapshot)
 
-        filename = f"{surname}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(os.path.join(self.saves_dir, filename), "w", encoding='utf-8') as f:
-            json.dump(save_data, f, indent=4)
+        filename = f"{surname}-{datetime.now().strftime('%Y%m%d_%H%M%S')}{SAVE_EXT}"
+        path = os.path.join(self.saves_dir, filename)
+        save_data["market_ref"] = ref_for(path)
+        write_save(path, save_data, market)
 
         self.theme.set_last_save(filename)
         if self.parent and hasattr(self.parent, 'start_game'):
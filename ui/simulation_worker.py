@@ -0,0 +1,51 @@
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class SimulationWorker(QThread):
+    """Skok czasu na wątku roboczym - okno gry nie zamarza przy wieloletnim przewijaniu.
+
+    `job(on_step)` to wywołanie SimulationEngine (np. fast_forward) zwracające
+    (dni, settled, died). Postęp wysyłany jest nie częściej niż raz na klatkę (FRAME_MS),
+    a cancel() zatrzymuje symulację na granicy najbliższego segmentu, więc stan gry zostaje
+    spójny. Wynik trafia do wątku GUI jednym sygnałem `done` - dopiero wtedy UI czyta stan
+    i odświeża widoki. Wyjątek z `job` też kończy się sygnałem `done`; odbiorca musi sprawdzić `error`.
+    """
+
+    FRAME_MS = 16
+
+    progress = pyqtSignal(int, int)
+    done = pyqtSignal(int, bool, bool)
+
+    def __init__(self, job, total_days, on_step=None, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.total_days = total_days
+        self.on_step = on_step
+        self.cancelled = False
+        self.error = None
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def step(self, days_done):
+        """Wołane przez silnik po każdym segmencie (na wątku roboczym). True przerywa skok."""
+        if self.on_step:
+            self.on_step(days_done)
+        now = time.perf_counter()
+        if (now - self._last_emit) * 1000 >= self.FRAME_MS:
+            self._last_emit = now
+            self.progress.emit(days_done, self.total_days)
+        return self.cancelled
+
+    def run(self):
+        days, settled, died = 0, False, False
+        try:
+            days, settled, died = self.job(self.step)
+        except Exception as e:
+            self.error = e
+            print(f"DEBUG: Błąd symulacji: {e}")
+        self.progress.emit(days, self.total_days)
+        self.done.emit(days, settled, died)
@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QGridLayout, QFrame, QLabel
 from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtCore import Qt
-import json, os
+from utils.catalog import catalog
 
 class AchievementsView(QFrame):
     def __init__(self, parent=None, theme=None, save_data=None):
@@ -36,17 +36,10 @@ class AchievementsView(QFrame):
 
         unlocked = self.save_data.get('unlocked_achievements', [])
         
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "achievements.json")
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)['achievements']
-                
-            for i, ach in enumerate(data):
-                is_unlocked = ach['id'] in unlocked
-                card = self.create_achievement_card(ach, is_unlocked)
-                self.grid.addWidget(card, i // 3, i % 3)
-        except Exception as e:
-            print(f"Error loading achievements UI: {e}")
+        for i, ach in enumerate(catalog.records("achievements")):
+            is_unlocked = ach['id'] in unlocked
+            card = self.create_achievement_card(ach, is_unlocked)
+            self.grid.addWidget(card, i // 3, i % 3)
 
     def create_achievement_card(self, ach, is_unlocked):
         card = QFrame()
@@ -162,29 +162,7 @@ class BankView(QWidget):
         return frame
 
     def take_loan(self, offer, adjusted_interest):
-        total_to_pay = offer['amount'] * (1 + adjusted_interest)
-        
-        new_loan = {
-            "type": offer['id'],
-            "principal": offer['amount'],
-            "total_to_pay": total_to_pay,
-            "monthly_rate": total_to_pay / offer['months'],
-            "remaining_months": offer['months'],
-            "paid_amount": 0,
-            "is_new": True
-        }
-        
-        if 'active_loans' not in self.save_data: 
-            self.save_data['active_loans'] = []
-            
-        self.save_data['active_loans'].append(new_loan)
-        self.save_data['balance'] += offer['amount']
-        
-        self.parent_ctrl.log_transaction(
-            "Bank", 
-            f"Loan Taken: ${offer['amount']:,} (Rate: {adjusted_interest*100:.1f}%)", 
-            offer['amount']
-        )
+        self.parent_ctrl.take_loan(offer['id'], offer['amount'], offer['months'], adjusted_interest)
         
         self.parent_ctrl.update_money_display()
         
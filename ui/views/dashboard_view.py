@@ -4,12 +4,11 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame,
                              QTableWidgetItem, QHeaderView)
 from PyQt6.QtGui import QColor, QPainterPath
 from PyQt6.QtCore import Qt
-import os
-import json
 
 class DashboardView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.parent_ctrl = parent
         self.layout = QVBoxLayout(self)
         self.setStyleSheet("background-color: #121212; color: white;")
 
@@ -53,33 +52,15 @@ class DashboardView(QWidget):
         self.total_net_worth.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.layout.addWidget(self.total_net_worth)
 
-    def calculate_val(self, save_data, json_file, save_key):
-        owned_ids = save_data.get(save_key, [])
-        total = 0
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", json_file)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                items = json.load(f)
-                for i in items:
-                    if i['id'] in owned_ids:
-                        total += i.get('price', 0)
-        return total
-
     def refresh_view(self, save_data):
-        cash = save_data.get('balance', 0)
-        market_val = 0
-        portfolio = save_data.get('portfolio', {})
-        market_data = save_data.get('market_data', {})
-        for cat in ['stocks', 'crypto']:
-            for sym, p_data in portfolio.get(cat, {}).items():
-                price = market_data.get(cat, {}).get(sym, {}).get('current_price', 0)
-                market_val += p_data.get('amount', 0) * price
-        
-        vehicles_val = self.calculate_val(save_data, "vehicles.json", "owned_vehicles")
-        houses_val = self.calculate_val(save_data, "properties.json", "owned_properties")
-        valuables_val = self.calculate_val(save_data, "valuables.json", "owned_valuables")
+        estate = self.parent_ctrl.valuation.snapshot()
+        cash = estate['cash']
+        market_val = estate['portfolio']
+        vehicles_val = estate['vehicles']
+        houses_val = estate['properties']
+        valuables_val = estate['valuables']
         
-        total = cash + market_val + vehicles_val + houses_val + valuables_val
+        total = estate['net_worth']
         vals = {
             "Cash": cash, 
             "Stocks & Crypto": market_val, 
@@ -1,7 +1,7 @@
-import os, json
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
                              QLabel, QPushButton, QScrollArea, QTabWidget, QMessageBox)
 from PyQt6.QtCore import Qt
+from utils.catalog import catalog
 
 class EmploymentView(QFrame):
     def __init__(self, parent=None, theme=None, save_data=None):
@@ -88,10 +88,7 @@ class EmploymentView(QFrame):
             self.parent_ctrl.return_to_home()
 
     def load_data(self, filename):
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", filename)
-        try:
-            with open(path, 'r', encoding='utf-8') as f: return json.load(f)
-        except: return []
+        return catalog.records(filename)
 
     def create_job_market(self):
         scroll = QScrollArea()
@@ -191,8 +188,7 @@ class EmploymentView(QFrame):
         return scroll
 
     def apply_for_job(self, job):
-        self.save_data['current_job'] = job['id']
-        self.save_data['job_months'] = 0
+        self.parent_ctrl.change_job(job['id'])
         QMessageBox.information(self, "Career", f"You are now working as {job['title']}!")
         self.refresh_tabs()
 
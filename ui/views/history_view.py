@@ -1,14 +1,167 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                             QTableWidgetItem, QHeaderView, QLabel, QPushButton)
-from PyQt6.QtCore import Qt
+from datetime import timedelta
+
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                             QHeaderView, QLabel, QComboBox)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 
+
+class LedgerTableModel(QAbstractTableModel):
+    """Tabela nad rejestrem transakcji (utils.ledger.Ledger) bez kopiowania wierszy.
+
+    Model trzyma tylko tablicę numerów wierszy rejestru w kolejności wyświetlania (po filtrze
+    i sortowaniu), a komórki formatuje w data() dopiero, gdy widok o nie poprosi. Wiersze
+    doładowywane są porcjami (canFetchMore/fetchMore) podczas przewijania.
+    """
+
+    HEADERS = ["Date", "Category", "Description", "Amount"]
+    BATCH = 200
+
+    def __init__(self, ledger=None, parent=None):
+        super().__init__(parent)
+        self.ledger = ledger
+        self.category = None
+        self.since = None
+        self.sort_column = 0
+        self.sort_order = Qt.SortOrder.DescendingOrder
+        self.order = np.arange(0)
+        self.loaded = 0
+        self.synced = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        i = int(self.order[index.row()])
+        col = index.column()
+        ledger = self.ledger
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return ledger.when(i).strftime("%Y-%m-%d %H:%M")
+            if col == 1:
+                return ledger.category_names[ledger.categories[i]]
+            if col == 2:
+                return ledger.description_texts[ledger.descriptions[i]]
+            return f"{ledger.amounts[i]:+,.2f}$"
+        if col == 3:
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor("#2ecc71" if ledger.amounts[i] > 0 else "#e74c3c")
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.order)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.BATCH, len(self.order) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.reload()
+
+    def set_filter(self, category=None, since=None):
+        self.category = category
+        self.since = since
+        self.reload()
+
+    def set_ledger(self, ledger):
+        self.ledger = ledger
+        self.reload()
+
+    def ordered(self, rows):
+        """Sortuje numery wierszy wg bieżącej kolumny. Data = numer wiersza (rejestr jest chronologiczny)."""
+        ledger = self.ledger
+        if self.sort_column == 1:
+            key = self.ranks(ledger.category_names)[ledger.categories[rows]]
+        elif self.sort_column == 2:
+            key = self.ranks(ledger.description_texts)[ledger.descriptions[rows]]
+        elif self.sort_column == 3:
+            key = ledger.amounts[rows]
+        else:
+            key = None
+        if key is not None:
+            rows = rows[np.argsort(key, kind='stable')]
+        return rows[::-1] if self.sort_order == Qt.SortOrder.DescendingOrder else rows
+
+    @staticmethod
+    def ranks(texts):
+        """Pozycja każdego kodu w alfabetycznej kolejności tekstów."""
+        ranks = np.empty(len(texts), dtype=np.int64)
+        ranks[np.argsort(np.array(texts, dtype=object))] = np.arange(len(texts))
+        return ranks
+
+    def reload(self, keep_loaded=False):
+        """Przelicza wybór wierszy od zera (zmiana filtra, sortowania albo rejestru)."""
+        self.beginResetModel()
+        if self.ledger is None:
+            self.order = np.arange(0)
+        else:
+            self.order = self.ordered(self.ledger.select(self.category, self.since))
+            self.synced = len(self.ledger)
+        self.loaded = min(len(self.order), max(self.loaded, self.BATCH) if keep_loaded else self.BATCH)
+        self.endResetModel()
+
+    def sync(self):
+        """Dołącza wpisy dopisane do rejestru od ostatniego odczytu.
+
+        Przy sortowaniu po dacie nowe wiersze trafiają na początek (malejąco) lub koniec
+        (rosnąco) bez resetu modelu, więc pozycja przewijania zostaje zachowana. Naraz wstawiana
+        jest najwyżej jedna paczka BATCH.
+        """
+        if self.ledger is None or len(self.ledger) == self.synced:
+            return
+        if self.sort_column != 0:
+            self.reload(keep_loaded=True)
+            return
+        rows = self.ledger.select(self.category, self.since)
+        fresh = rows[np.searchsorted(rows, self.synced):]
+        self.synced = len(self.ledger)
+        if not len(fresh):
+            return
+        if self.sort_order == Qt.SortOrder.DescendingOrder and len(fresh) > self.BATCH:
+            # Po długim skoku widok zaczyna od najnowszej paczki - resztę (także stare wiersze) dociąga fetchMore.
+            self.beginResetModel()
+            self.order = np.concatenate([fresh[::-1], self.order])
+            self.loaded = self.BATCH
+            self.endResetModel()
+        elif self.sort_order == Qt.SortOrder.DescendingOrder:
+            self.beginInsertRows(QModelIndex(), 0, len(fresh) - 1)
+            self.order = np.concatenate([fresh[::-1], self.order])
+            self.loaded += len(fresh)
+            self.endInsertRows()
+        else:
+            self.order = np.concatenate([self.order, fresh])
+            if self.loaded == len(self.order) - len(fresh):
+                self.fetchMore()
+
+    def total(self):
+        return float(self.ledger.amounts[self.order].sum()) if self.ledger is not None else 0.0
+
+
 class HistoryView(QWidget):
+    PERIODS = [("All time", None), ("Last 7 days", 7), ("Last 30 days", 30), ("Last 365 days", 365)]
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.history_data = []
-        self.current_page = 0
-        self.page_size = 50 
+        self.parent_ctrl = parent
 
         self.layout = QVBoxLayout(self)
         self.setStyleSheet("background-color: #121212; color: white;")
@@ -17,58 +170,87 @@ class HistoryView(QWidget):
         header.setStyleSheet("font-size: 22px; font-weight: bold; color: #f1c40f;")
         self.layout.addWidget(header)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Date", "Category", "Description", "Amount"])
+        combo_style = """
+            QComboBox {
+                background-color: #1e1e1e; color: white; padding: 6px;
+                border: 1px solid #444; min-width: 150px;
+            }
+            QAbstractItemView { background-color: #1e1e1e; color: white; selection-background-color: #3a96dd; }
+        """
+        filter_layout = QHBoxLayout()
+        self.category_filter = QComboBox()
+        self.category_filter.addItem("All Categories")
+        self.period_filter = QComboBox()
+        self.period_filter.addItems([label for label, _ in self.PERIODS])
+        for box in [self.category_filter, self.period_filter]:
+            box.setStyleSheet(combo_style)
+            box.currentIndexChanged.connect(self.apply_filters)
+        filter_layout.addWidget(QLabel("Category:"))
+        filter_layout.addWidget(self.category_filter)
+        filter_layout.addWidget(QLabel("Period:"))
+        filter_layout.addWidget(self.period_filter)
+        filter_layout.addStretch()
+        self.summary_lbl = QLabel("")
+        filter_layout.addWidget(self.summary_lbl)
+        self.layout.addLayout(filter_layout)
+
+        self.model = LedgerTableModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.DescendingOrder)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setStyleSheet("QTableWidget { background-color: #1a1a1a; color: #eee; }")
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(28)
+        self.table.setStyleSheet("QTableView { background-color: #1a1a1a; color: #eee; }")
         self.layout.addWidget(self.table)
 
-        nav_layout = QHBoxLayout()
-        self.prev_btn = QPushButton("⬅ Previous Page")
-        self.next_btn = QPushButton("Next Page ➡")
-        self.page_lbl = QLabel("Page: 1 / 1")
-        
-        for btn in [self.prev_btn, self.next_btn]:
-            btn.setFixedSize(150, 30)
-            btn.setStyleSheet("background: #333; color: white; border-radius: 5px;")
-            nav_layout.addWidget(btn)
-        
-        nav_layout.insertWidget(1, self.page_lbl)
-        self.layout.addLayout(nav_layout)
-
-        self.prev_btn.clicked.connect(lambda: self.change_page(-1))
-        self.next_btn.clicked.connect(lambda: self.change_page(1))
-
     def refresh_view(self, save_data):
-        self.history_data = save_data.get('transaction_history', [])
-        self.update_table()
-
-    def update_table(self):
-        total_pages = max(1, (len(self.history_data) + self.page_size - 1) // self.page_size)
-        
-        if self.current_page >= total_pages: self.current_page = total_pages - 1
-        if self.current_page < 0: self.current_page = 0
-
-        start_idx = self.current_page * self.page_size
-        end_idx = start_idx + self.page_size
-        page_items = self.history_data[start_idx:end_idx]
-
-        self.table.setRowCount(len(page_items))
-        for row, entry in enumerate(page_items):
-            self.table.setItem(row, 0, QTableWidgetItem(entry['date']))
-            self.table.setItem(row, 1, QTableWidgetItem(entry['category']))
-            self.table.setItem(row, 2, QTableWidgetItem(entry['description']))
-            
-            amt = entry['amount']
-            amt_item = QTableWidgetItem(f"{amt:+,.2f}$")
-            amt_item.setForeground(QColor("#2ecc71" if amt > 0 else "#e74c3c"))
-            amt_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-            self.table.setItem(row, 3, amt_item)
-
-        self.page_lbl.setText(f"Page: {self.current_page + 1} / {total_pages}")
-        self.prev_btn.setEnabled(self.current_page > 0)
-        self.next_btn.setEnabled(self.current_page < total_pages - 1)
-
-    def change_page(self, delta):
-        self.current_page += delta
-        self.update_table()
\ No newline at end of file
+        ledger = getattr(self.parent_ctrl, 'ledger', None)
+        if ledger is not self.model.ledger:
+            self.model.set_ledger(ledger)
+            self.rebuild_categories()
+        elif self.since() is not None:
+            self.model.set_filter(self.model.category, self.since())
+        else:
+            self.model.sync()
+        self.update_categories()
+        self.update_summary()
+
+    def update_categories(self):
+        """Dopisuje do listy kategorie, które pojawiły się w rejestrze od ostatniego odświeżenia."""
+        ledger = self.model.ledger
+        if ledger is None:
+            return
+        for name in ledger.category_names[self.category_filter.count() - 1:]:
+            self.category_filter.addItem(name)
+
+    def rebuild_categories(self):
+        """Nowy rejestr (inny zapis): lista kategorii od zera. Wybrana kategoria zostaje, jeśli istnieje."""
+        ledger = self.model.ledger
+        selected = self.model.category
+        names = ledger.category_names if ledger is not None else []
+        self.category_filter.blockSignals(True)
+        self.category_filter.clear()
+        self.category_filter.addItem("All Categories")
+        self.category_filter.addItems(names)
+        self.category_filter.setCurrentIndex(names.index(selected) + 1 if selected in names else 0)
+        self.category_filter.blockSignals(False)
+        if selected is not None and selected not in names:
+            self.model.set_filter(None, self.since())
+
+    def apply_filters(self):
+        category = self.category_filter.currentText() if self.category_filter.currentIndex() > 0 else None
+        self.model.set_filter(category, self.since())
+        self.table.scrollToTop()
+        self.update_summary()
+
+    def since(self):
+        """Początek wybranego okresu liczony od bieżącej daty gry (None = cała historia)."""
+        days = self.PERIODS[self.period_filter.currentIndex()][1]
+        if days is None or not hasattr(self.parent_ctrl, 'current_datetime'):
+            return None
+        return self.parent_ctrl.current_datetime - timedelta(days=days)
+
+    def update_summary(self):
+        self.summary_lbl.setText(f"{len(self.model.order):,} transactions | Net: {self.model.total():+,.2f}$")
@@ -1,12 +1,13 @@
 import os
-import json
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QGridLayout, QPushButton
 from PyQt6.QtGui import QFont, QPixmap
 from PyQt6.QtCore import Qt
+from utils.catalog import catalog
 
 class HomeView(QFrame):
     def __init__(self, parent=None, theme=None, save_data=None):
         super().__init__(parent)
+        self.parent_ctrl = parent
         self.theme = theme
         self.save_data = save_data or {}
         self.setup_ui()
@@ -132,11 +133,20 @@ class HomeView(QFrame):
                     f"Completed: {len(unlocked_list)} / 49\n"
                 )
 
+    def estate(self):
+        """Sumy z serwisu wyceny gry (None, dopóki GameView go nie zbuduje)."""
+        valuation = getattr(self.parent_ctrl, 'valuation', None)
+        return valuation.snapshot() if valuation else None
+
     def update_profile_text(self):
-        p_house = self.calculate_house_prestige_with_bonus()
-        p_veh = self.calculate_category_prestige("vehicles.json", "owned_vehicles")
-        p_val = self.calculate_category_prestige("valuables.json", "owned_valuables")
-        total_prestige = p_house + p_veh + p_val
+        estate = self.estate()
+        if estate:
+            total_prestige = estate['prestige']
+        else:
+            p_house = self.calculate_house_prestige_with_bonus()
+            p_veh = self.calculate_category_prestige("vehicles.json", "owned_vehicles")
+            p_val = self.calculate_category_prestige("valuables.json", "owned_valuables")
+            total_prestige = p_house + p_veh + p_val
         self.save_data['prestige'] = total_prestige
         
         from datetime import datetime
@@ -164,20 +174,14 @@ class HomeView(QFrame):
         job_title = "Unemployed"
         salary_text = "$0"
         
-        if job_id:
-            path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "jobs.json")
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    jobs = json.load(f)
-                    for j in jobs:
-                        if j['id'] == job_id:
-                            job_title = j['title']
-                            salary = j['base_salary']
-                            months = self.save_data.get('job_months', 0)
-                            for m in j.get('milestones', []):
-                                if months >= m['months']: salary += m['bonus']
-                            salary_text = f"${salary:,}"
-                            break
+        j = catalog.get("jobs", job_id) if job_id else None
+        if j:
+            job_title = j['title']
+            salary = j['base_salary']
+            months = self.save_data.get('job_months', 0)
+            for m in j.get('milestones', []):
+                if months >= m['months']: salary += m['bonus']
+            salary_text = f"${salary:,}"
 
         active_course = self.save_data.get('active_course')
         course_status = "None"
@@ -202,45 +206,27 @@ class HomeView(QFrame):
         primary_id = self.save_data.get('primary_home', 'prop_00')
         owned_ids = self.save_data.get('owned_properties', [])
         total = 0
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "properties.json")
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                props = json.load(f)
-                for p in props:
-                    if p['id'] in owned_ids:
-                        total += (p.get('prestige', 0) * (2 if p['id'] == primary_id else 1))
+        for p in catalog.owned("properties", owned_ids):
+            total += (p.get('prestige', 0) * (2 if p['id'] == primary_id else 1))
         return total
 
     def calculate_category_prestige(self, json_file, save_key):
         owned_ids = self.save_data.get(save_key, [])
-        total = 0
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", json_file)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                items = json.load(f)
-                for i in items:
-                    if i['id'] in owned_ids:
-                        total += i.get('prestige', 0)
-        return total
+        return sum(i.get('prestige', 0) for i in catalog.owned(json_file, owned_ids))
 
     def update_home_property_data(self):
         primary_id = self.save_data.get('primary_home', 'prop_00')
         owned_ids = self.save_data.get('owned_properties', [])
         base_path = os.path.dirname(__file__)
-        json_path = os.path.join(base_path, "..", "..", "data", "properties.json")
         img_name, location, prop_name, total_upkeep, display_prestige = "default.png", "N/A", "N/A", 0, 0
-        if os.path.exists(json_path):
-            with open(json_path, 'r', encoding='utf-8') as f:
-                props = json.load(f)
-                for p in props:
-                    if p['id'] in owned_ids:
-                        if p['id'] == primary_id:
-                            display_prestige += (p.get('prestige', 0) * 2)
-                            total_upkeep += p['upkeep']
-                            img_name, location, prop_name = p['image'], p['location'], p['name']
-                        else:
-                            display_prestige += p.get('prestige', 0)
-                            total_upkeep += int(p['upkeep'] * 0.5)
+        for p in catalog.owned("properties", owned_ids):
+            if p['id'] == primary_id:
+                display_prestige += (p.get('prestige', 0) * 2)
+                total_upkeep += p['upkeep']
+                img_name, location, prop_name = p['image'], p['location'], p['name']
+            else:
+                display_prestige += p.get('prestige', 0)
+                total_upkeep += int(p['upkeep'] * 0.5)
         
         if hasattr(self, 'house_status_lbl'):
             self.house_status_lbl.setText(
@@ -255,8 +241,12 @@ class HomeView(QFrame):
 
     def update_vehicle_status(self):
         owned_ids = self.save_data.get('owned_vehicles', [])
-        total_value = self.calculate_category_value("vehicles.json", "owned_vehicles")
-        total_prestige = self.calculate_category_prestige("vehicles.json", "owned_vehicles")
+        estate = self.estate()
+        if estate:
+            total_value, total_prestige = estate['vehicles'], estate['vehicle_prestige']
+        else:
+            total_value = self.calculate_category_value("vehicles.json", "owned_vehicles")
+            total_prestige = self.calculate_category_prestige("vehicles.json", "owned_vehicles")
         if hasattr(self, 'veh_tile'):
             labels = self.veh_tile.findChildren(QLabel)
             if len(labels) >= 2:
@@ -265,8 +255,12 @@ class HomeView(QFrame):
 
     def update_valuables_status(self):
         owned_ids = self.save_data.get('owned_valuables', [])
-        total_value = self.calculate_category_value("valuables.json", "owned_valuables")
-        total_prestige = self.calculate_category_prestige("valuables.json", "owned_valuables")
+        estate = self.estate()
+        if estate:
+            total_value, total_prestige = estate['valuables'], estate['valuable_prestige']
+        else:
+            total_value = self.calculate_category_value("valuables.json", "owned_valuables")
+            total_prestige = self.calculate_category_prestige("valuables.json", "owned_valuables")
         if hasattr(self, 'valuables_tile'):
             labels = self.valuables_tile.findChildren(QLabel)
             if len(labels) >= 2:
@@ -275,15 +269,7 @@ class HomeView(QFrame):
 
     def calculate_category_value(self, json_file, save_key):
         owned_ids = self.save_data.get(save_key, [])
-        total = 0
-        path = os.path.join(os.path.dirname(__file__), "..", "..", "data", json_file)
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                items = json.load(f)
-                for i in items:
-                    if i['id'] in owned_ids:
-                        total += i.get('price', 0)
-        return total
+        return sum(i.get('price', 0) for i in catalog.owned(json_file, owned_ids))
 
     def apply_theme(self, colors):
         self.setStyleSheet(f"background-color: {colors['tile_bg']}; border: 1px solid {colors['tile_border']}; border-radius: 18px;")
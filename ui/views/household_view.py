@@ -1,9 +1,9 @@
 import os
-import json
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
                              QLabel, QScrollArea, QPushButton, QMessageBox)
 from PyQt6.QtGui import QFont, QPixmap
 from PyQt6.QtCore import Qt
+from utils.catalog import catalog
 
 class HouseholdView(QFrame):
     def __init__(self, parent=None, theme=None, save_data=None):
@@ -19,14 +19,7 @@ class HouseholdView(QFrame):
         self.setup_ui()
 
     def load_properties_data(self):
-        base_path = os.path.dirname(__file__)
-        json_path = os.path.join(base_path, "..", "..", "data", "properties.json")
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Błąd ładowania nieruchomości: {e}")
-            return []
+        return catalog.records("properties")
 
     def get_cached_pixmap(self, img_name):
         """Ładuje i skaluje obraz tylko raz, potem pobiera z pamięci."""
@@ -195,6 +188,8 @@ class HouseholdView(QFrame):
             if 'owned_properties' not in self.save_data: 
                 self.save_data['owned_properties'] = []
             self.save_data['owned_properties'].append(prop['id'])
+            if hasattr(self.parent_ctrl, 'valuation'):
+                self.parent_ctrl.valuation.add_item("properties", prop['id'])
             
             if hasattr(self.parent_ctrl, 'log_transaction'):
                 self.parent_ctrl.log_transaction(
@@ -213,6 +208,7 @@ class HouseholdView(QFrame):
 
     def set_primary(self, prop_id):
         self.save_data['primary_home'] = prop_id
+        if hasattr(self.parent_ctrl, 'valuation'): self.parent_ctrl.valuation.set_primary()
         if hasattr(self.parent_ctrl, 'view_home'): self.parent_ctrl.view_home.refresh_view(self.save_data)
         self.refresh_list(mode="owned")
 
@@ -6,13 +6,16 @@ project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+import numpy as np
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QHeaderView, QTabWidget, QPushButton, 
-    QLabel, QLineEdit, QComboBox, QFrame  
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QTabWidget,
+    QLabel, QLineEdit, QComboBox, QFrame, QStyledItemDelegate, QAbstractItemView
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QEvent, QRectF, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+
+from utils.search_index import SearchIndex
+from utils.universe import universe
 
 
 try:
@@ -21,7 +24,196 @@ except ImportError:
     from windows.chart_window import StockChartWindow
 
 
+class MarketTableModel(QAbstractTableModel):
+    """Tabela jednego rynku (stocks/crypto) czytana wprost z MarketEngine.
+
+    Nazwy, dywidendy, sektory i indeks wyszukiwania są stałe i liczone raz w bind(). refresh()
+    porównuje nowe (zaokrąglone) ceny i zmiany 24h z tym, co jest wyświetlane, i zgłasza
+    dataChanged tylko dla komórek, które się zmieniły (sąsiednie wiersze łączone są w jeden zakres).
+    Wiersz modelu = instrument rynku; filtrowaniem zajmuje się MarketFilterProxy.
+    """
+
+    HEADERS = ["Name", "Price", "24h Change", "Dividend", "Category", "Trend", "Trade"]
+    PRICE, CHANGE, SECTOR, CHART, TRADE = 1, 2, 4, 5, 6
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+
+    def __init__(self, market_type, parent=None):
+        super().__init__(parent)
+        self.market_type = market_type
+        self.engine = None
+        self.rows = np.arange(0)
+        self.symbols = []
+        self.labels = []
+        self.search_index = SearchIndex([])
+        self.dividends = np.zeros(0)
+        self.sectors = []
+        self.sector_rows = {}
+        self.prices = np.zeros(0)
+        self.changes = np.zeros(0)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.symbols)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self.labels[row]
+            if col == self.PRICE:
+                return f"${self.prices[row]:,}"
+            if col == self.CHANGE:
+                return f"{self.changes[row]:+.2f}%"
+            if col == 3:
+                rate = self.dividends[row]
+                return f"{rate*100:.3f}%" if rate > 0 else "0%"
+            if col == self.SECTOR:
+                return self.sectors[row]
+            if col == self.CHART:
+                return "View Chart"
+            if col == self.TRADE:
+                return "BUY"
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if col == self.CHANGE:
+                return QColor("#2ecc71" if self.changes[row] >= 0 else "#e74c3c")
+            if col == 3:
+                return QColor("#2ecc71" if self.dividends[row] > 0 else "#aaaaaa")
+        elif role == Qt.ItemDataRole.TextAlignmentRole and col == self.CHANGE:
+            return Qt.AlignmentFlag.AlignCenter
+        elif role == self.SORT_ROLE:
+            if col == self.PRICE:
+                return float(self.prices[row])
+            if col == self.CHANGE:
+                return float(self.changes[row])
+            if col == 3:
+                return float(self.dividends[row])
+            return self.data(index)
+        return None
+
+    def bind(self, engine, market_data):
+        """Pełne przebudowanie - przy pierwszym otwarciu albo po podmianie silnika (wczytanie gry)."""
+        self.beginResetModel()
+        self.engine = engine
+        self.rows = np.array([i for i, (category, _) in enumerate(engine.keys) if category == self.market_type], dtype=np.intp)
+        self.symbols = [engine.symbols[i] for i in self.rows]
+        assets = market_data.get(self.market_type, {})
+        self.labels = [f"{assets.get(s, {}).get('name', s)} ({s})" for s in self.symbols]
+        self.dividends = np.array([assets.get(s, {}).get('dividend_yield', 0) for s in self.symbols], dtype=np.float64)
+        self.sectors = [universe.sector(s) for s in self.symbols]
+        local = np.full(len(engine), -1, dtype=np.intp)
+        local[self.rows] = np.arange(len(self.rows))
+        self.sector_rows = {sector: local[idx][local[idx] >= 0] for sector, idx in engine.sector_index.items()}
+        self.search_index = SearchIndex([f"{label}\n{sector}" for label, sector in zip(self.labels, self.sectors)])
+        self.prices, self.changes = self.quotes()
+        self.endResetModel()
+
+    def quotes(self):
+        """(ceny, zmiany 24h w %) wierszy modelu - jak w market_data i history_points: na cenach zaokrąglonych do centa."""
+        prices = np.round(self.engine.prices[self.rows], 2)
+        _, tail = self.engine.history.tail(2)
+        if len(tail) < 2:
+            return prices, np.zeros(len(self.rows))
+        prev, last = np.round(tail[-2, self.rows], 2), np.round(tail[-1, self.rows], 2)
+        valid = ~(np.isnan(prev) | np.isnan(last)) & (prev != 0)
+        changes = np.zeros(len(self.rows))
+        changes[valid] = (last[valid] - prev[valid]) / prev[valid] * 100
+        return prices, changes
+
+    def refresh(self):
+        prices, changes = self.quotes()
+        moved_prices = np.flatnonzero(prices != self.prices)
+        moved_changes = np.flatnonzero(np.round(changes, 2) != np.round(self.changes, 2))
+        self.prices, self.changes = prices, changes
+        self.emit_changed(moved_prices, self.PRICE)
+        self.emit_changed(moved_changes, self.CHANGE)
+
+    def emit_changed(self, changed, column):
+        """Jedno dataChanged na każdy ciągły zakres zmienionych wierszy w kolumnie."""
+        for run in self.runs(changed):
+            self.dataChanged.emit(self.index(int(run[0]), column), self.index(int(run[-1]), column))
+
+    @staticmethod
+    def runs(values):
+        """Dzieli posortowaną tablicę na ciągłe zakresy kolejnych liczb."""
+        if not len(values):
+            return []
+        return np.split(values, np.flatnonzero(np.diff(values) != 1) + 1)
+
+    def filter_mask(self, search, sector):
+        """Maska instrumentów pasujących do wyszukiwania (przez indeks n-gramów) i sektora."""
+        mask = self.search_index.mask(search)
+        if sector is not None:
+            in_sector = np.zeros(len(mask), dtype=bool)
+            in_sector[self.sector_rows.get(sector.lower(), [])] = True
+            mask &= in_sector
+        return mask
+
+
+class MarketFilterProxy(QSortFilterProxyModel):
+    """Sortowanie wg SORT_ROLE i filtr z maski wyniku SearchIndex (filter_mask modelu).
+
+    filterAcceptsRow to tylko odczyt maski; po zmianie maski invalidateRowsFilter() pozwala Qt
+    usunąć/wstawić tylko wiersze, których widoczność się zmieniła.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mask = None
+        self.setSortRole(MarketTableModel.SORT_ROLE)
+
+    def set_mask(self, mask):
+        if self.mask is not None and np.array_equal(mask, self.mask):
+            return
+        self.mask = mask
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.mask is None or source_row >= len(self.mask) or bool(self.mask[source_row])
+
+
+class ActionDelegate(QStyledItemDelegate):
+    """Przycisk rysowany w komórce zamiast widgetu - kliknięcie emituje clicked(indeks proxy)."""
+
+    clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, color, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        rect = QRectF(option.rect).adjusted(4, 3, -4, -3)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.color)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("white"))
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, index.data())
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index)
+                return True
+        return False
+
+
 class MarketsView(QWidget):
+    SEARCH_DELAY_MS = 150
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent_ctrl = parent 
@@ -40,10 +232,14 @@ class MarketsView(QWidget):
                 border: 1px solid #444; border-radius: 5px; 
             }
         """)
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self.search_timer.start)
         
         self.sector_filter = QComboBox()
-        self.sector_filter.addItems(["All Sectors", "Tech", "Defense", "Energy", "Finance", "Health", "Retail", "Crypto"])
+        self.sector_filter.addItems(["All Sectors"] + universe.sectors())
         self.sector_filter.setStyleSheet("""
             QComboBox { 
                 background-color: #1e1e1e; color: white; padding: 8px; 
@@ -79,130 +275,73 @@ class MarketsView(QWidget):
 
     def setup_tab_layout(self, tab, market_type):
         layout = QVBoxLayout(tab)
-        table = QTableWidget(0, 7)
-        table.setHorizontalHeaderLabels(["Name", "Price", "24h Change", "Dividend", "Category", "Trend", "Trade"])
-        
-        table.setColumnHidden(4, True)
-        
+        model = MarketTableModel(market_type, self)
+        proxy = MarketFilterProxy(self)
+        proxy.setSourceModel(model)
+
+        table = QTableView()
+        table.setModel(proxy)
+        table.setColumnHidden(MarketTableModel.SECTOR, True)
+        table.setSortingEnabled(True)
+        table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        table.verticalHeader().setVisible(False)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+
+        chart_delegate = ActionDelegate("#3a3a3a", table)
+        chart_delegate.clicked.connect(lambda index, t=market_type: self.open_chart(self.symbol_at(t, index), t))
+        buy_delegate = ActionDelegate("#27ae60", table)
+        buy_delegate.clicked.connect(lambda index, t=market_type: self.buy_asset(self.symbol_at(t, index), t))
+        table.setItemDelegateForColumn(MarketTableModel.CHART, chart_delegate)
+        table.setItemDelegateForColumn(MarketTableModel.TRADE, buy_delegate)
+
         table.setStyleSheet("""
-            QTableWidget { background-color: #1e1e1e; color: white; border: none; gridline-color: #333; }
+            QTableView { background-color: #1e1e1e; color: white; border: none; gridline-color: #333; }
             QHeaderView::section { background-color: #2d2d2d; color: #aaa; padding: 5px; border: none; }
         """)
         
+        setattr(self, f"{market_type}_model", model)
+        setattr(self, f"{market_type}_proxy", proxy)
         setattr(self, f"{market_type}_table", table)
         layout.addWidget(table)
 
+    def symbol_at(self, market_type, proxy_index):
+        proxy = getattr(self, f"{market_type}_proxy")
+        model = getattr(self, f"{market_type}_model")
+        return model.symbols[proxy.mapToSource(proxy_index).row()]
+
     def apply_filters(self):
-        """Logika filtrowania wierszy z zabezpieczeniem przed błędami danych."""
-        search_txt = self.search_input.text().strip().lower()
-        sector_txt = self.sector_filter.currentText()
-        
+        """Filtr obu zakładek: maska z indeksu wyszukiwania trafia do proxy każdej zakładki."""
+        self.search_timer.stop()
+        search_txt = self.search_input.text()
+        sector_txt = self.sector_filter.currentText().strip()
+        sector = None if sector_txt == "All Sectors" else sector_txt
         for m_type in ["stocks", "crypto"]:
-            table = getattr(self, f"{m_type}_table")
-            for row in range(table.rowCount()):
-                name_item = table.item(row, 0)
-                category_item = table.item(row, 4)
-                
-                if not name_item or not category_item:
-                    continue
-                    
-                name_symbol = name_item.text().lower()
-                category = category_item.text()
-                
-                match_search = search_txt in name_symbol
-                match_sector = (sector_txt == "All Sectors" or category.strip() == sector_txt.strip())
-                
-                table.setRowHidden(row, not (match_search and match_sector))
+            model = getattr(self, f"{m_type}_model")
+            getattr(self, f"{m_type}_proxy").set_mask(model.filter_mask(search_txt, sector))
 
     def refresh_view(self, save_data):
+        """Przy każdym skoku czasu: tylko ceny i zmiany, które się ruszyły (pełne przebudowanie po zmianie silnika)."""
         self.save_data = save_data
-        market_info = self.save_data.get('market_data', {})
-        
-        sector_map = {
-            "AAPL": "Tech", "MSFT": "Tech", "NVDA": "Tech", "AMD": "Tech", "GOOGL": "Tech",
-            "META": "Tech", "TSLA": "Tech", "INTC": "Tech", "ASML": "Tech", "ORCL": "Tech",
-            "CRM": "Tech", "ADBE": "Tech", "CSCO": "Tech", "IBM": "Tech", "TXN": "Tech", "AMAT": "Tech",
-            "LMT": "Defense", "RTX": "Defense", "NOC": "Defense", "GD": "Defense", 
-            "LHX": "Defense", "BWXT": "Defense", "AIR.PA": "Defense", "RHM.DE": "Defense",
-            "JPM": "Finance", "GS": "Finance", "V": "Finance", "MA": "Finance", "BAC": "Finance",
-            "PKO.WA": "Finance", "PEO.WA": "Finance", "ING.WA": "Finance",
-            "XOM": "Energy", "CVX": "Energy", "SHEL": "Energy", "BP": "Energy", "COP": "Energy", "PKN.WA": "Energy",
-            "PFE": "Health", "JNJ": "Health", "UNH": "Health", "LLY": "Health", "ABBV": "Health",
-            "AMZN": "Retail", "WMT": "Retail", "COST": "Retail", "ALE.WA": "Retail"
-        }
-        
+        engine = self.parent_ctrl.market_engine
+        rebound = False
         for m_type in ["stocks", "crypto"]:
-            table = getattr(self, f"{m_type}_table")
-            items = market_info.get(m_type, {})
-            
-            table.setRowCount(len(items))
-            for row, (symbol, data) in enumerate(items.items()):
-                table.setItem(row, 0, QTableWidgetItem(f"{data['name']} ({symbol})"))
-                table.setItem(row, 1, QTableWidgetItem(f"${data['current_price']:,}"))
-                
-                history_data = data.get('history', [])
-                if history_data:
-                    self.set_change_item(table, row, history_data)
-                else:
-                    table.setItem(row, 2, QTableWidgetItem("N/A"))
-
-                div_rate = data.get('dividend_yield', 0)
-                div_item = QTableWidgetItem(f"{div_rate*100:.3f}%" if div_rate > 0 else "0%")
-                div_item.setForeground(QColor("#2ecc71" if div_rate > 0 else "#aaaaaa"))
-                table.setItem(row, 3, div_item)
-
-                if m_type == "crypto":
-                    cat_name = "Crypto"
-                else:
-                    cat_name = sector_map.get(symbol, "Other")
-                
-                table.setItem(row, 4, QTableWidgetItem(cat_name))
-                
-                chart_btn = QPushButton("View Chart")
-                chart_btn.clicked.connect(lambda ch, s=symbol, t=m_type: self.open_chart(s, t))
-                table.setCellWidget(row, 5, chart_btn)
-                
-                buy_btn = QPushButton("BUY")
-                buy_btn.setStyleSheet("background-color: #27ae60; color: white; font-weight: bold; border-radius: 4px;")
-                buy_btn.clicked.connect(lambda ch, s=symbol, t=m_type: self.buy_asset(s, t))
-                table.setCellWidget(row, 6, buy_btn)
-
-        self.apply_filters()
-
-    def set_change_item(self, table, row, history):
-        if not history or len(history) < 2: 
-            table.setItem(row, 2, QTableWidgetItem("0.00%"))
-            return
-            
-        change = ((history[-1]['price'] - history[-2]['price']) / history[-2]['price']) * 100
-        item = QTableWidgetItem(f"{change:+.2f}%")
-        item.setForeground(QColor("#2ecc71" if change >= 0 else "#e74c3c"))
-        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        table.setItem(row, 2, item)
+            model = getattr(self, f"{m_type}_model")
+            if model.engine is not engine:
+                model.bind(engine, self.save_data.get('market_data', {}))
+                rebound = True
+            else:
+                model.refresh()
+        if rebound:
+            self.apply_filters()
 
     def buy_asset(self, symbol, market_type):
         market_info = self.save_data.get('market_data', {}).get(market_type, {})
         asset_data = market_info.get(symbol)
         if not asset_data: return
 
-        price = asset_data['current_price']
-        if self.save_data.get('balance', 0) >= price:
-            self.save_data['balance'] -= price
-            if 'portfolio' not in self.save_data:
-                self.save_data['portfolio'] = {'stocks': {}, 'crypto': {}}
-            
-            portfolio = self.save_data['portfolio'][market_type]
-            if symbol in portfolio:
-                portfolio[symbol]['amount'] += 1
-                portfolio[symbol]['avg_price'] = (portfolio[symbol]['avg_price'] + price) / 2
-            else:
-                portfolio[symbol] = {'amount': 1, 'avg_price': price, 'name': asset_data['name']}
-            
-            self.parent_ctrl.log_transaction("Giełda", f"Zakup 1.0 {symbol}", -price)
+        if self.parent_ctrl.buy_asset(symbol, 1) is not None:
             self.parent_ctrl.update_money_display()
         else:
             from PyQt6.QtWidgets import QMessageBox
@@ -212,7 +351,7 @@ class MarketsView(QWidget):
         market_info = self.save_data.get('market_data', {}).get(market_type, {})
         asset_data = market_info.get(symbol)
         if asset_data:
-            history = asset_data.get('history', [])
+            history = self.parent_ctrl.market_engine.history_points(symbol)
             if not history:
                 history = [{"date": "Start", "price": asset_data['current_price']}]
             chart_win = StockChartWindow(symbol, history, self)
@@ -85,15 +85,9 @@ class PortfolioView(QWidget):
             main_game = main_game.parent()
 
         if main_game:
-            revenue = amount_to_sell * current_price
-            
-            main_game.log_transaction("Stock Market", f"Sold {amount_to_sell:.2f} {symbol}", revenue)
-           
-            main_game.save_data['balance'] += revenue
-            main_game.save_data['portfolio'][category][symbol]['amount'] -= amount_to_sell
-            
-            if main_game.save_data['portfolio'][category][symbol]['amount'] < 0.001:
-                main_game.save_data['portfolio'][category][symbol]['amount'] = 0
+            revenue = main_game.sell_asset(symbol, amount_to_sell)
+            if revenue is None:
+                return
 
             main_game.update_money_display()
             self.refresh_view(main_game.save_data)
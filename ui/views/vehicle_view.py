@@ -1,9 +1,9 @@
 import os
-import json
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFrame, 
                              QLabel, QScrollArea, QPushButton, QMessageBox)
 from PyQt6.QtGui import QFont, QPixmap
 from PyQt6.QtCore import Qt
+from utils.catalog import catalog
 
 class VehicleView(QFrame):
     def __init__(self, parent=None, theme=None, save_data=None):
@@ -16,12 +16,7 @@ class VehicleView(QFrame):
         self.setup_ui()
 
     def load_vehicles_data(self):
-        base_path = os.path.dirname(__file__)
-        json_path = os.path.join(base_path, "..", "..", "data", "vehicles.json")
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception: return []
+        return catalog.records("vehicles")
 
     def get_cached_pixmap(self, img_name):
         if img_name in self.image_cache: return self.image_cache[img_name]
@@ -148,7 +143,8 @@ class VehicleView(QFrame):
             if 'owned_vehicles' not in self.save_data: 
                 self.save_data['owned_vehicles'] = []
             self.save_data['owned_vehicles'].append(veh['id'])
-            self.save_data['prestige'] = self.save_data.get('prestige', 0) + veh['prestige']
+            if hasattr(self.parent_ctrl, 'valuation'):
+                self.parent_ctrl.valuation.add_item("vehicles", veh['id'])
             
             if hasattr(self.parent_ctrl, 'log_transaction'):
                 self.parent_ctrl.log_transaction(
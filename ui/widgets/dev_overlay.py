@@ -0,0 +1,85 @@
+from PyQt6.QtWidgets import QLabel, QFrame, QVBoxLayout
+from PyQt6.QtCore import Qt, QTimer
+
+from utils.instruments import instruments
+
+
+class DevOverlay(QFrame):
+    """Ukryta nakładka deweloperska (komenda konsoli `perf`): rozbicie czasu na klatkę i na ostatni skok.
+
+    Włączona nakładka włącza też zbieranie pomiarów w utils.instruments - schowana nic nie kosztuje.
+    Klatka to okres odświeżania nakładki (FRAME_MS); histogram to rozkład ostatnich pomiarów
+    każdego timera w logarytmicznych kubełkach od 1 µs do 10 s.
+    """
+
+    FRAME_MS = 250
+    BARS = " ▁▂▃▄▅▆▇█"
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("""
+            QFrame { background-color: rgba(0, 0, 0, 200); border: 1px solid #3a96dd; border-radius: 8px; }
+            QLabel { color: #0f0; background: transparent; border: none; font-family: 'Courier New'; font-size: 11px; }
+        """)
+        layout = QVBoxLayout(self)
+        self.label = QLabel()
+        self.label.setTextFormat(Qt.TextFormat.PlainText)
+        layout.addWidget(self.label)
+        self.move(20, 120)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self.update_stats)
+        self.frame_mark = None
+        self.hide()
+
+    def toggle(self):
+        self.set_active(self.isHidden())
+        return not self.isHidden()
+
+    def set_active(self, active):
+        instruments.enabled = active
+        if active:
+            self.frame_mark = instruments.mark()
+            self.update_stats()
+            self.show()
+            self.raise_()
+            self.timer.start()
+        else:
+            self.timer.stop()
+            self.hide()
+
+    def update_stats(self):
+        timers, counts = instruments.breakdown(self.frame_mark)
+        self.frame_mark = instruments.mark()
+
+        lines = [f"FRAME ({self.FRAME_MS} ms)"]
+        lines += self.format_timers(timers) or ["  -"]
+        jump_timers, jump_counts = instruments.last_jump or ({}, {})
+        lines += ["", "LAST JUMP"]
+        lines += self.format_timers(jump_timers) or ["  -"]
+        lines += [f"  {name:<24}{value:>10}" for name, value in sorted(jump_counts.items())]
+
+        lines += ["", f"{'HISTOGRAM':<26}{'p50':>9}{'p95':>9}{'max':>9}  1µs..10s"]
+        for name in sorted(instruments.samples):
+            s = instruments.stats(name)
+            peak = max(s['histogram']) or 1
+            bars = "".join(self.BARS[round(c / peak * (len(self.BARS) - 1))] for c in s['histogram'])
+            lines.append(f"  {name:<24}{s['p50'] * 1000:>9.2f}{s['p95'] * 1000:>9.2f}{s['max'] * 1000:>9.2f}  {bars}")
+
+        if instruments.counters:
+            lines += ["", "COUNTERS"]
+            lines += [f"  {name:<24}{value:>10}" for name, value in sorted(instruments.counters.items())]
+        if instruments.capture_left:
+            lines += ["", f"PROFILING: {instruments.capture_left} jump(s) left"]
+        elif instruments.last_capture:
+            lines += ["", f"PROFILE: {instruments.last_capture}"]
+
+        self.label.setText("\n".join(lines))
+        self.adjustSize()
+
+    @staticmethod
+    def format_timers(timers):
+        return [f"  {name:<24}{seconds * 1000:>10.2f} ms  x{calls}"
+                for name, (seconds, calls) in sorted(timers.items(), key=lambda item: -item[1][0])]
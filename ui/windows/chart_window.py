@@ -168,32 +168,9 @@ class StockChartWindow(QDialog):
             amount = float(amount_text)
             if amount <= 0: return
 
-            total_cost = amount * self.current_price
-            
-            if main_game.save_data['balance'] < total_cost:
+            if main_game.buy_asset(self.symbol, amount) is None:
                 QMessageBox.warning(self, "Brak środków", "Nie stać Cię na ten zakup!")
                 return
-
-            market_data = main_game.save_data.get('market_data', {})
-            p_key = "stocks" if self.symbol in market_data.get('stocks', {}) else "crypto"
-            asset_info = market_data[p_key][self.symbol]
-            
-            if 'portfolio' not in main_game.save_data:
-                main_game.save_data['portfolio'] = {"stocks": {}, "crypto": {}}
-            
-            portfolio = main_game.save_data['portfolio'].setdefault(p_key, {})
-            p_item = portfolio.setdefault(self.symbol, {"amount": 0, "avg_price": 0, "name": asset_info['name']})
-            
-            current_total_value = p_item["amount"] * p_item["avg_price"]
-            new_amount = p_item["amount"] + amount
-            new_avg = (current_total_value + total_cost) / new_amount
-            
-            p_item["amount"] = new_amount
-            p_item["avg_price"] = round(new_avg, 2)
-            
-            main_game.save_data['balance'] -= total_cost
-            
-            main_game.log_transaction("Giełda", f"Zakup {amount} {self.symbol}", -total_cost)
             main_game.update_money_display() 
             
             if hasattr(main_game, 'view_home'):
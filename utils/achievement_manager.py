@@ -1,66 +1,122 @@
-import json
-import os
+import bisect
+import operator
 from datetime import datetime
 
+from utils.catalog import catalog
+from utils.instruments import instruments
+from utils.universe import universe
+
 class AchievementManager:
+    """Osiągnięcia jako reguły z achievements.json: {"metric", "op", "value"}.
+
+    Reguły progowe (>=, >) kompilowane są do posortowanych list progów per metryka, więc przy
+    zmianie metryki bisect od razu wskazuje spełnione progi, a odblokowane reguły wypadają z listy.
+    Metryka jest czytana przy każdym check_all, ale reguły liczone są tylko, gdy jej wartość się zmieniła.
+    Reguły "transaction" sprawdzane są w on_transaction (wołane z log_transaction).
+    """
+
+    METRICS = {
+        "net_worth": lambda gv: gv.save_data.get('balance', 0) + gv.valuation.snapshot()['portfolio'],
+        "prestige": lambda gv: gv.save_data.get('prestige', 0),
+        "property_count": lambda gv: len(gv.save_data.get('owned_properties', [])),
+        "owned_vehicles": lambda gv: gv.save_data.get('owned_vehicles', []),
+        "owned_valuables": lambda gv: gv.save_data.get('owned_valuables', []),
+        "current_job": lambda gv: gv.save_data.get('current_job'),
+    }
+    COMPARE = {">=": operator.ge, ">": operator.gt, "==": operator.eq}
+
     def __init__(self, game_view):
         self.gv = game_view
         self.achievements = self.load_achievement_definitions()
+        self.compile_rules()
 
     def load_achievement_definitions(self):
-        path = os.path.join(os.path.dirname(__file__), "..", "data", "achievements.json")
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f).get('achievements', [])
-        except Exception as e:
-            print(f"DEBUG: Nie można wczytać definicji osiągnięć: {e}")
-            return []
+        return catalog.records("achievements")
+
+    def compile_rules(self):
+        unlocked = set(self.gv.save_data.get('unlocked_achievements', []))
+        thresholds = {}
+        self.matches = {}
+        self.transaction_rules = []
+        for ach in self.achievements:
+            rule = ach.get('rule')
+            if not rule or ach['id'] in unlocked:
+                continue
+            metric, op, value = rule['metric'], rule['op'], rule['value']
+            if metric == "transaction":
+                if self.gv.ledger.any_amount(self.COMPARE[op], value, rule.get('categories')):
+                    self.unlock(ach['id'])
+                else:
+                    self.transaction_rules.append((ach['id'], rule))
+            elif op in (">=", ">"):
+                thresholds.setdefault((metric, op), []).append((value, ach['id']))
+            elif op in ("==", "contains"):
+                self.matches.setdefault((metric, op), {}).setdefault(value, []).append(ach['id'])
+            else:
+                print(f"DEBUG: Nieznany operator reguły {ach['id']}: {op}")
 
+        self.thresholds = {}
+        for key, rules in thresholds.items():
+            rules.sort(key=lambda r: r[0])
+            self.thresholds[key] = ([v for v, _ in rules], [i for _, i in rules])
+        self.watched = {metric for metric, _ in [*self.thresholds, *self.matches]}
+        self.last_seen = {}
+
+    @instruments.timed("achievements.check_all")
     def check_all(self):
-        """Główna pętla sprawdzająca warunki."""
+        """Sprawdza tylko metryki, które mają jeszcze zablokowane reguły i zmieniły wartość."""
         save = self.gv.save_data
         if 'unlocked_achievements' not in save:
             save['unlocked_achievements'] = []
-        
-        unlocked = save['unlocked_achievements']
-
-        portfolio_val = self.calculate_portfolio_value()
-        net_worth = save.get('balance', 0) + portfolio_val
-        owned_v = save.get('owned_vehicles', [])
-        owned_val = save.get('owned_valuables', [])
-        owned_props = save.get('owned_properties', [])
-        completed_courses = save.get('completed_courses', [])
-        current_prestige = save.get('prestige', 0)
-        age = self.calculate_age()
-        active_event_ids = [e['event']['id'] for e in self.gv.event_manager.active_events]
-
-
-        if net_worth >= 250_000_000_000 and "be_elon" not in unlocked: self.unlock("be_elon")
-        if net_worth >= 10_000_000 and "decamillionaire" not in unlocked: self.unlock("decamillionaire")
-        if net_worth >= 1_000_000 and "millionaire" not in unlocked: self.unlock("millionaire")
-        
-        if "first_dollar" not in unlocked:
-            transactions = save.get('transaction_history', [])
-            if any(t.get('amount', 0) > 0 and t.get('category') in ["Praca", "Giełda"] for t in transactions):
-                self.unlock("first_dollar")
-
-        if "veh_30" in owned_v and "empire_strikes" not in unlocked: self.unlock("empire_strikes")
-        if "val_30" in owned_val and "indy_heritage" not in unlocked: self.unlock("indy_heritage")
-        
-        if len(owned_props) >= 10 and "real_estate_tycoon" not in unlocked: self.unlock("real_estate_tycoon")
-        if len(owned_props) >= 3 and "landlord" not in unlocked: self.unlock("landlord")
-        if len(owned_props) > 1 and "homeless_no_more" not in unlocked: self.unlock("homeless_no_more")
-        
-        if save.get('current_job') == "job_20" and "ceo_status" not in unlocked: self.unlock("ceo_status")
-
-        if current_prestige >= 100_000 and "living_legend" not in unlocked: self.unlock("living_legend")
-        if current_prestige >= 50_000 and "world_famous" not in unlocked: self.unlock("world_famous")
-        if current_prestige >= 10_000 and "social_elite" not in unlocked: self.unlock("social_elite")
+
+        for metric in list(self.watched):
+            value = self.METRICS[metric](self.gv)
+            # Listy porównywane są po zawartości - podmiana elementu przy tej samej długości też jest zmianą.
+            seen = tuple(value) if isinstance(value, list) else value
+            if metric in self.last_seen and self.last_seen[metric] == seen:
+                continue
+            self.last_seen[metric] = seen
+            self.evaluate(metric, value)
+
+    def evaluate(self, metric, value):
+        for op, find in ((">=", bisect.bisect_right), (">", bisect.bisect_left)):
+            pending = self.thresholds.get((metric, op))
+            if pending:
+                values, ids = pending
+                n = find(values, value)
+                for ach_id in ids[:n]:
+                    self.unlock(ach_id)
+                del values[:n], ids[:n]
+
+        equal = self.matches.get((metric, "=="))
+        if equal and value in equal:
+            for ach_id in equal.pop(value):
+                self.unlock(ach_id)
+
+        contains = self.matches.get((metric, "contains"))
+        if contains:
+            owned = set(value)
+            for item in [item for item in contains if item in owned]:
+                for ach_id in contains.pop(item):
+                    self.unlock(ach_id)
+
+        if not any(self.thresholds.get((metric, op), ([], []))[0] for op in (">=", ">")) \
+                and not self.matches.get((metric, "==")) and not self.matches.get((metric, "contains")):
+            self.watched.discard(metric)
+
+    def on_transaction(self, category, amount):
+        """Reguły transakcyjne - jedno porównanie na nową transakcję zamiast skanu historii."""
+        for ach_id, rule in self.transaction_rules[:]:
+            categories = rule.get('categories')
+            if (not categories or category in categories) and self.COMPARE[rule['op']](amount, rule['value']):
+                self.transaction_rules.remove((ach_id, rule))
+                self.unlock(ach_id)
 
     def unlock(self, ach_id):
         """Odblokowuje osiągnięcie i odświeża UI."""
-        if ach_id not in self.gv.save_data['unlocked_achievements']:
-            self.gv.save_data['unlocked_achievements'].append(ach_id)
+        unlocked = self.gv.save_data.setdefault('unlocked_achievements', [])
+        if ach_id not in unlocked:
+            unlocked.append(ach_id)
             
             if hasattr(self.gv, 'show_achievement_toast'):
                 self.gv.show_achievement_toast(ach_id)
@@ -71,14 +127,7 @@ class AchievementManager:
             print(f"DEBUG: ODBLOKOWANO OSIĄGNIĘCIE: {ach_id}")
 
     def calculate_portfolio_value(self):
-        total = 0
-        portfolio = self.gv.save_data.get('portfolio', {})
-        market = self.gv.save_data.get('market_data', {})
-        for m_type in ['stocks', 'crypto']:
-            for sym, data in portfolio.get(m_type, {}).items():
-                price = market.get(m_type, {}).get(sym, {}).get('current_price', 0)
-                total += data['amount'] * price
-        return total
+        return self.gv.valuation.snapshot()['portfolio']
 
     def calculate_sector_value(self, sector_id):
         total = 0
@@ -86,7 +135,7 @@ class AchievementManager:
         market_stocks = self.gv.save_data.get('market_data', {}).get('stocks', {})
         for sym, data in portfolio.items():
             stock_info = market_stocks.get(sym, {})
-            if stock_info.get('category', '').lower() == sector_id.lower():
+            if universe.sector(sym, stock_info.get('category', '')).lower() == sector_id.lower():
                 total += data['amount'] * stock_info.get('current_price', 0)
         return total
 
@@ -0,0 +1,66 @@
+import pickle
+import threading
+
+from utils.save_format import write_save
+
+
+def freeze_state(save_data, **overrides):
+    """Zamrożona kopia stanu gry (bez market_data) - jeden szybki pickle na wątku GUI zamiast deepcopy."""
+    state = {k: v for k, v in save_data.items() if k != 'market_data'}
+    state.update(overrides)
+    return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class AutoSaver:
+    """Zapis gry na wątku roboczym.
+
+    submit() tylko odkłada zamrożony stan - serializacja do formatu zapisu i zapis (atomowy,
+    przez write_save) dzieją się w tle. Zgłoszenia, które przyjdą zanim wątek zdąży zapisać
+    poprzednie, są scalane: zapisywany jest tylko najnowszy stan dla danego pliku.
+    """
+
+    def __init__(self, writer=write_save):
+        self.writer = writer
+        self.last_error = None
+        self.writes = 0
+        self._pending = {}
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, frozen_state, market=None, ledger=None):
+        with self._cond:
+            self._pending[path] = (frozen_state, market, ledger)
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Czeka, aż wszystkie zgłoszone zapisy trafią na dysk. Zwraca False po przekroczeniu timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                path, (frozen_state, market, ledger) = self._pending.popitem()
+                self._busy = True
+            try:
+                self.writer(path, pickle.loads(frozen_state), market, ledger)
+                self.writes += 1
+            except Exception as e:
+                self.last_error = e
+                print(f"DEBUG: Błąd zapisu {path}: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+class Catalog:
+    """Wspólny rejestr katalogów z data/*.json (jobs, properties, vehicles, valuables, courses, achievements, universe).
+
+    Każdy plik parsowany jest raz i trzymany razem z indeksem id -> rekord. Przy kolejnym
+    dostępie sprawdzany jest tylko mtime pliku - zmiana na dysku powoduje ponowne wczytanie.
+    Nazwy podaje się z rozszerzeniem lub bez ("jobs" == "jobs.json").
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name):
+        name = name[:-5] if name.endswith(".json") else name
+        path = os.path.join(self.data_dir, f"{name}.json")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            print(f"DEBUG: Brak katalogu {path}")
+            return [], {}
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != mtime:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    print(f"DEBUG: Błąd ładowania {path}: {e}")
+                    return [], {}
+                records = data.get(name, []) if isinstance(data, dict) else data
+                entry = (mtime, records, {r['id']: r for r in records if 'id' in r})
+                self._entries[name] = entry
+            return entry[1], entry[2]
+
+    def records(self, name):
+        """Wszystkie rekordy w kolejności z pliku (nie modyfikować - lista jest współdzielona)."""
+        return self._entry(name)[0]
+
+    def by_id(self, name):
+        return self._entry(name)[1]
+
+    def get(self, name, item_id, default=None):
+        return self.by_id(name).get(item_id, default)
+
+    def owned(self, name, ids):
+        """Rekordy dla listy posiadanych id - bez duplikatów i nieznanych id."""
+        index = self.by_id(name)
+        return [index[i] for i in dict.fromkeys(ids) if i in index]
+
+
+catalog = Catalog()
@@ -1,16 +1,24 @@
 import json
 import os
 
+import numpy as np
+
 class EventManager:
     def __init__(self, events_file="events.json"):
         # Szukamy pliku w głównym katalogu projektu
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.events_path = os.path.join(base_dir, "data", events_file)
-        
+
         print(f"DEBUG: Szukam eventów w: {self.events_path}") # To pomoże Ci sprawdzić ścieżkę
         self.events_db = self.load_events()
+        self.events_by_id = {e['id'].upper(): e for e in self.events_db}
         self.active_events = []
 
+        self.symbol_index = {}
+        self.sector_index = {}
+        self.symbol_count = 0
+        self._modifiers = None
+
     def load_events(self):
         if not os.path.exists(self.events_path):
             print(f"DEBUG: Nie znaleziono pliku {self.events_path}")
@@ -22,22 +30,76 @@ class EventManager:
             print(f"DEBUG: Błąd ładowania eventów: {e}")
             return []
 
+    def bind_market(self, symbols, sector_index):
+        """Zapamiętuje kolejność symboli rynku i indeks sektorów silnika ({sektor: numery symboli}),
+        żeby eventy mogły budować gotowy wektor mnożników."""
+        self.symbol_index = {s.upper(): i for i, s in enumerate(symbols)}
+        self.sector_index = sector_index
+        self.symbol_count = len(symbols)
+        self._modifiers = None
+
     def trigger_event_by_id(self, event_id):
-        event = next((e for e in self.events_db if e['id'].upper() == event_id.upper()), None)
+        event = self.events_by_id.get(event_id.upper())
         if event:
             if not any(a['event']['id'] == event['id'] for a in self.active_events):
                 self.active_events.append({"event": event, "remaining": event['duration']})
+                self._modifiers = None
                 return f"Started: {event['name']}"
             return "Event is already active"
         return f"Unknown Event ID: {event_id}"
 
+    def state(self):
+        """Aktywne eventy do zapisu: identyfikator i liczba pozostałych dni."""
+        return [{"id": a['event']['id'], "remaining": a['remaining']} for a in self.active_events]
+
+    def restore(self, state):
+        """Zastępuje aktywne eventy zapisanymi przez state() (nieznane identyfikatory są pomijane)."""
+        self.active_events = [{"event": self.events_by_id[a['id'].upper()], "remaining": a['remaining']}
+                              for a in state or [] if a['id'].upper() in self.events_by_id]
+        self._modifiers = None
+
     def process_day(self):
+        self.process_days(1)
+
+    def process_days(self, days):
+        """Skraca wszystkie aktywne eventy o `days` dni naraz i usuwa wygasłe."""
         for active in self.active_events[:]:
-            active['remaining'] -= 1
+            active['remaining'] -= days
             if active['remaining'] <= 0:
                 self.active_events.remove(active)
+                self._modifiers = None
+
+    def days_until_change(self):
+        """Liczba dni, po której wygaśnie pierwszy aktywny event (inf gdy brak eventów)."""
+        if not self.active_events:
+            return float('inf')
+        return min(a['remaining'] for a in self.active_events)
+
+    def modifier_vector(self):
+        """Wektor mnożników (po jednym na symbol z bind_market), przebudowywany tylko po zmianie aktywnych eventów."""
+        if self._modifiers is None:
+            modifiers = np.ones(self.symbol_count)
+            for active in self.active_events:
+                ev = active['event']
+                if ev['target_type'] == "global":
+                    modifiers *= ev['impact']
+                elif ev['target_type'] == "sector":
+                    idx = self.sector_index.get(ev['target_id'].lower())
+                    if idx is not None:
+                        modifiers[idx] *= ev['impact']
+                elif ev['target_type'] == "single":
+                    idx = self.symbol_index.get(ev['target_id'].upper())
+                    if idx is not None:
+                        modifiers[idx] *= ev['impact']
+            modifiers.flags.writeable = False
+            self._modifiers = modifiers
+        return self._modifiers
 
     def get_modifier_for_symbol(self, symbol, sector):
+        idx = self.symbol_index.get(symbol.upper())
+        if idx is not None:
+            return float(self.modifier_vector()[idx])
+
         modifier = 1.0
         for active in self.active_events:
             ev = active['event']
@@ -47,4 +109,4 @@ class EventManager:
                 modifier *= ev['impact']
             elif ev['target_type'] == "single" and ev['target_id'].upper() == symbol.upper():
                 modifier *= ev['impact']
-        return modifier
\ No newline at end of file
+        return modifier
@@ -0,0 +1,148 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES_DIR = os.path.join(BASE_DIR, "profiles")
+
+
+class Instruments:
+    """Nazwane timery i liczniki gorących ścieżek (skoki czasu, rynek, finanse, osiągnięcia, widoki, zapis).
+
+    Wyłączone (domyślnie) kosztują jedno sprawdzenie flagi na wywołanie. Włączone zbierają dla
+    każdego timera ostatnie CAPACITY czasów w buforze cyklicznym (z nich liczone są percentyle i
+    histogram) oraz narastające sumy - różnica sum między dwoma odczytami daje rozbicie na klatkę
+    nakładki albo na jeden skok czasu. Zapisy mogą przychodzić z wątków roboczych.
+
+    capture(n) nagrywa cProfile następnych `n` skoków i zapisuje pstats do katalogu profiles/.
+    """
+
+    CAPACITY = 512
+    BUCKETS = np.logspace(-6, 1, 15)
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+        self.profile = None
+        self.capture_left = 0
+        self.capture_path = None
+        self.last_capture = None
+
+    def reset(self):
+        self.samples = {}
+        self.heads = {}
+        self.totals = {}
+        self.counters = {}
+        self.jump_start = None
+        self.last_jump = {}
+
+    def timed(self, name):
+        """Dekorator: czas każdego wywołania trafia do timera `name`."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds):
+        with self._lock:
+            ring = self.samples.get(name)
+            if ring is None:
+                ring = self.samples[name] = np.full(self.CAPACITY, np.nan)
+                self.heads[name] = 0
+                self.totals[name] = [0.0, 0]
+            ring[self.heads[name] % self.CAPACITY] = seconds
+            self.heads[name] += 1
+            total = self.totals[name]
+            total[0] += seconds
+            total[1] += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def mark(self):
+        """Migawka sum (czas, wywołania) i liczników - punkt odniesienia dla breakdown()."""
+        with self._lock:
+            return {name: tuple(total) for name, total in self.totals.items()}, dict(self.counters)
+
+    def breakdown(self, since):
+        """Co przybyło od migawki `since`: ({timer: (sekundy, wywołania)}, {licznik: przyrost})."""
+        totals, counters = self.mark()
+        old_totals, old_counters = since
+        timers = {}
+        for name, (seconds, calls) in totals.items():
+            old_seconds, old_calls = old_totals.get(name, (0.0, 0))
+            if calls > old_calls:
+                timers[name] = (seconds - old_seconds, calls - old_calls)
+        counts = {name: value - old_counters.get(name, 0) for name, value in counters.items()
+                  if value != old_counters.get(name, 0)}
+        return timers, counts
+
+    def stats(self, name):
+        """Percentyle i histogram (kubełki BUCKETS, w sekundach) z ostatnich CAPACITY pomiarów timera."""
+        with self._lock:
+            values = self.samples[name][~np.isnan(self.samples[name])]
+        p50, p95 = np.percentile(values, [50, 95])
+        return {"count": len(values), "p50": float(p50), "p95": float(p95), "max": float(values.max()),
+                "histogram": np.histogram(values, bins=self.BUCKETS)[0].tolist()}
+
+    def begin_jump(self):
+        if self.enabled:
+            self.jump_start = (self.mark(), time.perf_counter())
+
+    def end_jump(self):
+        """Zamyka skok czasu: jego łączny czas idzie do timera "jump", rozbicie do last_jump."""
+        if self.enabled and self.jump_start is not None:
+            since, start = self.jump_start
+            self.record("jump", time.perf_counter() - start)
+            self.last_jump = self.breakdown(since)
+            self.jump_start = None
+
+    def capture(self, jumps, path=None):
+        """Nagrywa cProfile następnych `jumps` skoków czasu (zob. profiled)."""
+        self.profile = cProfile.Profile()
+        self.capture_left = jumps
+        self.capture_path = path or os.path.join(PROFILES_DIR, f"jumps_{datetime.now():%Y%m%d_%H%M%S}.prof")
+
+    def profiled(self, fn):
+        """Opakowuje skok czasu - przy aktywnym capture() liczony jest pod cProfile (w wątku, który go wykona)."""
+        if not self.capture_left:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            self.profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.profile.disable()
+                self.capture_left -= 1
+                if self.capture_left <= 0:
+                    self.dump()
+        return wrapper
+
+    def dump(self):
+        os.makedirs(os.path.dirname(self.capture_path), exist_ok=True)
+        self.profile.dump_stats(self.capture_path)
+        print(f"DEBUG: Zapisano profil: {self.capture_path}")
+        self.last_capture = self.capture_path
+        self.profile = None
+        self.capture_left = 0
+
+
+instruments = Instruments()
@@ -0,0 +1,197 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+ROW = np.dtype([('minute', '<i8'), ('category', '<i4'), ('description', '<i4'), ('amount', '<f8')])
+
+
+class Ledger:
+    """Rejestr transakcji: kolumny NumPy dopisywane na końcu (amortyzowane O(1)).
+
+    Kategorie i opisy trzymane są jako słowniki (kod -> tekst), data jako minuty od 1970-01-01.
+    Widoki czytają od najnowszych przez newest(), a sumy per kategoria i per miesiąc są
+    aktualizowane przy każdym wpisie. Zapis dzieli wiersze na stałe paczki po CHUNK.
+    """
+
+    CHUNK = 65536
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.minutes = np.zeros(capacity, dtype=np.int64)
+        self.categories = np.zeros(capacity, dtype=np.int32)
+        self.descriptions = np.zeros(capacity, dtype=np.int32)
+        self.amounts = np.zeros(capacity, dtype=np.float64)
+        self.category_names = []
+        self.description_texts = []
+        self._category_codes = {}
+        self._description_codes = {}
+        self.category_totals = {}
+        self.month_totals = {}
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _code(text, codes, table):
+        code = codes.get(text)
+        if code is None:
+            code = codes[text] = len(table)
+            table.append(text)
+        return code
+
+    def _grow(self, needed):
+        capacity = len(self.amounts)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in ('minutes', 'categories', 'descriptions', 'amounts'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, when, category, description, amount):
+        """Dopisuje transakcję (when: datetime). Zwraca numer wiersza."""
+        self._grow(self.size + 1)
+        i = self.size
+        minute = (when - EPOCH) // timedelta(minutes=1)
+        self.minutes[i] = minute
+        self.categories[i] = self._code(category, self._category_codes, self.category_names)
+        self.descriptions[i] = self._code(description, self._description_codes, self.description_texts)
+        self.amounts[i] = amount
+        self.size += 1
+        self._aggregate(category, when.year * 12 + when.month - 1, amount)
+        return i
+
+    def _aggregate(self, category, month, amount):
+        self.category_totals[category] = self.category_totals.get(category, 0.0) + amount
+        self.month_totals[month] = self.month_totals.get(month, 0.0) + amount
+
+    def when(self, i):
+        return EPOCH + timedelta(minutes=int(self.minutes[i]))
+
+    def row(self, i):
+        """Wiersz jako słownik (format dawnego transaction_history) - formatowany dopiero przy odczycie."""
+        return {
+            "date": self.when(i).strftime("%Y-%m-%d %H:%M"),
+            "category": self.category_names[self.categories[i]],
+            "description": self.description_texts[self.descriptions[i]],
+            "amount": float(self.amounts[i]),
+        }
+
+    def newest(self, start=0, count=None):
+        """Wiersze od najnowszego: pomija `start` najnowszych i zwraca maksymalnie `count`."""
+        first = self.size - 1 - start
+        last = -1 if count is None else max(-1, first - count)
+        return [self.row(i) for i in range(first, last, -1)]
+
+    def select(self, category=None, since=None, until=None):
+        """Numery wierszy (rosnąco) z danej kategorii i przedziału dat [since, until).
+
+        Wpisy dopisywane są chronologicznie, więc przedział dat to dwa searchsorted na kolumnie
+        minut, a kategoria - jedno porównanie kodów w tym przedziale.
+        """
+        minutes = self.minutes[:self.size]
+        lo = 0 if since is None else int(np.searchsorted(minutes, (since - EPOCH) // timedelta(minutes=1)))
+        hi = self.size if until is None else int(np.searchsorted(minutes, (until - EPOCH) // timedelta(minutes=1)))
+        if category is None:
+            return np.arange(lo, hi)
+        code = self._category_codes.get(category)
+        if code is None:
+            return np.arange(0)
+        return np.flatnonzero(self.categories[lo:hi] == code) + lo
+
+    def category_total(self, category):
+        return self.category_totals.get(category, 0.0)
+
+    def month_total(self, year, month):
+        return self.month_totals.get(year * 12 + month - 1, 0.0)
+
+    def any_amount(self, compare, value, categories=None):
+        """Czy istnieje transakcja z kwotą spełniającą compare(kwota, value) - jedno wektorowe porównanie."""
+        mask = compare(self.amounts[:self.size], value)
+        if categories:
+            codes = [self._category_codes[c] for c in categories if c in self._category_codes]
+            mask &= np.isin(self.categories[:self.size], codes)
+        return bool(mask.any())
+
+    def freeze(self):
+        """Niezmienny widok stanu do zapisu w tle: wiersze < size nigdy się nie zmieniają."""
+        return {
+            "size": self.size,
+            "columns": (self.minutes, self.categories, self.descriptions, self.amounts),
+            "categories": self.category_names[:],
+            "descriptions": self.description_texts[:],
+        }
+
+    @staticmethod
+    def chunks(frozen):
+        """Paczki wierszy (tablice strukturalne ROW) do zapisu."""
+        size = frozen['size']
+        minutes, categories, descriptions, amounts = frozen['columns']
+        for start in range(0, size, Ledger.CHUNK):
+            stop = min(size, start + Ledger.CHUNK)
+            chunk = np.empty(stop - start, dtype=ROW)
+            chunk['minute'] = minutes[start:stop]
+            chunk['category'] = categories[start:stop]
+            chunk['description'] = descriptions[start:stop]
+            chunk['amount'] = amounts[start:stop]
+            yield start // Ledger.CHUNK, chunk
+
+    @staticmethod
+    def tables(frozen):
+        return json.dumps({"categories": frozen['categories'], "descriptions": frozen['descriptions']},
+                          ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_chunks(cls, tables, chunks):
+        """Odtwarza rejestr z zapisanych tabel i paczek wierszy (w kolejności)."""
+        rows = np.concatenate(chunks) if chunks else np.empty(0, dtype=ROW)
+        ledger = cls(capacity=max(1024, len(rows)))
+        ledger.category_names = list(tables.get('categories', []))
+        ledger.description_texts = list(tables.get('descriptions', []))
+        ledger._category_codes = {c: i for i, c in enumerate(ledger.category_names)}
+        ledger._description_codes = {d: i for i, d in enumerate(ledger.description_texts)}
+        n = len(rows)
+        ledger.minutes[:n] = rows['minute']
+        ledger.categories[:n] = rows['category']
+        ledger.descriptions[:n] = rows['description']
+        ledger.amounts[:n] = rows['amount']
+        ledger.size = n
+        ledger._rebuild_aggregates()
+        return ledger
+
+    def _rebuild_aggregates(self):
+        n = self.size
+        sums = np.bincount(self.categories[:n], weights=self.amounts[:n], minlength=len(self.category_names))
+        self.category_totals = {name: float(total) for name, total in zip(self.category_names, sums)}
+        months = self.minutes[:n].astype('datetime64[m]').astype('datetime64[M]').astype(np.int64) + 1970 * 12
+        keys, index = np.unique(months, return_inverse=True)
+        totals = np.bincount(index, weights=self.amounts[:n], minlength=len(keys))
+        self.month_totals = {int(k): float(t) for k, t in zip(keys, totals)}
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Migracja dawnego `transaction_history` (lista słowników od najnowszego).
+
+        select() szuka po znacznikach czasu binarnie, więc muszą rosnąć: wpis z nieczytelną datą
+        dostaje czas poprzedniego poprawnego wpisu (pierwsze takie - czas pierwszego poprawnego),
+        a całość jest stabilnie sortowana po czasie.
+        """
+        ledger = cls(capacity=max(1024, len(entries)))
+        rows = []
+        last = None
+        for entry in reversed(entries):
+            try:
+                last = datetime.strptime(entry['date'], "%Y-%m-%d %H:%M")
+            except (KeyError, TypeError, ValueError):
+                pass
+            rows.append([last, entry])
+        first = next((when for when, _ in rows if when is not None), EPOCH)
+        for row in rows:
+            row[0] = row[0] or first
+        for when, entry in sorted(rows, key=lambda row: row[0]):
+            ledger.append(when, entry.get('category', ''), entry.get('description', ''), float(entry.get('amount', 0)))
+        return ledger
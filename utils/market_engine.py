@@ -0,0 +1,116 @@
+from datetime import date
+
+import numpy as np
+
+from utils.instruments import instruments
+from utils.price_history import PriceHistory
+from utils.price_models import build_model, calibrate_market
+from utils.universe import universe
+
+
+class MarketEngine:
+    """Trzyma ceny całego rynku w tablicach NumPy i symuluje wiele dni jednym wywołaniem."""
+
+    VOLATILITY = {"stocks": 0.02, "crypto": 0.05}
+    # Domyślnie dawny model jednostajny - modele kalibrowane (realistic, gbm) wybiera się komendą `model`.
+    MODEL = "uniform"
+    HISTORY_DAYS = 30
+
+    def __init__(self, market_data, rng=None, history_days=None):
+        keys = [(category, symbol) for category in ['stocks', 'crypto'] for symbol in market_data.get(category, {})]
+        assets = [market_data[category][symbol] for category, symbol in keys]
+        sectors = [a.get('category', category) for a, (category, _) in zip(assets, keys)]
+        prices = [float(a.get('current_price', 0)) for a in assets]
+        history = PriceHistory.from_points([a.get('history') for a in assets], history_days or self.HISTORY_DAYS)
+        self._bind(keys, sectors, prices, history, rng)
+
+    @classmethod
+    def from_store(cls, store, rng=None, history_days=None):
+        """Silnik z kolumnowego magazynu rynku (utils.market_store) - z dysku czytane są tylko ostatnie dni historii."""
+        keys = list(zip(store['markets'].tolist(), store['symbols'].tolist()))
+        history = PriceHistory(len(keys), history_days or cls.HISTORY_DAYS)
+        days = store['days'][-history.capacity:]
+        if len(days):
+            history.extend(days, store['prices'][-history.capacity:])
+        engine = cls.__new__(cls)
+        engine._bind(keys, store['sectors'].tolist(), store['current'], history, rng)
+        return engine
+
+    def _bind(self, keys, sectors, prices, history, rng):
+        """`sectors` z danych rynku to tylko zapas dla symboli spoza data/universe.json."""
+        self.keys = keys
+        self.symbols = [symbol for _, symbol in self.keys]
+        self.sectors = [universe.sector(symbol, sector).lower() for symbol, sector in zip(self.symbols, sectors)]
+        self.sector_index = universe.sector_index(self.sectors)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.prices = np.array(prices, dtype=np.float64)
+        self.volatility = np.array([self.VOLATILITY[category] for category, _ in self.keys], dtype=np.float64)
+        self.rng = rng or np.random.default_rng()
+        self.history = history
+        self.model = None
+        self.model_name = None
+        self.model_params = None
+
+    def set_model(self, name, params=None):
+        """Wybiera model cen (utils.price_models). Kalibracja z historii liczona jest tylko wtedy, gdy nie ma
+        parametrów (podanych - np. z zapisu - ani wcześniejszych) dla tych samych symboli."""
+        params = params or self.model_params
+        if not params or params.get('symbols') != self.symbols:
+            params = calibrate_market(self)
+        self.model_params = params
+        self.model = build_model(name, self, params)
+        self.model_name = name
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @instruments.timed("market.simulate")
+    def simulate(self, modifiers, days=None):
+        """Symuluje wiele dni naraz modelem cen self.model. modifiers: macierz (dni x symbole)
+        albo jeden wektor mnożników wspólny dla `days` dni (domyślnie jednego).
+
+        Zwraca macierz cen (dni x symbole) - wiersz d to ceny na koniec dnia d.
+        """
+        modifiers = np.asarray(modifiers, dtype=np.float64)
+        if modifiers.ndim == 1:
+            modifiers = np.broadcast_to(modifiers, (days or 1, len(self.symbols)))
+        days = modifiers.shape[0]
+        if days == 0:
+            return np.empty((0, len(self.symbols)))
+
+        if self.model is None:
+            self.set_model(self.MODEL)
+        changes = self.model.returns(days, self.rng)
+        changes *= modifiers
+        path = np.cumprod(changes, axis=0)
+        path *= self.prices
+        self.prices = path[-1].copy()
+        return path
+
+    def record(self, path, end_date):
+        """Dopisuje wynik symulacji do historii. Ostatni wiersz path to dzień end_date, poprzednie - kolejne dni wstecz."""
+        end = end_date.toordinal()
+        self.history.extend(np.arange(end - len(path) + 1, end + 1), path)
+
+    def set_history_days(self, days):
+        self.history = self.history.resized(days)
+
+    def history_points(self, symbol, last=None):
+        """Jedyny punkt dostępu do historii cen symbolu: lista {"date", "price"} od najstarszej."""
+        days, prices = self.history.tail(last)
+        return self._points(self._date_labels(days), prices[:, self.index[symbol]])
+
+    @staticmethod
+    def _date_labels(days):
+        return [date.fromordinal(int(d)).strftime("%Y-%m-%d") for d in days]
+
+    @staticmethod
+    def _points(labels, column):
+        column = np.round(column, 2)
+        return [{"date": d, "price": float(p)} for d, p in zip(labels, column) if not np.isnan(p)]
+
+    def write_prices(self, market_data):
+        """Przenosi bieżące ceny do słownikowego market_data."""
+        current = np.round(self.prices, 2).tolist()
+        for i, (category, symbol) in enumerate(self.keys):
+            market_data[category][symbol]['current_price'] = current[i]
@@ -1,77 +1,340 @@
-import yfinance as yf
 import json
 import random
 import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
+
+from utils.market_store import SNAPSHOT_STORE, arrays_from_market_data, resolve, write_store
+from utils.universe import universe
+
+
+class YFinanceSource:
+    """Źródło danych z Yahoo Finance: jedno zbiorcze zapytanie o historię wielu tickerów."""
+
+    def history(self, symbols, period="7d", start=None):
+        import yfinance as yf
+
+        if start:
+            frame = yf.download(list(symbols), start=start, group_by="ticker",
+                                auto_adjust=True, progress=False, threads=True)
+        else:
+            frame = yf.download(list(symbols), period=period, group_by="ticker",
+                                auto_adjust=True, progress=False, threads=True)
+        result = {}
+        if frame is None or frame.empty:
+            return result
+
+        multi = getattr(frame.columns, 'nlevels', 1) > 1
+        for symbol in symbols:
+            try:
+                closes = frame[symbol]['Close'] if multi else frame['Close']
+            except KeyError:
+                continue
+            closes = closes.dropna()
+            if not closes.empty:
+                result[symbol] = [(d.strftime("%Y-%m-%d"), float(c)) for d, c in closes.items()]
+        return result
+
+    def info(self, symbol):
+        import yfinance as yf
+        return yf.Ticker(symbol).info
+
+
+class LocalSnapshotSource:
+    """Źródło offline - odczytuje historię i metadane z zapisanego snapshotu zamiast z yfinance."""
+
+    def __init__(self, path="market_data_snapshot.json"):
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+        self.assets = {**snapshot.get('stocks', {}), **snapshot.get('crypto', {})}
+
+    def history(self, symbols, period="7d", start=None):
+        return {s: [(p['date'], p['price']) for p in self.assets[s].get('history', []) if not start or p['date'] >= start]
+                for s in symbols if s in self.assets}
+
+    def info(self, symbol):
+        asset = self.assets.get(symbol)
+        if asset is None:
+            raise KeyError(f"Brak symbolu {symbol} w snapshocie")
+        return {"shortName": asset.get('name', symbol), "dividendYield": asset.get('dividend_yield', 0) * 4}
+
 
 class MarketProvider:
-    def __init__(self):
-        tech = ["AAPL", "MSFT", "NVDA", "AMD", "GOOGL", "META", "TSLA", "INTC", "ASML", "ORCL", "CRM", "ADBE", "CSCO", "IBM", "TXN", "QCOM", "AMAT", "MU", "SNPS", "PLTR"]
-        defense = ["LMT", "BA", "RTX", "NOC", "GD", "LHX", "BWXT", "AIR.PA", "RHM.DE", "HWM", "TDG", "TXT", "LDOS", "HEI"]
-        finance = ["JPM", "GS", "V", "MA", "HSBC", "BAC", "MS", "AXP", "PYPL", "PKO.WA", "PEO.WA", "ING.WA", "DBK.DE", "BNP.PA", "BLK"]
-        energy = ["XOM", "SHEL", "RIO", "BP", "CVX", "TTE.PA", "COP", "SLB", "EOG", "KGH.WA", "PGE.WA", "PKN.WA", "VALE", "FCX", "NEM"]
-        retail = ["AMZN", "WMT", "COST", "PG", "KO", "PEP", "NKE", "EL", "OR.PA", "ALE.WA", "MCD", "SBUX", "TGT"]
-        health = ["PFE", "JNJ", "UNH", "LLY", "ABBV", "MRK", "AZN", "NVS", "MRNA", "TMO"]
-        industry = ["F", "GM", "VOW3.DE", "BMW.DE", "PAH3.DE", "CAT", "DE", "MMM", "GE", "HON"]
-        crypto = ["BTC-USD", "ETH-USD", "BNB-USD", "SOL-USD", "DOGE-USD", "XRP-USD", "ADA-USD", "DOT-USD", "LINK-USD"]
-
-        self.stocks = tech + defense + finance + energy + retail + health + industry
-        self.crypto = crypto
+    def __init__(self, source=None, progress=None, batch_size=50, workers=8, timeout=10.0, retries=2):
+        self.stocks = universe.symbols("stocks")
+        self.crypto = universe.symbols("crypto")
         self.all_symbols = self.stocks + self.crypto
         self.cache_file = "market_data_snapshot.json"
+        self.store_file = resolve(SNAPSHOT_STORE)
+        self.snapshot_history = 30
+        self.refresh_after = 24 * 3600
+
+        self.source = source or YFinanceSource()
+        self.progress = progress
+        self.batch_size = batch_size
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.errors = {}
 
-    def get_market_data(self):
-        """Ładuje dane z pliku lub pobiera nowe, jeśli pliku brak."""
+    def report(self, stage, done, total):
+        if self.progress:
+            self.progress(stage, done, total)
+
+    def is_stale(self):
+        """Czy snapshot jest starszy niż refresh_after sekund (wtedy start gry dociąga nowe notowania)."""
+        return os.path.exists(self.cache_file) and time.time() - os.path.getmtime(self.cache_file) > self.refresh_after
+
+    def get_market_data(self, refresh=False):
+        """Ładuje dane z pliku lub pobiera nowe, jeśli pliku brak. refresh=True dociąga brakujące dni;
+        gdy aktualizacja się nie uda, zostaje dotychczasowy snapshot."""
         if os.path.exists(self.cache_file):
-            print("--- Wczytywanie giełdy z cache (Szybki start) ---")
+            if refresh:
+                try:
+                    return self.refresh_snapshot()
+                except Exception as e:
+                    print(f"DEBUG: Aktualizacja snapshotu nieudana, używam zapisanego: {e}")
+            self.report("cache", 1, 1)
             with open(self.cache_file, "r") as f:
-                return json.load(f)
+                market_data = json.load(f)
+            if not os.path.exists(self.store_file) or os.path.getmtime(self.store_file) < os.path.getmtime(self.cache_file):
+                write_store(self.store_file, arrays_from_market_data(market_data))
+            return market_data
         return self.fetch_market_snapshot()
 
-    def fetch_market_snapshot(self):
-        market_data = {"stocks": {}, "crypto": {}}
-        print(f"Pobieranie {len(self.all_symbols)} firm. Cierpliwości...")
-
-        for i, symbol in enumerate(self.all_symbols):
+    def refresh_in_background(self, on_done=None):
+        """refresh_snapshot na wątku w tle (daemon), żeby start gry nie czekał na sieć - do tego czasu
+        gra korzysta z zapisanego snapshotu. `on_done(market_data)` wołane jest na tym wątku i tylko
+        po udanej aktualizacji. Zwraca wątek."""
+        def run():
             try:
-                ticker = yf.Ticker(symbol)
-                history = ticker.history(period="7d")
-                if history.empty: 
-                    continue
-
-                history_points = [{"date": d.strftime("%Y-%m-%d"), "price": round(float(r['Close']), 2)} 
-                                 for d, r in history.iterrows()]
-
-                current_price = round(float(history['Close'].iloc[-1]), 2)
-                
-                raw_yield = ticker.info.get('dividendYield')
-                
-                if isinstance(raw_yield, (int, float)) and 0 < raw_yield < 0.20:
-                    annual_yield = raw_yield
-                else:
-                    annual_yield = round(random.uniform(0.005, 0.04), 4)
-
-                div_quarterly = round(annual_yield / 4, 6)
-
-                data = {
-                    "symbol": symbol,
-                    "name": ticker.info.get('shortName', symbol),
-                    "current_price": current_price,
-                    "history": history_points,
-                    "dividend_yield": div_quarterly,
-                    "category": "Stock" if symbol in self.stocks else "Crypto"
-                }
+                market_data = self.refresh_snapshot()
+            except Exception as e:
+                print(f"DEBUG: Aktualizacja snapshotu nieudana, zostaje zapisany: {e}")
+                return
+            if on_done:
+                on_done(market_data)
+
+        thread = threading.Thread(target=run, name="market-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def write_snapshot(self, market_data):
+        """Zapis atomowy: plik tymczasowy w tym samym katalogu podmieniany przez os.replace.
+        Obok JSON-a odświeżany jest binarny magazyn kolumnowy, do którego odwołują się nowe zapisy gry."""
+        folder = os.path.dirname(os.path.abspath(self.cache_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(market_data, f, indent=4)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        write_store(self.store_file, arrays_from_market_data(market_data))
+
+    @staticmethod
+    def watermark(asset):
+        """Ostatni dzień notowań zapisany dla symbolu."""
+        if asset.get('last_date'):
+            return asset['last_date']
+        history = asset.get('history') or []
+        return history[-1]['date'] if history else None
 
+    def refresh_snapshot(self):
+        """Aktualizacja przyrostowa: pobiera tylko dni po znaczniku `last_date` każdego symbolu,
+        scala je z istniejącym snapshotem i zapisuje plik atomowo. Symbole spoza snapshotu
+        pobierane są w całości. Błędy pojedynczych symboli zostawiają ich stare dane."""
+        with open(self.cache_file, "r") as f:
+            market_data = json.load(f)
+        self.errors = {}
+
+        by_start = {}
+        missing = []
+        for symbol in self.all_symbols:
+            target = "stocks" if symbol in self.stocks else "crypto"
+            asset = market_data.setdefault(target, {}).get(symbol)
+            mark = self.watermark(asset) if asset else None
+            if mark:
+                start = (date.fromisoformat(mark) + timedelta(days=1)).isoformat()
+                by_start.setdefault(start, []).append(symbol)
+            else:
+                missing.append(symbol)
+
+        updated = 0
+        for start, symbols in sorted(by_start.items()):
+            if start > date.today().isoformat():
+                continue
+            deltas = self.fetch_histories(symbols, start=start)
+            for symbol, points in deltas.items():
                 target = "stocks" if symbol in self.stocks else "crypto"
-                market_data[target][symbol] = data
-                
-                if (i + 1) % 10 == 0: 
-                    print(f"Postęp: {i+1}/{len(self.all_symbols)}")
+                updated += self.merge_points(market_data[target][symbol], points)
 
-            except Exception as e:
-                print(f"Błąd {symbol}: {e}")
+        if missing:
+            fresh = self.fetch_market_snapshot(missing, write=False)
+            for target in ("stocks", "crypto"):
+                market_data[target].update(fresh[target])
+
+        self.write_snapshot(market_data)
+        self.report("refresh", updated, len(self.all_symbols))
+        return market_data
+
+    def merge_points(self, asset, points):
+        """Dopisuje nowe punkty (data, cena) za znacznikiem symbolu. Zwraca 1, jeśli coś się zmieniło."""
+        mark = self.watermark(asset) or ""
+        new_points = [{"date": d, "price": round(p, 2)} for d, p in points if d > mark]
+        if not new_points:
+            return 0
+        history = asset.setdefault('history', [])
+        history.extend(new_points)
+        del history[:-self.snapshot_history]
+        asset['current_price'] = new_points[-1]['price']
+        asset['last_date'] = new_points[-1]['date']
+        return 1
+
+    def fetch_market_snapshot(self, symbols=None, write=True):
+        """Pobiera historię paczkami (jedno zapytanie na paczkę tickerów), a metadane równolegle."""
+        symbols = symbols or self.all_symbols
+        if write:
+            self.errors = {}
+        histories = self.fetch_histories(symbols)
+        infos = self.fetch_metadata([s for s in symbols if s in histories])
+
+        market_data = {"stocks": {}, "crypto": {}}
+        for symbol in symbols:
+            points = histories.get(symbol)
+            if not points:
+                continue
+            info = infos.get(symbol, {})
+
+            raw_yield = info.get('dividendYield')
+            if isinstance(raw_yield, (int, float)) and 0 < raw_yield < 0.20:
+                annual_yield = raw_yield
+            else:
+                annual_yield = round(random.uniform(0.005, 0.04), 4)
+
+            target = "stocks" if symbol in self.stocks else "crypto"
+            market_data[target][symbol] = {
+                "symbol": symbol,
+                "name": info.get('shortName', symbol),
+                "current_price": round(points[-1][1], 2),
+                "history": [{"date": d, "price": round(p, 2)} for d, p in points],
+                "last_date": points[-1][0],
+                "dividend_yield": round(annual_yield / 4, 6),
+                "category": "Stock" if symbol in self.stocks else "Crypto"
+            }
+
+        if write:
+            self.write_snapshot(market_data)
+            self.report("done", len(market_data['stocks']) + len(market_data['crypto']), len(symbols))
+        return market_data
+
+    def fetch_histories(self, symbols, period="7d", start=None):
+        """Historia notowań w paczkach po batch_size tickerów, każda paczka z limitem czasu.
+        Paczka, która rzuciła wyjątek, jest ponawiana; ta, która przekroczyła limit, nie - jej wątek
+        wciąż wisi i liczony jest jako zablokowany. Z `start` (YYYY-MM-DD) pobiera tylko dni od tej daty."""
+        histories = {}
+        stuck = set()
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for offset in range(0, len(symbols), self.batch_size):
+                batch = symbols[offset:offset + self.batch_size]
+                for attempt in range(self.retries + 1):
+                    stuck = {f for f in stuck if not f.done()}
+                    if len(stuck) >= self.workers:
+                        error, retry = "wszystkie wątki zablokowane", False
+                    else:
+                        future = pool.submit(self.source.history, batch, period=period, start=start)
+                        try:
+                            histories.update(future.result(timeout=self.timeout))
+                            break
+                        except TimeoutError:
+                            stuck.add(future)
+                            error, retry = f"timeout po {self.timeout}s", False
+                        except Exception as e:
+                            error, retry = str(e), True
+                    if not retry or attempt == self.retries:
+                        for symbol in batch:
+                            self.errors[symbol] = f"history: {error}"
+                        break
+                self.report("history", min(offset + self.batch_size, len(symbols)), len(symbols))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return histories
+
+    def fetch_metadata(self, symbols):
+        """Metadane (nazwa, dywidenda) na ograniczonej puli wątków z limitem czasu per symbol.
+
+        Błąd symbolu jest ponawiany do `retries` razy. Przekroczenie limitu nie - zadanie nie da się
+        przerwać, więc jego wątek zostaje zajęty i liczony jako zablokowany; gdy zablokowane są
+        wszystkie wątki, reszta symboli od razu dostaje błąd zamiast czekać w kolejce."""
+        results = {}
+        attempts = dict.fromkeys(symbols, 0)
+        pending = {}
+        stuck = set()
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+
+        def run(symbol, started):
+            started.append(time.monotonic())
+            return self.source.info(symbol) or {}
+
+        def submit(symbol):
+            attempts[symbol] += 1
+            started = []
+            pending[pool.submit(run, symbol, started)] = (symbol, started)
+
+        def fail(symbol, error):
+            self.errors[symbol] = f"metadata: {error}"
+            results[symbol] = {}
+            self.report("metadata", len(results), len(symbols))
+
+        for symbol in symbols:
+            submit(symbol)
+
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=min(self.timeout, 0.5), return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future, (symbol, started) in list(pending.items()):
+                    if future in done:
+                        del pending[future]
+                        try:
+                            results[symbol] = future.result()
+                            self.report("metadata", len(results), len(symbols))
+                        except Exception as e:
+                            if attempts[symbol] <= self.retries:
+                                submit(symbol)
+                            else:
+                                fail(symbol, e)
+                    elif started and now - started[0] > self.timeout:
+                        del pending[future]
+                        stuck.add(future)
+                        fail(symbol, f"timeout po {self.timeout}s")
+
+                stuck = {f for f in stuck if not f.done()}
+                if len(stuck) >= self.workers:
+                    for future, (symbol, _) in list(pending.items()):
+                        del pending[future]
+                        future.cancel()
+                        fail(symbol, "wszystkie wątki zablokowane")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pobieranie / aktualizacja snapshotu giełdy.")
+    parser.add_argument("--full", action="store_true", help="pobierz cały snapshot od nowa")
+    args = parser.parse_args()
 
-        with open(self.cache_file, "w") as f:
-            json.dump(market_data, f, indent=4)
-            
-        print("--- POBIERANIE ZAKOŃCZONE I ZAPISANE DO PLIKU ---")
-        return market_data
\ No newline at end of file
+    provider = MarketProvider(progress=lambda stage, done, total: print(f"{stage}: {done}/{total}"))
+    if args.full or not os.path.exists(provider.cache_file):
+        provider.fetch_market_snapshot()
+    else:
+        provider.refresh_snapshot()
+    for symbol, error in provider.errors.items():
+        print(f"Błąd {symbol}: {error}")
@@ -0,0 +1,136 @@
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+from utils.price_history import PriceHistory
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_STORE = "market_data_snapshot.npz"
+
+
+def resolve(ref):
+    """Ścieżki magazynów zapisywane są względem katalogu projektu."""
+    return ref if os.path.isabs(ref) else os.path.join(BASE_DIR, ref)
+
+
+def ref_for(path):
+    """Odwołanie `market_ref` do pliku - ścieżka względem katalogu projektu."""
+    return os.path.relpath(os.path.abspath(path), BASE_DIR).replace(os.sep, "/")
+
+
+def write_arrays(zf, arrays, prefix=""):
+    """Dopisuje tablice do otwartego archiwum jako nieskompresowane członki .npy."""
+    for name, array in arrays.items():
+        with zf.open(prefix + name + ".npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def write_store(path, arrays):
+    """Zapisuje tablice jako nieskompresowany .npz (atomowo), żeby dało się je mapować z dysku."""
+    tmp_path = path + ".tmp"
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+        write_arrays(zf, arrays)
+    os.replace(tmp_path, path)
+
+
+def load_store(path, mmap=True):
+    """Wczytuje magazyn. Przy mmap=True tablice są widokami np.memmap na plik (bez kopiowania).
+
+    np.load(mmap_mode='r') nie mapuje członków archiwum .npz, dlatego offset każdego
+    nieskompresowanego .npy w zipie liczony jest ręcznie. Czytane są tylko członki .npy z głównego
+    katalogu archiwum albo z sekcji "market/" zapisu gry (katalog w nazwie jest obcinany).
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as raw:
+        for info in zf.infolist():
+            if not info.filename.endswith(".npy") or os.path.dirname(info.filename) not in ("", "market"):
+                continue
+            name = os.path.basename(info.filename)[:-4]
+            if not mmap or info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as f:
+                    arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+                continue
+
+            raw.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack("<HH", raw.read(4))
+            raw.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(raw)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(raw)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(raw)
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=raw.tell(),
+                                         shape=shape, order="F" if fortran else "C")
+    return arrays
+
+
+def arrays_from_market_data(market_data):
+    """Kolumnowa postać słownikowego market_data: tabela symboli, wektory cen/dywidend i macierz historii."""
+    keys = [(m, s) for m in ['stocks', 'crypto'] for s in market_data.get(m, {})]
+    assets = [market_data[m][s] for m, s in keys]
+    # Oś dat to suma dat wszystkich symboli - pojemność musi pomieścić jej najgorszy przypadek.
+    capacity = sum(len(a.get('history') or []) for a in assets) or 1
+    history = PriceHistory.from_points([a.get('history') for a in assets], capacity)
+    days, prices = history.tail()
+    return {
+        "symbols": np.array([s for _, s in keys], dtype=str),
+        "markets": np.array([m for m, _ in keys], dtype=str),
+        "names": np.array([a.get('name', s) for a, (_, s) in zip(assets, keys)], dtype=str),
+        "sectors": np.array([a.get('category', m) for a, (m, _) in zip(assets, keys)], dtype=str),
+        "dividends": np.array([a.get('dividend_yield', 0) for a in assets], dtype=np.float64),
+        "current": np.array([a.get('current_price', 0) for a in assets], dtype=np.float64),
+        "days": days,
+        "prices": prices,
+    }
+
+
+def arrays_from_engine(engine, market_data):
+    """Stan rynku w trakcie gry: ceny i historia z silnika, nazwy i dywidendy z market_data."""
+    assets = [market_data[m][s] for m, s in engine.keys]
+    days, prices = engine.history.tail()
+    return {
+        "symbols": np.array(engine.symbols, dtype=str),
+        "markets": np.array([m for m, _ in engine.keys], dtype=str),
+        "names": np.array([a.get('name', s) for a, s in zip(assets, engine.symbols)], dtype=str),
+        "sectors": np.array([a.get('category', m) for a, (m, _) in zip(assets, engine.keys)], dtype=str),
+        "dividends": np.array([a.get('dividend_yield', 0) for a in assets], dtype=np.float64),
+        "current": np.array(engine.prices, dtype=np.float64),
+        "days": days,
+        "prices": prices,
+    }
+
+
+def market_data_from_store(store):
+    """Słowniki market_data potrzebne widokom (bez historii - ta zostaje w tablicach silnika)."""
+    market_data = {"stocks": {}, "crypto": {}}
+    rows = zip(store['symbols'].tolist(), store['markets'].tolist(), store['names'].tolist(),
+               store['sectors'].tolist(), store['dividends'].tolist(), np.round(store['current'], 2).tolist())
+    for symbol, market, name, sector, dividend, price in rows:
+        market_data[market][symbol] = {
+            "symbol": symbol,
+            "name": name,
+            "current_price": price,
+            "dividend_yield": dividend,
+            "category": sector,
+        }
+    return market_data
+
+
+def attach_market(save_data):
+    """Dla zapisów z `market_ref` wczytuje magazyn rynku i uzupełnia market_data. Zwraca magazyn albo None."""
+    ref = save_data.get('market_ref')
+    if not ref or 'market_data' in save_data:
+        return None
+    path = resolve(ref)
+    if not os.path.exists(path):
+        print(f"DEBUG: Brak magazynu rynku {path}")
+        return None
+    store = load_store(path)
+    save_data['market_data'] = market_data_from_store(store)
+    return store
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class PriceHistory:
+    """Historia cen wszystkich symboli w buforze cyklicznym o stałej pojemności.
+
+    prices to macierz (pojemność x symbole) float64, days to wspólna oś dni (date.toordinal()).
+    Dopisanie dnia to jedno przypisanie wiersza - pamięć i koszt nie rosną wraz z historią.
+    """
+
+    def __init__(self, width, capacity):
+        self.width = width
+        self.capacity = max(1, int(capacity))
+        self.prices = np.full((self.capacity, width), np.nan)
+        self.days = np.zeros(self.capacity, dtype=np.int64)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, days, rows):
+        """Dopisuje wiersze cen (dni x symbole) dla kolejnych dni `days`; zostaje tylko ostatnie `capacity`."""
+        days = np.asarray(days, dtype=np.int64)[-self.capacity:]
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self.width)[-self.capacity:]
+        k = len(rows)
+        first = min(k, self.capacity - self.head)
+        self.prices[self.head:self.head + first] = rows[:first]
+        self.days[self.head:self.head + first] = days[:first]
+        if k > first:
+            self.prices[:k - first] = rows[first:]
+            self.days[:k - first] = days[first:]
+        self.head = (self.head + k) % self.capacity
+        self.size = min(self.capacity, self.size + k)
+
+    def order(self, last=None):
+        """Indeksy slotów bufora w kolejności chronologicznej (opcjonalnie tylko `last` ostatnich)."""
+        n = self.size if last is None else min(last, self.size)
+        start = (self.head - n) % self.capacity
+        return (start + np.arange(n)) % self.capacity
+
+    def tail(self, last=None):
+        """Zwraca (dni, macierz cen) z ostatnich `last` dni w kolejności chronologicznej."""
+        order = self.order(last)
+        return self.days[order], self.prices[order]
+
+    def resized(self, capacity):
+        """Kopia historii z nowym oknem przechowywania (zachowuje najnowsze dni)."""
+        other = PriceHistory(self.width, capacity)
+        days, prices = self.tail(other.capacity)
+        if len(days):
+            other.extend(days, prices)
+        return other
+
+    @classmethod
+    def from_points(cls, series, capacity):
+        """Buduje bufor z list punktów {"date", "price"} (po jednej liście na symbol).
+
+        Symbole mogą mieć różne dni notowań - oś to suma wszystkich dat, luki wypełniane są
+        ostatnią znaną ceną.
+        """
+        parsed = []
+        all_days = set()
+        for points in series:
+            pts = {}
+            for p in points or []:
+                try:
+                    pts[np.datetime64(p['date'][:10], 'D')] = float(p['price'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+            parsed.append(pts)
+            all_days.update(pts)
+
+        history = cls(len(series), capacity)
+        if not all_days:
+            return history
+
+        axis = sorted(all_days)[-history.capacity:]
+        pos = {d: i for i, d in enumerate(axis)}
+        matrix = np.full((len(axis), len(series)), np.nan)
+        for col, pts in enumerate(parsed):
+            for d, price in pts.items():
+                if d in pos:
+                    matrix[pos[d], col] = price
+
+        filled = np.where(~np.isnan(matrix), np.arange(len(axis))[:, None], 0)
+        np.maximum.accumulate(filled, axis=0, out=filled)
+        matrix = np.take_along_axis(matrix, filled, axis=0)
+
+        epoch_ordinal = 719163  # date(1970, 1, 1).toordinal()
+        ordinals = np.array(axis, dtype='datetime64[D]').astype(np.int64) + epoch_ordinal
+        history.extend(ordinals, matrix)
+        return history
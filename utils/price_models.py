@@ -0,0 +1,231 @@
+import numpy as np
+
+
+class PriceModel:
+    """Model cen: returns(days, rng) zwraca macierz (dni x symbole) dziennych mnożników ceny.
+
+    MarketEngine mnoży ją przez modyfikatory eventów, robi cumprod po dniach i skaluje bieżącymi
+    cenami - model nie zna cen ani eventów, tylko rozkład zmian. Cały horyzont generowany jest
+    jednym wywołaniem NumPy, bez pętli po symbolach.
+    """
+
+    def returns(self, days, rng):
+        raise NotImplementedError
+
+
+class UniformModel(PriceModel):
+    """Dawny model: 1 + U(-vol, vol) niezależnie dla każdego symbolu i dnia."""
+
+    def __init__(self, volatility):
+        self.volatility = np.asarray(volatility, dtype=np.float64)
+
+    def returns(self, days, rng):
+        changes = rng.uniform(-1.0, 1.0, size=(days, len(self.volatility)))
+        changes *= self.volatility
+        changes += 1.0
+        return changes
+
+
+class GBMModel(PriceModel):
+    """Geometryczny ruch Browna: exp((mu - sigma^2/2) + sigma * Z), mu i sigma dzienne per symbol."""
+
+    def __init__(self, drift, sigma):
+        self.drift = np.asarray(drift, dtype=np.float64)
+        self.sigma = np.asarray(sigma, dtype=np.float64)
+
+    def shocks(self, days, rng):
+        return rng.standard_normal((days, len(self.sigma)))
+
+    def log_returns(self, days, rng):
+        log_returns = self.shocks(days, rng)
+        log_returns *= self.sigma
+        log_returns += self.drift - 0.5 * self.sigma ** 2
+        return log_returns
+
+    def returns(self, days, rng):
+        return np.exp(self.log_returns(days, rng))
+
+
+class JumpDiffusionModel(GBMModel):
+    """Model Mertona: GBM plus skoki - liczba skoków dziennie ~ Poisson(intensity),
+    a łączny log-rozmiar skoków ~ N(n * jump_mean, n * jump_std^2).
+
+    `sigma` to łączna dzienna zmienność (np. z kalibracji) - dyfuzja dostaje to, co zostaje
+    po odjęciu wariancji skoków (nie mniej niż połowę sigma).
+    """
+
+    def __init__(self, drift, sigma, intensity=0.05, jump_mean=-0.02, jump_std=0.08):
+        sigma = np.asarray(sigma, dtype=np.float64)
+        jump_variance = intensity * (jump_mean ** 2 + jump_std ** 2)
+        super().__init__(drift, np.sqrt(np.maximum(sigma ** 2 - jump_variance, (sigma / 2) ** 2)))
+        self.intensity = intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+
+    def log_returns(self, days, rng):
+        log_returns = super().log_returns(days, rng)
+        jumps = rng.poisson(self.intensity, size=log_returns.shape)
+        log_returns += jumps * self.jump_mean + np.sqrt(jumps) * self.jump_std * rng.standard_normal(log_returns.shape)
+        # Kompensata, żeby skoki nie zmieniały oczekiwanego zwrotu (drift zostaje taki jak w GBM).
+        log_returns -= self.intensity * (np.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1)
+        return log_returns
+
+
+class SectorFactorModel(GBMModel):
+    """GBM ze skorelowanymi szokami: wspólny czynnik sektora plus szum własny symbolu.
+
+    Z = loading * F[sektor] + sqrt(1 - loading^2) * eps, gdzie czynniki sektorów F mają macierz
+    korelacji `correlation` (losowane przez jej rozkład Cholesky'ego). Wariancja Z zostaje 1,
+    więc sigma symbolu się nie zmienia - zmienia się tylko korelacja między symbolami.
+    """
+
+    def __init__(self, drift, sigma, sector_ids, correlation, loading=0.6):
+        super().__init__(drift, sigma)
+        self.sector_ids = np.asarray(sector_ids, dtype=np.intp)
+        self.cholesky = cholesky(correlation)
+        self.loading = np.broadcast_to(np.asarray(loading, dtype=np.float64), self.sigma.shape)
+
+    def shocks(self, days, rng):
+        factors = rng.standard_normal((days, len(self.cholesky))) @ self.cholesky.T
+        shocks = rng.standard_normal((days, len(self.sigma)))
+        shocks *= np.sqrt(1.0 - self.loading ** 2)
+        shocks += self.loading * factors[:, self.sector_ids]
+        return shocks
+
+
+class CompositeModel(PriceModel):
+    """Różne modele dla rozłącznych grup symboli (np. akcje i krypto) składane w jedną macierz."""
+
+    def __init__(self, size, parts):
+        self.size = size
+        self.parts = [(np.asarray(idx, dtype=np.intp), model) for idx, model in parts]
+
+    def returns(self, days, rng):
+        changes = np.ones((days, self.size))
+        for idx, model in self.parts:
+            if len(idx):
+                changes[:, idx] = model.returns(days, rng)
+        return changes
+
+
+def cholesky(correlation):
+    """Rozkład Cholesky'ego macierzy korelacji; gdy nie jest dodatnio określona, ściąga ją w stronę I."""
+    correlation = np.asarray(correlation, dtype=np.float64)
+    identity = np.eye(len(correlation))
+    for shrink in (0.0, 0.1, 0.3, 0.6, 1.0):
+        try:
+            return np.linalg.cholesky((1 - shrink) * correlation + shrink * identity)
+        except np.linalg.LinAlgError:
+            continue
+    return identity
+
+
+def calibrate(history, default_sigma, min_returns=5, prior_days=250, max_drift=0.0003, sigma_range=(0.003, 0.15)):
+    """Dzienny drift i zmienność per symbol z logarytmicznych zwrotów w historii cen (dni x symbole).
+
+    Braki (NaN - dni bez notowań) są pomijane. Symbole z mniej niż `min_returns` zwrotami dostają
+    `default_sigma` i zerowy drift. Średnia z n zwrotów ma błąd ok. sigma/sqrt(n), więc z kilku dni
+    notowań to głównie szum: drift jest ściągany do zera wagą n / (n + prior_days) i przycinany do
+    +-max_drift (ok. +-11% rocznie przy 365 dniach symulacji).
+    """
+    default_sigma = np.asarray(default_sigma, dtype=np.float64)
+    log_returns = daily_log_returns(history)
+    counts = np.sum(~np.isnan(log_returns), axis=0) if len(log_returns) else np.zeros(len(default_sigma))
+    enough = counts >= min_returns
+    drift = np.zeros(len(default_sigma))
+    sigma = default_sigma.copy()
+    if enough.any():
+        n = counts[enough]
+        shrunk = np.nanmean(log_returns[:, enough], axis=0) * n / (n + prior_days)
+        drift[enough] = np.clip(shrunk, -max_drift, max_drift)
+        sigma[enough] = np.clip(np.nanstd(log_returns[:, enough], axis=0, ddof=1), *sigma_range)
+    return drift, sigma
+
+
+def daily_log_returns(history):
+    """Log-zwroty między kolejnymi notowaniami każdego symbolu (NaN w dniach bez notowań są przeskakiwane)."""
+    history = np.asarray(history, dtype=np.float64)
+    if len(history) < 2:
+        return np.empty((0, history.shape[1] if history.ndim == 2 else 0))
+    filled = history.copy()
+    for day in range(1, len(filled)):
+        gaps = np.isnan(filled[day])
+        filled[day, gaps] = filled[day - 1, gaps]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.diff(np.log(filled), axis=0)
+    log_returns[np.isnan(history[1:])] = np.nan
+    return log_returns
+
+
+def sector_correlation(log_returns, sector_ids, sectors, default=0.3, min_days=10):
+    """Korelacja średnich zwrotów sektorów; przy zbyt krótkiej historii stała korelacja `default`."""
+    correlation = np.full((sectors, sectors), default)
+    np.fill_diagonal(correlation, 1.0)
+    if len(log_returns) < min_days:
+        return correlation
+    valid = ~np.isnan(log_returns)
+    members = np.zeros((len(sector_ids), sectors))
+    members[np.arange(len(sector_ids)), sector_ids] = 1.0
+    counts = valid @ members
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (np.where(valid, log_returns, 0.0) @ members) / counts
+    valid = (counts > 0).all(axis=1)
+    if valid.sum() < min_days:
+        return correlation
+    means = means[valid]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        estimated = np.corrcoef(means, rowvar=False)
+    ok = np.isfinite(estimated)
+    correlation[ok] = estimated[ok]
+    np.fill_diagonal(correlation, 1.0)
+    return correlation
+
+
+MODELS = ("realistic", "gbm", "uniform")
+
+
+def stock_sectors(engine):
+    """Indeksy akcji, numer sektora każdej z nich i posortowane nazwy sektorów."""
+    stocks = np.array([i for i, (category, _) in enumerate(engine.keys) if category != "crypto"], dtype=np.intp)
+    names = sorted({engine.sectors[i] for i in stocks})
+    sector_ids = np.array([names.index(engine.sectors[i]) for i in stocks], dtype=np.intp)
+    return stocks, sector_ids, names
+
+
+def calibrate_market(engine):
+    """Parametry modeli (drift, sigma, korelacja sektorów) z historii cen silnika.
+
+    Liczone raz - dla nowej gry z pobranego snapshotu - i trzymane w zapisie jako `model_params`,
+    żeby symulowane dni (razem z eventami) nie zmieniały kalibracji przy każdym wczytaniu.
+    """
+    _, history = engine.history.tail()
+    drift, sigma = calibrate(history, engine.volatility)
+    stocks, sector_ids, names = stock_sectors(engine)
+    correlation = sector_correlation(daily_log_returns(history[:, stocks]), sector_ids, len(names))
+    return {"symbols": list(engine.symbols), "drift": drift.tolist(), "sigma": sigma.tolist(),
+            "correlation": correlation.tolist()}
+
+
+def build_model(name, engine, params=None):
+    """Model `name` dla silnika z parametrami z calibrate_market (bez nich - kalibrowany na jego historii).
+
+    realistic  akcje: GBM z czynnikami sektorowymi, krypto: dyfuzja ze skokami (Merton),
+    gbm        niezależny GBM dla każdego symbolu,
+    uniform    dawny model jednostajny ze stałą zmiennością.
+    """
+    if name == "uniform":
+        return UniformModel(engine.volatility)
+    params = params or calibrate_market(engine)
+    drift = np.asarray(params['drift'], dtype=np.float64)
+    sigma = np.asarray(params['sigma'], dtype=np.float64)
+    if name == "gbm":
+        return GBMModel(drift, sigma)
+    if name != "realistic":
+        raise ValueError(f"Nieznany model cen: {name}")
+
+    stocks, sector_ids, _ = stock_sectors(engine)
+    coins = np.array([i for i, (category, _) in enumerate(engine.keys) if category == "crypto"], dtype=np.intp)
+    return CompositeModel(len(engine), [
+        (stocks, SectorFactorModel(drift[stocks], sigma[stocks], sector_ids, params['correlation'])),
+        (coins, JumpDiffusionModel(drift[coins], sigma[coins])),
+    ])
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+class RngStreams:
+    """Deterministyczne strumienie losowe symulacji - po jednym niezależnym Generatorze na podsystem.
+
+    Wszystkie strumienie wyprowadzane są z jednego ziarna przez SeedSequence.spawn, więc rynek,
+    eventy i śmiertelność nie przesuwają sobie nawzajem sekwencji. Stan (ziarno i stany
+    generatorów) zapisywany jest w grze pod kluczem 'rng' - ten sam stan i te same decyzje
+    gracza dają bit w bit ten sam przebieg symulacji.
+    """
+
+    STREAMS = ("market", "events", "mortality")
+
+    def __init__(self, seed=None):
+        self.seed = int(np.random.SeedSequence().entropy if seed is None else seed)
+        children = np.random.SeedSequence(self.seed).spawn(len(self.STREAMS))
+        self.generators = {name: np.random.Generator(np.random.PCG64(child))
+                           for name, child in zip(self.STREAMS, children)}
+
+    def __getattr__(self, name):
+        generators = self.__dict__.get('generators', {})
+        if name in generators:
+            return generators[name]
+        raise AttributeError(name)
+
+    def state(self):
+        """Stan do zapisu (zwykłe słowniki i liczby całkowite)."""
+        return {"seed": self.seed, "streams": {name: g.bit_generator.state for name, g in self.generators.items()}}
+
+    @classmethod
+    def from_state(cls, state):
+        """Odtwarza strumienie z zapisu; bez zapisanego stanu - nowe losowe ziarno."""
+        if not state:
+            return cls()
+        streams = cls(state['seed'])
+        for name, generator_state in state.get('streams', {}).items():
+            if name in streams.generators:
+                streams.generators[name].bit_generator.state = generator_state
+        return streams
@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime
+
+import numpy as np
+
+from utils.instruments import instruments
+from utils.ledger import Ledger
+from utils.market_store import arrays_from_market_data, load_store, ref_for, resolve, write_arrays
+
+SAVE_VERSION = 2
+SAVE_EXT = ".save"
+HEADER_FIELDS = ("player_name", "player_surname", "mode", "difficulty", "balance",
+                 "player_age", "created", "current_game_date")
+INDEX_FILE = ".save_index"
+
+_index_lock = threading.Lock()
+
+
+def is_save_file(filename):
+    return not filename.startswith(".") and (filename.endswith(SAVE_EXT) or filename.endswith(".json"))
+
+
+def save_header(save_data):
+    """Pola potrzebne do kart zapisu - czytane bez rozpakowywania reszty stanu."""
+    header = {key: save_data.get(key) for key in HEADER_FIELDS}
+    header['version'] = SAVE_VERSION
+    header['last_played'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    return header
+
+
+@instruments.timed("save.write")
+def write_save(path, save_data, market=None, ledger=None):
+    """Zapis v2 (atomowy) - archiwum zip z sekcjami:
+
+    header.json    mały nagłówek (nieskompresowany, pierwszy w archiwum),
+    state.json     stan gracza bez rynku, zwarty JSON kompresowany deflate,
+    market/*.npy   kolumnowe tablice rynku (jak w utils.market_store), mapowane z dysku przy wczytaniu,
+    ledger/        rejestr transakcji: tables.json (kategorie, opisy) i paczki wierszy chunk_*.npy.
+
+    `ledger` to wynik Ledger.freeze().
+    """
+    state = {k: v for k, v in save_data.items() if k != 'market_data'}
+    tmp_path = path + ".tmp"
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            header = save_header(save_data)
+            zf.writestr("header.json", json.dumps(header))
+            zf.writestr("state.json", json.dumps(state, separators=(",", ":")),
+                        compress_type=zipfile.ZIP_DEFLATED)
+            if market is not None:
+                write_arrays(zf, market, prefix="market/")
+            if ledger is not None:
+                zf.writestr("ledger/tables.json", Ledger.tables(ledger), compress_type=zipfile.ZIP_DEFLATED)
+                write_arrays(zf, {f"{i:05d}": chunk for i, chunk in Ledger.chunks(ledger)}, prefix="ledger/chunk_")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    index_save(path, header)
+
+
+def read_header(path):
+    """Nagłówek zapisu; dla starych zapisów JSON wymaga pełnego parsowania (do czasu migracji)."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return save_header(json.load(f))
+    with zipfile.ZipFile(path) as zf:
+        return json.loads(zf.read("header.json"))
+
+
+def load_save(path):
+    """Pełny stan gry. Rynek nie jest tu wczytywany - wskazuje go `market_ref` (patrz attach_market)."""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    with zipfile.ZipFile(path) as zf:
+        header = json.loads(zf.read("header.json"))
+        if header.get('version', 0) > SAVE_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja zapisu: {header.get('version')}")
+        return json.loads(zf.read("state.json"))
+
+
+def load_ledger(path):
+    """Rejestr transakcji z sekcji ledger/ zapisu (None, jeśli zapis jej nie ma)."""
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()
+        if "ledger/tables.json" not in names:
+            return None
+        tables = json.loads(zf.read("ledger/tables.json"))
+        chunks = []
+        for name in sorted(n for n in names if n.startswith("ledger/chunk_")):
+            with zf.open(name) as f:
+                chunks.append(np.lib.format.read_array(f, allow_pickle=False))
+    return Ledger.from_chunks(tables, chunks)
+
+
+def attach_ledger(save_data):
+    """Rejestr transakcji gry: z sekcji wskazanej przez `ledger_ref` albo z dawnej listy transaction_history."""
+    legacy = save_data.pop('transaction_history', None)
+    ref = save_data.get('ledger_ref')
+    if ref and os.path.exists(resolve(ref)):
+        ledger = load_ledger(resolve(ref))
+        if ledger is not None:
+            return ledger
+    return Ledger.from_entries(legacy or [])
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_index(saves_dir):
+    try:
+        with open(os.path.join(saves_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(saves_dir, index):
+    path = os.path.join(saves_dir, INDEX_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+
+
+def index_save(path, header):
+    """Aktualizuje wpis zapisu w indeksie katalogu (nagłówek + mtime i rozmiar pliku)."""
+    saves_dir, filename = os.path.split(path)
+    mtime, size = _stamp(path)
+    with _index_lock:
+        index = load_index(saves_dir)
+        index[filename] = {**header, "mtime": mtime, "size": size}
+        write_index(saves_dir, index)
+
+
+def forget_save(saves_dir, filename):
+    with _index_lock:
+        index = load_index(saves_dir)
+        if index.pop(filename, None) is not None:
+            write_index(saves_dir, index)
+
+
+def list_saves(saves_dir, only=None):
+    """Karty zapisów {nazwa pliku: nagłówek + size} z indeksu. Wpis jest ważny, dopóki zgadzają się
+    mtime i rozmiar pliku - w przeciwnym razie nagłówek czytany jest ponownie. `only` zawęża do jednego pliku."""
+    if not os.path.isdir(saves_dir):
+        return {}
+    names = [only] if only else [f for f in os.listdir(saves_dir) if is_save_file(f)]
+    with _index_lock:
+        index = load_index(saves_dir)
+        cards = {}
+        changed = False
+        for filename in names:
+            path = os.path.join(saves_dir, filename)
+            try:
+                mtime, size = _stamp(path)
+                card = index.get(filename)
+                if not card or card.get('mtime') != mtime or card.get('size') != size:
+                    card = {**read_header(path), "mtime": mtime, "size": size}
+                    index[filename] = card
+                    changed = True
+            except Exception:
+                changed |= index.pop(filename, None) is not None
+                continue
+            cards[filename] = card
+        if not only:
+            for filename in set(index) - set(names):
+                del index[filename]
+                changed = True
+        if changed:
+            write_index(saves_dir, index)
+    return cards
+
+
+def migrate_save(json_path):
+    """Przepisuje zapis JSON (v1) do formatu v2 obok oryginału. Zwraca ścieżkę nowego zapisu.
+
+    Nowy zapis jest wczytywany z powrotem i porównywany z oryginałem (gracz, saldo, portfel, liczba
+    transakcji); dopiero wtedy oryginał i jego plik rynku dostają rozszerzenie .bak - nic nie jest usuwane.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    new_path = os.path.splitext(json_path)[0] + SAVE_EXT
+    market = None
+    sidecar = None
+    if 'market_data' in data:
+        market = arrays_from_market_data(data.pop('market_data'))
+    elif str(data.get('market_ref', '')).endswith(".market.npz"):
+        sidecar = resolve(data['market_ref'])
+        if os.path.exists(sidecar):
+            market = load_store(sidecar, mmap=False)
+    if market is not None:
+        data['market_ref'] = ref_for(new_path)
+    entries = data.pop('transaction_history', [])
+    data['ledger_ref'] = ref_for(new_path)
+
+    write_save(new_path, data, market, Ledger.from_entries(entries).freeze())
+    migrated = load_save(new_path)
+    ledger = load_ledger(new_path)
+    mismatched = [key for key in ('player_name', 'balance', 'portfolio') if migrated.get(key) != data.get(key)]
+    if ledger is None or len(ledger) != len(entries):
+        mismatched.append('transaction_history')
+    if mismatched:
+        os.remove(new_path)
+        forget_save(os.path.dirname(new_path), os.path.basename(new_path))
+        raise ValueError(f"Migracja {json_path} nie powiodła się (różnice: {', '.join(mismatched)})")
+
+    os.replace(json_path, json_path + ".bak")
+    forget_save(os.path.dirname(json_path), os.path.basename(json_path))
+    if sidecar and os.path.exists(sidecar):
+        os.replace(sidecar, sidecar + ".bak")
+    return new_path
+
+
+def migrate_saves(saves_dir):
+    """Migruje wszystkie zapisy JSON w katalogu. Zwraca {stara nazwa: nowa nazwa}."""
+    migrated = {}
+    if not os.path.isdir(saves_dir):
+        return migrated
+    for filename in sorted(os.listdir(saves_dir)):
+        if not is_save_file(filename) or not filename.endswith(".json"):
+            continue
+        try:
+            new_path = migrate_save(os.path.join(saves_dir, filename))
+            migrated[filename] = os.path.basename(new_path)
+        except Exception as e:
+            print(f"DEBUG: Nie udało się zmigrować {filename}: {e}")
+    return migrated
+
+
+if __name__ == "__main__":
+    import sys
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "saves")
+    for old, new in migrate_saves(folder).items():
+        print(f"{old} -> {new}")
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class SearchIndex:
+    """Indeks wyszukiwania podciągów oparty na n-gramach (1..N znaków).
+
+    Budowany raz dla listy tekstów (np. "nazwa (symbol)" i sektor danego instrumentu). Zapytanie
+    to przecięcie list wierszy dla n-gramów zapytania, a dla dłuższych zapytań dodatkowo
+    sprawdzenie `query in text` tylko na kandydatach. Pola jednego wiersza łączone są znakiem
+    nowej linii, więc dopasowanie nie przechodzi przez granicę pól.
+    """
+
+    N = 3
+
+    def __init__(self, texts):
+        self.texts = [text.lower() for text in texts]
+        postings = {}
+        for row, text in enumerate(self.texts):
+            grams = {text[i:i + n] for n in range(1, self.N + 1) for i in range(len(text) - n + 1)}
+            for gram in grams:
+                if "\n" not in gram:
+                    postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.array(rows, dtype=np.intp) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def rows(self, query):
+        """Numery wierszy (rosnąco), których tekst zawiera `query` (bez rozróżniania wielkości liter)."""
+        query = query.strip().lower()
+        if not query:
+            return np.arange(len(self.texts))
+        n = min(self.N, len(query))
+        lists = []
+        for gram in {query[i:i + n] for i in range(len(query) - n + 1)}:
+            rows = self.postings.get(gram)
+            if rows is None:
+                return np.arange(0)
+            lists.append(rows)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        if len(query) > n:
+            candidates = np.array([r for r in candidates if query in self.texts[r]], dtype=np.intp)
+        return candidates
+
+    def mask(self, query):
+        """Maska bool (po jednym polu na wiersz) dla `query`."""
+        mask = np.zeros(len(self.texts), dtype=bool)
+        mask[self.rows(query)] = True
+        return mask
@@ -0,0 +1,43 @@
+import numpy as np
+
+from utils.catalog import catalog
+
+
+class Universe:
+    """Metadane instrumentów z data/universe.json: symbol -> sektor, klasa aktywów, waluta, giełda.
+
+    Jedyne źródło przynależności do sektorów - korzystają z niego MarketProvider (lista symboli),
+    MarketEngine (sektory do eventów) i MarketsView (filtr sektorów). Plik czytany jest przez
+    wspólny katalog, więc parsowany jest raz.
+    """
+
+    def __init__(self, name="universe"):
+        self.name = name
+
+    def records(self):
+        return catalog.records(self.name)
+
+    def get(self, symbol, default=None):
+        return catalog.get(self.name, symbol, default)
+
+    def symbols(self, asset_class=None):
+        """Symbole w kolejności z pliku (opcjonalnie tylko jednej klasy: "stocks" / "crypto")."""
+        return [r['id'] for r in self.records() if asset_class is None or r['asset_class'] == asset_class]
+
+    def sectors(self):
+        """Nazwy sektorów w kolejności pierwszego wystąpienia w pliku."""
+        return list(dict.fromkeys(r['sector'] for r in self.records()))
+
+    def sector(self, symbol, default="Other"):
+        return self.get(symbol, {}).get('sector', default)
+
+    @staticmethod
+    def sector_index(sectors):
+        """{sektor (małe litery): tablica numerów pozycji} dla listy sektorów w kolejności instrumentów."""
+        by_sector = {}
+        for i, sector in enumerate(sectors):
+            by_sector.setdefault(sector.lower(), []).append(i)
+        return {sector: np.array(idx, dtype=np.intp) for sector, idx in by_sector.items()}
+
+
+universe = Universe()
@@ -0,0 +1,103 @@
+import numpy as np
+
+from utils.catalog import catalog
+
+
+class Valuation:
+    """Bieżące sumy majątku i prestiżu gracza, aktualizowane przyrostowo.
+
+    Zakupy i sprzedaże zgłaszane są przez add_item / update_holding, zmiany cen przez on_prices
+    (iloczyn wektora ilości i wektora cen silnika). snapshot() to jeden odczyt O(1) dla dashboardu,
+    widoku domu, osiągnięć i raportu końcowego zamiast przeszukiwania katalogów.
+    """
+
+    ITEMS = {"properties": "owned_properties", "vehicles": "owned_vehicles", "valuables": "owned_valuables"}
+
+    def __init__(self, save_data, engine):
+        self.save_data = save_data
+        self.engine = engine
+        self.rebuild()
+
+    def rebuild(self):
+        """Pełne przeliczenie od zera - przy starcie gry albo po zmianach spoza serwisu."""
+        self.holdings = np.zeros(len(self.engine))
+        for category in ['stocks', 'crypto']:
+            for symbol, item in self.save_data.get('portfolio', {}).get(category, {}).items():
+                idx = self.engine.index.get(symbol)
+                if idx is not None:
+                    self.holdings[idx] += item.get('amount', 0)
+        self.on_prices()
+
+        self.values = dict.fromkeys(self.ITEMS, 0)
+        self.prestige = dict.fromkeys(self.ITEMS, 0)
+        for name, save_key in self.ITEMS.items():
+            for record in catalog.owned(name, self.save_data.get(save_key, [])):
+                self.values[name] += record.get('price', 0)
+                self.prestige[name] += record.get('prestige', 0)
+        self.primary_bonus = self.primary_prestige()
+        self.sync_prestige()
+
+    def on_prices(self):
+        """Po ruchu cen: wartość portfela z aktualnych (zaokrąglonych jak w market_data) cen silnika."""
+        self.prices = np.round(self.engine.prices, 2)
+        self.portfolio = float(self.holdings @ self.prices)
+
+    def update_holding(self, symbol):
+        """Po kupnie/sprzedaży: przelicza tylko pozycję `symbol` na podstawie save_data['portfolio']."""
+        idx = self.engine.index.get(symbol)
+        if idx is None:
+            return
+        portfolio = self.save_data.get('portfolio', {})
+        amount = sum(portfolio.get(category, {}).get(symbol, {}).get('amount', 0) for category in ['stocks', 'crypto'])
+        self.portfolio += (amount - self.holdings[idx]) * self.prices[idx]
+        self.holdings[idx] = amount
+
+    def add_item(self, name, item_id):
+        """Po zakupie przedmiotu z katalogu `name` (properties/vehicles/valuables), już dopisanego do save_data."""
+        if self.save_data.get(self.ITEMS[name], []).count(item_id) > 1:
+            return
+        record = catalog.get(name, item_id)
+        if record:
+            self.values[name] += record.get('price', 0)
+            self.prestige[name] += record.get('prestige', 0)
+            if name == "properties":
+                self.primary_bonus = self.primary_prestige()
+            self.sync_prestige()
+
+    def set_primary(self):
+        """Po zmianie domu głównego (jego prestiż liczy się podwójnie)."""
+        self.primary_bonus = self.primary_prestige()
+        self.sync_prestige()
+
+    def primary_prestige(self):
+        primary_id = self.save_data.get('primary_home', 'prop_00')
+        if primary_id not in self.save_data.get('owned_properties', []):
+            return 0
+        return catalog.get("properties", primary_id, {}).get('prestige', 0)
+
+    def total_prestige(self):
+        return sum(self.prestige.values()) + self.primary_bonus
+
+    def sync_prestige(self):
+        self.save_data['prestige'] = self.total_prestige()
+
+    def snapshot(self):
+        cash = self.save_data.get('balance', 0)
+        assets = self.portfolio + sum(self.values.values())
+        return {
+            "cash": cash,
+            "portfolio": self.portfolio,
+            "properties": self.values["properties"],
+            "vehicles": self.values["vehicles"],
+            "valuables": self.values["valuables"],
+            "prestige": self.total_prestige(),
+            "property_prestige": self.prestige["properties"] + self.primary_bonus,
+            "vehicle_prestige": self.prestige["vehicles"],
+            "valuable_prestige": self.prestige["valuables"],
+            "net_worth": cash + assets,
+        }
+
+    @staticmethod
+    def catalog_prestige():
+        """Suma prestiżu wszystkich przedmiotów w katalogach (maksimum do zdobycia)."""
+        return sum(item.get('prestige', 0) for name in Valuation.ITEMS for item in catalog.records(name))